@@ -1 +1,7 @@
 """LLMS.txt action."""
+
+import os
+
+# litellm fetches its model cost map when imported unless told to use the
+# copy it bundles; planning and token counting must not touch the network.
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
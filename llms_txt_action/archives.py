@@ -0,0 +1,146 @@
+"""Read documentation from, and write outputs to, zip and tar archives."""
+
+import logging
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath, PureWindowsPath
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+_TAR_WRITE_MODES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tar.xz": "w:xz",
+}
+
+
+def _archive_suffix(path: str) -> str:
+    name = str(path).lower()
+    return next((suffix for suffix in ARCHIVE_SUFFIXES if name.endswith(suffix)), "")
+
+
+def is_archive(path: str) -> bool:
+    """Return whether ``path`` names a supported archive file."""
+    return bool(_archive_suffix(path)) and Path(path).is_file()
+
+
+def strip_archive_suffix(path: str) -> str:
+    """Return ``path`` without its archive suffix, e.g. ``site.tar.gz`` -> ``site``."""
+    suffix = _archive_suffix(path)
+    return str(path)[: -len(suffix)] if suffix else str(path)
+
+
+def _member_name(name: str) -> str:
+    """Normalize a member name to a relative POSIX path."""
+    return str(PurePosixPath(name.lstrip("/"))).removeprefix("./")
+
+
+def _is_safe_member(archive: str, name: str) -> bool:
+    """Return whether a normalized member name stays below the archive root.
+
+    Names climbing out with ``..`` or carrying a Windows drive would have
+    outputs written outside the output directory; they are logged and
+    rejected.
+    """
+    path = PurePosixPath(name.replace("\\", "/"))
+    if ".." not in path.parts and not PureWindowsPath(name).drive:
+        return True
+    logger.warning("Skipping %s of %s, it leaves the archive root", name, archive)
+    return False
+
+
+def iter_archive_members(archive: str, suffix: str) -> Iterator:
+    """Stream the members of ``archive`` whose name ends with ``suffix``.
+
+    Members are read one at a time, tar archives in a single sequential pass,
+    so nothing is extracted to disk. Members whose name leaves the archive
+    root are skipped with a warning.
+
+    Args:
+    ----
+        archive (str): Path to a zip or tar archive
+        suffix (str): Suffix of the members to read, e.g. ``.html``
+
+    Yields:
+    ------
+        tuple: ``(name, data)`` with the member's relative path and bytes
+
+    """
+    if _archive_suffix(archive) == ".zip":
+        with zipfile.ZipFile(archive) as zip_file:
+            for info in zip_file.infolist():
+                if not info.is_dir() and info.filename.endswith(suffix):
+                    name = _member_name(info.filename)
+                    if _is_safe_member(archive, name):
+                        yield name, zip_file.read(info)
+        return
+    with tarfile.open(archive, "r|*") as tar_file:
+        for member in tar_file:
+            if member.isfile() and member.name.endswith(suffix):
+                name = _member_name(member.name)
+                if _is_safe_member(archive, name):
+                    yield name, tar_file.extractfile(member).read()
+
+
+def read_archive_member(archive: str, name: str) -> bytes:
+    """Read the member ``name`` of ``archive``.
+
+    Raises
+    ------
+        FileNotFoundError: If the archive has no such member
+
+    """
+    wanted = _member_name(name)
+    if _archive_suffix(archive) == ".zip":
+        with zipfile.ZipFile(archive) as zip_file:
+            for info in zip_file.infolist():
+                if _member_name(info.filename) == wanted:
+                    return zip_file.read(info)
+    else:
+        with tarfile.open(archive, "r:*") as tar_file:
+            for member in tar_file.getmembers():
+                if member.isfile() and _member_name(member.name) == wanted:
+                    return tar_file.extractfile(member).read()
+    msg = f"The archive {archive} has no member {name}."
+    raise FileNotFoundError(msg)
+
+
+def write_archive(archive: str, source_dir: str) -> list:
+    """Pack every file below ``source_dir`` into a new ``archive``.
+
+    Args:
+    ----
+        archive (str): Path of the archive to create, its suffix selects the
+            format
+        source_dir (str): Directory whose files are packed
+
+    Returns:
+    -------
+        list: Names of the archived members
+
+    Raises:
+    ------
+        ValueError: If the archive suffix is not supported
+
+    """
+    suffix = _archive_suffix(archive)
+    if not suffix:
+        msg = f"Unsupported archive {archive}, expected one of {ARCHIVE_SUFFIXES}"
+        raise ValueError(msg)
+    root = Path(source_dir)
+    files = sorted(path for path in root.rglob("*") if path.is_file())
+    names = [path.relative_to(root).as_posix() for path in files]
+    Path(archive).parent.mkdir(parents=True, exist_ok=True)
+    if suffix == ".zip":
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for path, name in zip(files, names):  # noqa: B905
+                zip_file.write(path, name)
+    else:
+        with tarfile.open(archive, _TAR_WRITE_MODES[suffix]) as tar_file:
+            for path, name in zip(files, names):  # noqa: B905
+                tar_file.add(path, name)
+    return names
@@ -0,0 +1,174 @@
+"""Generate the outputs of several documentation sites in one run."""
+# ruff: noqa: UP007
+
+import inspect
+import json
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from .utils import init_worker, worker_html_to_markdown
+from .workers import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+# Options of the shared worker pool, they cannot differ between sites.
+SHARED_OPTIONS = ("workers", "page_timeout", "page_memory_limit")
+
+
+class SiteResult(NamedTuple):
+    """Outcome of generating the outputs of one site of a batch."""
+
+    docs_dir: str
+    markdown_files: list
+    seconds: float
+    error: Optional[Exception] = None
+
+
+def load_batch_config(config_path: str, generate: Callable) -> tuple:
+    """Read the sites of a batch from a JSON config file.
+
+    The config holds a ``sites`` list of objects with at least a ``docs_dir``
+    and any other option of ``generate_documentation`` to override for that
+    site, optional ``defaults`` applied to every site and an optional
+    ``site_concurrency``::
+
+        {
+            "defaults": {"skip_md_files": true, "minify": "all"},
+            "sites": [
+                {"docs_dir": "api/site"},
+                {"docs_dir": "guide/site", "model_name": "gpt-4o-mini"}
+            ]
+        }
+
+    Args:
+    ----
+        config_path (str): Path of the JSON config file
+        generate (Callable): The function generating one site, whose
+            parameters are the accepted options
+
+    Returns:
+    -------
+        tuple: The defaults, the list of site options and the number of sites
+        to generate concurrently (0 for all)
+
+    Raises:
+    ------
+        ValueError: If the config is malformed, a site has no ``docs_dir``,
+            an option is unknown or a shared option is set for one site
+
+    """
+    config = json.loads(Path(config_path).read_text(encoding="utf-8"))
+    if not isinstance(config, dict) or not isinstance(config.get("sites"), list):
+        msg = f"{config_path} must be an object with a list of sites."
+        raise ValueError(msg)  # noqa: TRY004
+    options = set(inspect.signature(generate).parameters) - {"pool"}
+    defaults = config.get("defaults", {})
+    sites = config["sites"]
+    for name, values in [("defaults", defaults)] + [
+        (f"sites[{index}]", site) for index, site in enumerate(sites)
+    ]:
+        unknown = sorted(set(values) - options)
+        if unknown:
+            msg = f"Unknown options {unknown} in {name} of {config_path}"
+            raise ValueError(msg)
+    for index, site in enumerate(sites):
+        if not site.get("docs_dir"):
+            msg = f"sites[{index}] of {config_path} has no docs_dir."
+            raise ValueError(msg)
+        shared = sorted(set(site) & set(SHARED_OPTIONS))
+        if shared:
+            msg = (
+                f"Options {shared} of sites[{index}] are shared by all sites, "
+                "set them in defaults instead."
+            )
+            raise ValueError(msg)
+    return defaults, sites, int(config.get("site_concurrency", 0))
+
+
+def generate_batch(
+    generate: Callable,
+    sites: list,
+    options: dict,
+    site_concurrency: int = 0,
+) -> list:
+    """Generate the outputs of several sites over a single worker pool.
+
+    All sites share one pool of conversion workers, so worker processes and
+    their converters are started once for the whole batch instead of once per
+    site, and sites are generated concurrently so that their pages keep the
+    pool busy.
+    A failing site does not stop the others.
+
+    Args:
+    ----
+        generate (Callable): The function generating one site,
+            ``generate_documentation``
+        sites (list): Options of each site, merged over ``options``
+        options (dict): Options shared by every site
+        site_concurrency (int): Number of sites generated concurrently, 0 for
+            all of them
+
+    Returns:
+    -------
+        list: A ``SiteResult`` per site, in the order of ``sites``
+
+    Raises:
+    ------
+        RuntimeError: If any site failed, after all sites were generated
+
+    """
+    concurrency = min(site_concurrency or len(sites), len(sites)) or 1
+    start = time.perf_counter()
+    with WorkerPool(
+        worker_html_to_markdown,
+        options.get("workers", 1),
+        options.get("page_timeout"),
+        options.get("page_memory_limit"),
+        init_worker,
+    ) as pool:
+
+        def generate_site(site: dict) -> SiteResult:
+            site_options = {**options, **site, "pool": pool}
+            site_start = time.perf_counter()
+            try:
+                markdown_files = generate(**site_options)
+            except Exception as exc:
+                logger.exception("Failed to generate %s", site["docs_dir"])
+                return SiteResult(
+                    site["docs_dir"],
+                    [],
+                    time.perf_counter() - site_start,
+                    exc,
+                )
+            return SiteResult(
+                site["docs_dir"],
+                markdown_files,
+                time.perf_counter() - site_start,
+            )
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(generate_site, sites))
+
+    logger.info("Batch of %d sites:", len(results))
+    for result in results:
+        logger.info(
+            "  %s: %d pages in %.1fs%s",
+            result.docs_dir,
+            len(result.markdown_files),
+            result.seconds,
+            f" (failed: {result.error})" if result.error else "",
+        )
+    logger.info(
+        "Batch complete in %.1fs, %d conversion worker restarts",
+        time.perf_counter() - start,
+        pool.restarts,
+    )
+    failed = [result.docs_dir for result in results if result.error]
+    if failed:
+        msg = f"Failed to generate {len(failed)} of {len(results)} sites: {failed}"
+        raise RuntimeError(msg)
+    return results
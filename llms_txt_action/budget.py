@@ -0,0 +1,61 @@
+"""Call, token and time limits for the summarization stage."""
+# ruff: noqa: UP007
+
+import threading
+import time
+from typing import Optional
+
+
+class SummaryBudget:
+    """Track model calls, tokens and time spent against optional limits.
+
+    Pages that could not be summarized within the budget are recorded in
+    ``degraded`` so callers can report them.
+    """
+
+    def __init__(
+        self,
+        max_calls: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        time_budget: Optional[float] = None,
+    ):
+        """Start a budget, the time budget starts counting immediately."""
+        self.max_calls = max_calls or None
+        self.max_tokens = max_tokens or None
+        self.calls = 0
+        self.tokens = 0
+        self.degraded = []
+        self._deadline = time.monotonic() + time_budget if time_budget else None
+        self._lock = threading.Lock()
+
+    def remaining_time(self) -> Optional[float]:
+        """Seconds left in the time budget, or None without a time budget."""
+        if self._deadline is None:
+            return None
+        return max(self._deadline - time.monotonic(), 0.0)
+
+    def reserve(self, prompt_tokens: int = 0) -> bool:
+        """Reserve a call with ``prompt_tokens`` if the budget allows it."""
+        with self._lock:
+            if self.max_calls is not None and self.calls >= self.max_calls:
+                return False
+            if (
+                self.max_tokens is not None
+                and self.tokens + prompt_tokens > self.max_tokens
+            ):
+                return False
+            if self.remaining_time() == 0:
+                return False
+            self.calls += 1
+            self.tokens += prompt_tokens
+            return True
+
+    def settle(self, reserved_tokens: int, used_tokens: int) -> None:
+        """Replace a reservation's estimate with the tokens actually used."""
+        with self._lock:
+            self.tokens += used_tokens - reserved_tokens
+
+    def degrade(self, index: int) -> None:
+        """Record that page ``index`` was not summarized by the model."""
+        with self._lock:
+            self.degraded.append(index)
@@ -0,0 +1,284 @@
+"""Append-only journal of completed work, so an interrupted run can resume."""
+# ruff: noqa: UP007
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Records are flushed to the OS as they are written, which survives the
+# process being killed, and fsync'd to disk in batches.
+SYNC_EVERY = 64
+SYNC_SECONDS = 2.0
+
+
+def digest(data: bytes) -> str:
+    """Return the hex SHA-256 of ``data``."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def settings_fingerprint(settings: dict) -> str:
+    """Return a digest of the settings that change what a run produces."""
+    return digest(json.dumps(settings, sort_keys=True, default=str).encode())
+
+
+def journal_path(checkpoint_dir: str, output: str) -> Path:
+    """Return the journal of the run writing to ``output`` in ``checkpoint_dir``.
+
+    Every output location has its own journal, so several sites can share a
+    checkpoint directory.
+    """
+    name = digest(str(Path(output).resolve()).encode())[:16]
+    return Path(checkpoint_dir) / f"{name}.jsonl"
+
+
+@contextmanager
+def staging_directory(path: Path, *, keep: bool) -> Iterator[str]:
+    """Stage outputs in ``path``, which is kept when the block raises.
+
+    Outputs staged by an interrupted run are kept with ``keep``, so its
+    journal can recover them, and cleared otherwise. The directory is removed
+    once the block completes.
+    """
+    if not keep:
+        shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True, exist_ok=True)
+    yield str(path)
+    shutil.rmtree(path)
+
+
+class CheckpointJournal:
+    """Record converted pages and summaries as they complete.
+
+    The journal is a JSONL file whose first line holds the fingerprint of
+    the run settings, followed by one line per completed conversion::
+
+        {"page": ..., "source": ..., "markdown": ..., "seconds": ...}
+
+    or summary::
+
+        {"content": ..., "summary": ...}
+
+    keyed by the path of the markdown relative to ``root``, so outputs staged
+    in another directory resume too, and by the SHA-256 of the markdown
+    summarized. A restarted run with the same settings skips the recorded
+    work; converted pages are only recovered while their HTML is unchanged
+    and their markdown file is intact. A journal
+    written with other settings is ignored and replaced, and a line torn by a
+    crash is dropped. Nothing is written until the first record, so reading a
+    journal, e.g. to plan a run, leaves it untouched.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fingerprint: str = "",
+        *,
+        root: str = "",
+        sync_every: int = SYNC_EVERY,
+        sync_seconds: float = SYNC_SECONDS,
+    ):
+        """Load the journal at ``path``, if any, written with ``fingerprint``.
+
+        Args:
+        ----
+            path (str): Path of the journal file
+            fingerprint (str): Digest of the run settings, see
+                ``settings_fingerprint``
+            root (str): Output directory the pages are recorded relative to
+            sync_every (int): Records written between two fsyncs
+            sync_seconds (float): Seconds after which written records are
+                fsync'd, whatever their number
+
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.root = Path(root) if root else None
+        self.sync_every = sync_every
+        self.sync_seconds = sync_seconds
+        self.recovered = {"pages": 0, "summaries": 0, "seconds": 0.0}
+        self._pages = {}
+        self._summaries = {}
+        self._valid_size = 0
+        self._file = None
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return
+        lines = data.splitlines(keepends=True)
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        if header.get("fingerprint") != self.fingerprint:
+            logger.info("Ignoring checkpoint %s written with other settings", self.path)
+            return
+        size = len(lines[0])
+        for line in lines[1:]:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if "page" in record:
+                self._pages[record["page"]] = record
+            else:
+                self._summaries[record["content"]] = record["summary"]
+            size += len(line)
+        if size < len(data):
+            logger.warning("Dropping a torn record at the end of %s", self.path)
+        self._valid_size = size
+        logger.info(
+            "Resuming from checkpoint %s: %d conversions and %d summaries on record",
+            self.path,
+            len(self._pages),
+            len(self._summaries),
+        )
+
+    @property
+    def resuming(self) -> bool:
+        """Whether an earlier run with the same settings left work on record."""
+        return bool(self._pages or self._summaries)
+
+    def _page_key(self, markdown_file: Path) -> str:
+        path = Path(markdown_file)
+        if self.root is not None and path.is_relative_to(self.root):
+            return path.relative_to(self.root).as_posix()
+        return str(path)
+
+    def converted(self, markdown_file: Path, source_digest: str) -> Optional[str]:
+        """Return the markdown of a page converted by an earlier run, if intact."""
+        record = self._pages.get(self._page_key(markdown_file))
+        if record is None or record["source"] != source_digest:
+            return None
+        try:
+            markdown = Path(markdown_file).read_bytes()
+        except FileNotFoundError:
+            return None
+        if digest(markdown) != record["markdown"]:
+            return None
+        with self._lock:
+            self.recovered["pages"] += 1
+            self.recovered["seconds"] += record.get("seconds", 0.0)
+        return markdown.decode("utf-8")
+
+    def summary(self, content: str) -> Optional[str]:
+        """Return the summary of ``content`` made by an earlier run, if any."""
+        summary = self._summaries.get(digest(content.encode()))
+        if summary is not None:
+            with self._lock:
+                self.recovered["summaries"] += 1
+        return summary
+
+    def has_summary(self, content: str) -> bool:
+        """Return whether ``content`` was summarized, without counting it."""
+        return digest(content.encode()) in self._summaries
+
+    def record_page(
+        self,
+        markdown_file: Path,
+        source_digest: str,
+        markdown: str,
+        seconds: float = 0.0,
+    ) -> None:
+        """Record that a page was converted and written to ``markdown_file``."""
+        record = {
+            "page": self._page_key(markdown_file),
+            "source": source_digest,
+            "markdown": digest(markdown.encode()),
+            "seconds": round(seconds, 3),
+        }
+        self._pages[record["page"]] = record
+        self._append(record)
+
+    def record_summary(self, content: str, summary: str) -> None:
+        """Record the summary of ``content``."""
+        key = digest(content.encode())
+        self._summaries[key] = summary
+        self._append({"content": key, "summary": summary})
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self._valid_size:
+            self._file = self.path.open("r+b")
+            self._file.truncate(self._valid_size)
+            self._file.seek(self._valid_size)
+        else:
+            self._file = self.path.open("wb")
+            self._file.write(
+                json.dumps({"fingerprint": self.fingerprint}).encode() + b"\n",
+            )
+
+    def _append(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            if (
+                self._unsynced >= self.sync_every
+                or time.monotonic() - self._synced_at >= self.sync_seconds
+            ):
+                self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal, keeping it for the next run."""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def log_recovery(self) -> None:
+        """Log the work recovered from earlier runs."""
+        if self.recovered["pages"] or self.recovered["summaries"]:
+            logger.info(
+                "Recovered %d conversions (%.1fs of conversion) and %d summaries "
+                "from checkpoint",
+                self.recovered["pages"],
+                self.recovered["seconds"],
+                self.recovered["summaries"],
+            )
+
+    def finish(self) -> None:
+        """Remove the journal once the run completed."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+        with suppress(OSError):
+            self.path.parent.rmdir()
+
+    def __enter__(self) -> "CheckpointJournal":
+        """Return the journal."""
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *exc_info: object) -> None:
+        """Remove the journal after a run, or keep it when it was interrupted."""
+        self.log_recovery()
+        if exc_type is None:
+            self.finish()
+        else:
+            self.close()
+            logger.warning("Run interrupted, rerun to resume from %s", self.path)
@@ -0,0 +1,139 @@
+"""Precompressed ``.gz`` and ``.br`` siblings of generated outputs."""
+# ruff: noqa: UP007
+
+import gzip
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the installed extras
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_FORMATS = ("gz", "br")
+
+
+def _compress(data: bytes, compression_format: str) -> bytes:
+    if compression_format == "gz":
+        # A fixed mtime keeps the output identical for identical input.
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, mode=brotli.MODE_TEXT)
+
+
+def _decompress(data: bytes, compression_format: str) -> bytes:
+    if compression_format == "gz":
+        return gzip.decompress(data)
+    return brotli.decompress(data)
+
+
+def _is_up_to_date(target: Path, data: bytes, compression_format: str) -> bool:
+    """Return whether ``target`` decompresses to ``data``, not if it is corrupt.
+
+    Decompressing is much cheaper than compressing again, at the levels used.
+    """
+    try:
+        return _decompress(target.read_bytes(), compression_format) == data
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def _compress_file(source: Path, compression_format: str) -> Optional[tuple]:
+    """Write the compressed sibling of ``source`` unless it is up to date.
+
+    The sibling gets the source's modification time. A sibling with another
+    time is rewritten without further checks, one with the same time only
+    when it does not decompress to the source, since a file can change
+    within the timestamp resolution or be restored with an older time.
+
+    Returns the source size and compressed size, None when it was up to date.
+    """
+    target = source.with_name(f"{source.name}.{compression_format}")
+    source_stat = source.stat()
+    data = source.read_bytes()
+    if (
+        target.exists()
+        and target.stat().st_mtime_ns == source_stat.st_mtime_ns
+        and _is_up_to_date(target, data, compression_format)
+    ):
+        return None
+    compressed = _compress(data, compression_format)
+    target.write_bytes(compressed)
+    os.utime(target, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    return source_stat.st_size, len(compressed)
+
+
+def parse_formats(formats: str) -> list:
+    """Parse a comma separated list of compression formats.
+
+    Raises
+    ------
+        ValueError: If a format is unknown
+
+    """
+    parsed = [name.strip().lstrip(".") for name in formats.split(",") if name.strip()]
+    unknown = sorted(set(parsed) - set(COMPRESSION_FORMATS))
+    if unknown:
+        msg = f"Unknown compression {unknown}, expected some of {COMPRESSION_FORMATS}"
+        raise ValueError(msg)
+    return list(dict.fromkeys(parsed))
+
+
+def precompress_files(
+    paths: list,
+    formats: list,
+    workers: Optional[int] = None,
+) -> dict:
+    """Write compressed siblings, e.g. ``llms.txt.gz``, of every path.
+
+    Files are compressed concurrently, zlib and brotli release the GIL while
+    compressing. Sources that did not change since their siblings were
+    written are skipped.
+
+    Args:
+    ----
+        paths (list): Paths of the files to compress
+        formats (list): Compression formats, some of ``COMPRESSION_FORMATS``
+        workers (Optional[int]): Number of files compressed concurrently, one
+            per CPU by default
+
+    Returns:
+    -------
+        dict: Per format, the number of files compressed and skipped and the
+        total source and compressed sizes
+
+    """
+    if "br" in formats and brotli is None:
+        logger.warning("Install the brotli extra to write .br files, skipping them")
+        formats = [name for name in formats if name != "br"]
+    jobs = [(Path(path), name) for name in formats for path in paths]
+    stats = {
+        name: {"compressed": 0, "skipped": 0, "size": 0, "compressed_size": 0}
+        for name in formats
+    }
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = executor.map(lambda job: _compress_file(*job), jobs)
+        for (_, name), result in zip(jobs, results):  # noqa: B905
+            if result is None:
+                stats[name]["skipped"] += 1
+                continue
+            stats[name]["compressed"] += 1
+            stats[name]["size"] += result[0]
+            stats[name]["compressed_size"] += result[1]
+
+    for name, stat in stats.items():
+        ratio = stat["compressed_size"] / stat["size"] if stat["size"] else 1.0
+        logger.info(
+            ".%s: compressed %d files, %d unchanged, %d -> %d bytes (%.1f%%)",
+            name,
+            stat["compressed"],
+            stat["skipped"],
+            stat["size"],
+            stat["compressed_size"],
+            100 * ratio,
+        )
+    return stats
@@ -0,0 +1,276 @@
+"""Mirror a remote documentation site from its sitemap."""
+# ruff: noqa: UP007
+
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Optional
+from urllib.parse import unquote, urljoin
+from xml.sax.saxutils import escape
+
+import requests
+from defusedxml import ElementTree as ET  # noqa: N817
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .outputs import OutputWriter
+from .utils import common_url_prefix, parse_priority, url_to_file_path
+
+logger = logging.getLogger(__name__)
+
+_USER_AGENT = "llms-txt-action"
+_NOT_MODIFIED = 304
+
+
+class CrawlError(RuntimeError):
+    """A sitemap could not be fetched or parsed."""
+
+
+class ResponseCache:
+    """On-disk cache of response bodies with their ETag and Last-Modified."""
+
+    def __init__(self, cache_dir: str):
+        """Use ``cache_dir`` to store responses, it is created if needed."""
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def validators(self, url: str) -> dict:
+        """Return the conditional request headers for a cached ``url``."""
+        meta_path, body_path = self._paths(url)
+        if not (meta_path.exists() and body_path.exists()):
+            return {}
+        meta = json.loads(meta_path.read_text())
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url: str) -> bytes:
+        """Return the cached body of ``url``."""
+        return self._paths(url)[1].read_bytes()
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Cache the body of ``response`` if it can be revalidated."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        meta_path, body_path = self._paths(url)
+        body_path.write_bytes(response.content)
+        meta_path.write_text(
+            json.dumps({"url": url, "etag": etag, "last_modified": last_modified}),
+        )
+
+
+class Crawler:
+    """Fetch pages concurrently over a pooled keep-alive session.
+
+    With a cache directory, requests are conditional on the cached ETag and
+    Last-Modified, so a repeat crawl only transfers pages that changed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        concurrency: int = 8,
+        timeout: float = 30.0,
+    ):
+        """Create a session with one pooled connection per concurrent request."""
+        self.concurrency = max(concurrency, 1)
+        self.timeout = timeout
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = _USER_AGENT
+        adapter = HTTPAdapter(
+            pool_connections=self.concurrency,
+            pool_maxsize=self.concurrency,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats = {"changed": 0, "not_modified": 0, "failed": 0, "bytes": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += value
+
+    def fetch(self, url: str) -> tuple:
+        """Fetch ``url``, revalidating the cached copy when there is one.
+
+        Returns
+        -------
+            tuple: The body and whether it was transferred, False when the
+            cached copy was still valid
+
+        Raises
+        ------
+            requests.RequestException: If the request fails
+
+        """
+        headers = self.cache.validators(url) if self.cache else {}
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == _NOT_MODIFIED and headers:
+            return self.cache.load(url), False
+        response.raise_for_status()
+        self._count("bytes", len(response.content))
+        if self.cache:
+            self.cache.store(url, response)
+        return response.content, True
+
+    def sitemap_entries(self, sitemap_url: str) -> list:
+        """Return ``(loc, priority, lastmod)`` of every page of a sitemap.
+
+        Sitemap indexes are followed to the sitemaps they list.
+
+        Raises
+        ------
+            CrawlError: If a sitemap cannot be fetched or parsed
+
+        """
+        try:
+            root = ET.fromstring(self.fetch(sitemap_url)[0])
+        except (requests.RequestException, ET.ParseError, ValueError) as exc:
+            msg = f"Failed to read the sitemap {sitemap_url}: {exc}"
+            raise CrawlError(msg) from exc
+        ns = {"ns": root.tag.split("}")[0].strip("{")}
+        if root.tag.endswith("sitemapindex"):
+            return [
+                entry
+                for loc in root.findall("ns:sitemap/ns:loc", ns)
+                for entry in self.sitemap_entries(loc.text.strip())
+            ]
+        return [
+            (
+                loc,
+                parse_priority(url.findtext("ns:priority", None, ns), loc),
+                url.findtext("ns:lastmod", "", ns).strip(),
+            )
+            for url in root.findall("ns:url", ns)
+            if (loc := url.findtext("ns:loc", "", ns).strip())
+        ]
+
+    def mirror(
+        self,
+        sitemap_url: str,
+        output_dir: str,
+        sitemap_path: str = "sitemap.xml",
+    ) -> dict:
+        """Mirror the pages of a remote sitemap as a local built site.
+
+        Pages are written where a static site generator would have put them,
+        with the sitemap at ``sitemap_path``, so the mirror can be converted
+        like any ``docs_dir``. Unchanged pages are not rewritten.
+
+        Args:
+        ----
+            sitemap_url (str): URL of the sitemap, or sitemap index
+            output_dir (str): Directory to mirror the site into
+            sitemap_path (str): Path of the sitemap relative to ``output_dir``
+
+        Returns:
+        -------
+            dict: Number of pages, pages changed, not modified and failed, and
+            bytes transferred
+
+        """
+        entries = self.sitemap_entries(sitemap_url)
+        site_url = common_url_prefix([loc for loc, _, _ in entries])
+        writer = OutputWriter()
+
+        def mirror_page(loc: str) -> None:
+            file_path = _mirror_path(loc, site_url, output_dir)
+            if file_path is None:
+                self._count("failed")
+                logger.warning("Skipping %s, it maps outside %s", loc, output_dir)
+                return
+            try:
+                body, transferred = self.fetch(loc)
+            except requests.RequestException as exc:
+                self._count("failed")
+                logger.error("Failed to fetch %s: %s", loc, exc)  # noqa: TRY400
+                return
+            self._count("changed" if transferred else "not_modified")
+            writer.write(file_path, body)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(mirror_page, [loc for loc, _, _ in entries]))
+        writer.write(Path(output_dir) / sitemap_path, _format_sitemap(entries))
+
+        stats = {"pages": len(entries), **self.stats}
+        logger.info(
+            "Crawled %d pages: %d changed, %d not modified, %d failed, "
+            "%d bytes transferred",
+            stats["pages"],
+            stats["changed"],
+            stats["not_modified"],
+            stats["failed"],
+            stats["bytes"],
+        )
+        return stats
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "Crawler":
+        """Return the crawler."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the pooled connections."""
+        self.close()
+
+
+def _mirror_path(loc: str, site_url: str, output_dir: str) -> Optional[Path]:
+    """Return where the page at ``loc`` is mirrored, None if not below ``output_dir``.
+
+    ``<loc>`` values come from the remote sitemap, so paths climbing out of
+    ``output_dir``, also when percent-encoded, are refused.
+    """
+    file_path = url_to_file_path(loc, site_url, ".html")
+    if not file_path:
+        return None
+    for candidate in (file_path, unquote(file_path)):
+        parts = PurePosixPath(candidate.replace("\\", "/")).parts
+        if ".." in parts or PureWindowsPath(candidate).drive:
+            return None
+    root = Path(output_dir).resolve()
+    target = Path(output_dir) / file_path
+    return target if target.resolve().is_relative_to(root) else None
+
+
+def _format_sitemap(entries: list) -> str:
+    """Format ``(loc, priority, lastmod)`` entries as a sitemap urlset."""
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for loc, priority, lastmod in entries:
+        lastmod_tag = f"<lastmod>{escape(lastmod)}</lastmod>" if lastmod else ""
+        lines.append(
+            f"  <url><loc>{escape(loc)}</loc>{lastmod_tag}"
+            f"<priority>{priority}</priority></url>",
+        )
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+
+def sitemap_url_for(url: str, sitemap_path: str = "sitemap.xml") -> str:
+    """Return the sitemap URL of a site URL, sitemap URLs are kept as is."""
+    if url.endswith(".xml"):
+        return url
+    return urljoin(url.rstrip("/") + "/", sitemap_path)
@@ -4,14 +4,41 @@
 import argparse
 import logging
 import os
+import tempfile
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional
 
+from .archives import is_archive, strip_archive_suffix, write_archive
+from .batch import generate_batch, load_batch_config
+from .checkpoint import (
+    CheckpointJournal,
+    journal_path,
+    settings_fingerprint,
+    staging_directory,
+)
+from .compression import parse_formats, precompress_files
+from .crawl import Crawler, sitemap_url_for
+from .export import SectionExporter
+from .minify import MINIFY_RULES, parse_rules
+from .outputs import OutputWriter
+from .planning import format_plan, plan_summaries
+from .progress import LOG_LEVELS, configure_logging
+from .retrieval import build_retrieval_index
+from .routing import parse_models
+from .sharding import write_shards
+from .sinks import OutputSink, open_sink
 from .utils import (
+    SUMMARIZERS,
     concatenate_markdown_files,
     generate_docs_structure,
     html_folder_to_markdown,
+    sitemap_markdown_urls,
+    sitemap_page_urls,
 )
+from .warmup import warmup
+from .watch import DocsWatcher
+from .workers import WorkerPool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,12 +58,44 @@ def generate_documentation(  # noqa: PLR0913
     llms_txt_name: str,
     llms_full_txt_name: str,
     model_name: str,
+    page_timeout: Optional[float] = None,
+    page_memory_limit: Optional[int] = None,
+    workers: int = 1,
+    conversion_fallback: bool = False,  # noqa: FBT001, FBT002
+    slowest_pages: int = 10,
+    split_threshold_kb: int = 0,
+    summarizer: str = "llm",
+    summary_concurrency: int = 1,
+    plan: bool = False,  # noqa: FBT001, FBT002
+    max_llm_calls: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    output_dir: Optional[str] = None,
+    output_archive: Optional[str] = None,
+    full_shard_size_kb: int = 0,
+    precompress: str = "",
+    minify: str = "",
+    crawl_url: str = "",
+    crawl_concurrency: int = 8,
+    crawl_cache_dir: str = "",
+    escalation_model: str = "",
+    escalation_tokens: int = 0,
+    escalation_priority: float = 0.0,
+    fallback_models: str = "",
+    summary_timeout: Optional[float] = None,
+    retrieval_index: bool = False,  # noqa: FBT001, FBT002
+    export_sections: bool = False,  # noqa: FBT001, FBT002
+    checkpoint_dir: str = "",
+    output_url: str = "",
+    output_endpoint_url: str = "",
+    upload_concurrency: int = 16,
+    pool: Optional[WorkerPool] = None,
 ) -> list[str]:
     """Generate markdown and llms.txt files from HTML documentation.
 
     Args:
     ----
-        docs_dir: Directory containing HTML documentation
+        docs_dir: Directory, or zip/tar archive, containing HTML documentation
         sitemap_path: Path to the sitemap.xml file relative to docs_dir
         skip_md_files: Whether to skip generation of markdown files
         skip_llms_txt: Whether to skip llms.txt generation
@@ -44,50 +103,318 @@ def generate_documentation(  # noqa: PLR0913
         llms_txt_name: Name of the llms.txt file
         llms_full_txt_name: Name of the full llms.txt file
         model_name: Name of the model to use for summarization
+        page_timeout: Seconds allowed to convert a single page, or each
+            section of a split page (0 disables)
+        page_memory_limit: Memory cap in megabytes per conversion worker
+        workers: Number of pages converted concurrently
+        conversion_fallback: Use a basic converter for pages that fail
+        slowest_pages: Number of slowest pages to list after conversion
+        split_threshold_kb: Size in KB above which pages are split into
+            sections that are converted concurrently (0 disables)
+        summarizer: ``llm`` to summarize pages with the model, ``extractive``
+            to pick the most representative sentence of each page locally
+        summary_concurrency: Number of concurrent model requests
+        plan: Only log the projected summarization requests, tokens, cost
+            and time, without converting pages or calling the model
+        max_llm_calls: Maximum number of model requests (0 is unlimited)
+        max_tokens: Maximum number of model tokens (0 is unlimited)
+        time_budget: Seconds allowed for summarization (0 is unlimited);
+            pages beyond these limits, least important first, use their heading
+        output_dir: Directory to write outputs to, ``docs_dir`` by default or
+            the archive path without its suffix when ``docs_dir`` is an archive
+        output_archive: Pack the outputs into this zip/tar archive instead of
+            writing them as loose files
+        full_shard_size_kb: Split the full llms.txt into shards of about this
+            many KB with a JSONL index of every section (0 writes one file)
+        precompress: Comma separated compression formats, ``gz`` and/or
+            ``br``, to write next to every generated output for static hosting
+        minify: Comma separated minification rules applied to every page,
+            ``all`` for all of ``MINIFY_RULES``
+        crawl_url: URL of a remote site or of its sitemap to mirror into
+            ``docs_dir`` before generating, instead of a local build
+        crawl_concurrency: Number of pages fetched concurrently
+        crawl_cache_dir: Directory caching responses, repeat crawls only
+            transfer pages that changed (empty disables)
+        escalation_model: Stronger model used instead of ``model_name`` for
+            long or high-priority pages
+        escalation_tokens: Prompt tokens from which a page is escalated
+            (0 disables)
+        escalation_priority: Sitemap priority from which a page is escalated
+            (0 disables)
+        fallback_models: Comma separated models tried in order when a summary
+            request fails or times out
+        summary_timeout: Seconds allowed per model request (0 is unlimited)
+        retrieval_index: Write a memory-mappable TF-IDF index of every section
+            next to the full llms.txt, see
+            :func:`~llms_txt_action.retrieval.build_retrieval_index`
+        export_sections: Stream one JSONL record per section of every page
+            to a ``.sections.jsonl`` file next to the full llms.txt while
+            pages are converted, see
+            :class:`~llms_txt_action.export.SectionExporter`
+        checkpoint_dir: Directory of the journal recording converted pages and
+            summaries, an interrupted run resumes from it and the journal is
+            removed once the run completes (empty disables)
+        output_url: Object storage location, ``s3://bucket/prefix``, every
+            output is uploaded to as soon as it is written (empty keeps
+            outputs local), see :class:`~llms_txt_action.sinks.S3Sink`
+        output_endpoint_url: Endpoint of an S3-compatible service such as
+            MinIO, AWS by default
+        upload_concurrency: Number of files, and parts of large files,
+            uploaded concurrently
+        pool: Conversion worker pool shared with other sites, see
+            :func:`~llms_txt_action.batch.generate_batch`
 
     Returns:
     -------
-        List of generated markdown file paths
+        List of generated markdown file paths, or of their member names
+        when writing ``output_archive``
 
     """
     docs_dir = docs_dir.rstrip("/")
+    archive_input = is_archive(docs_dir)
+    if crawl_url:
+        if plan:
+            msg = f"Cannot crawl {crawl_url} when planning, plans make no requests."
+            raise ValueError(msg)
+        if archive_input:
+            msg = f"Cannot crawl {crawl_url} into the archive {docs_dir}."
+            raise ValueError(msg)
+        with Crawler(crawl_cache_dir or None, crawl_concurrency) as crawler:
+            crawler.mirror(
+                sitemap_url_for(crawl_url, sitemap_path),
+                docs_dir,
+                sitemap_path,
+            )
+    output_dir = (
+        output_dir or (strip_archive_suffix(docs_dir) if archive_input else docs_dir)
+    ).rstrip("/")
+    checkpoint = (
+        journal_path(checkpoint_dir, output_archive or output_dir)
+        if checkpoint_dir
+        else None
+    )
+    # Archives are staged next to the journal, so a resumed run finds the
+    # pages of the interrupted one.
+    staging_path = checkpoint.with_suffix(".staging") if checkpoint else None
+    journal = (
+        CheckpointJournal(
+            checkpoint,
+            settings_fingerprint(
+                {
+                    "model_name": model_name,
+                    "summarizer": summarizer,
+                    "escalation_model": escalation_model,
+                    "escalation_tokens": escalation_tokens,
+                    "escalation_priority": escalation_priority,
+                    "fallback_models": fallback_models,
+                    "conversion_fallback": conversion_fallback,
+                    "split_threshold_kb": split_threshold_kb,
+                    "minify": parse_rules(minify),
+                },
+            ),
+            root=str(staging_path) if output_archive else output_dir,
+        )
+        if checkpoint
+        else None
+    )
+    if plan:
+        logger.info(
+            "%s",
+            format_plan(
+                plan_summaries(
+                    output_dir,
+                    sitemap_path,
+                    model_name,
+                    summarizer,
+                    summary_concurrency,
+                    sitemap_root=docs_dir,
+                    journal=journal,
+                    max_llm_calls=max_llm_calls,
+                    max_tokens=max_tokens,
+                    time_budget=time_budget,
+                ),
+            ),
+        )
+        return []
+
+    if output_archive and journal:
+        staging = staging_directory(staging_path, keep=journal.resuming)
+    elif output_archive:
+        staging = tempfile.TemporaryDirectory()
+    else:
+        staging = nullcontext()
+    with journal or nullcontext(), staging as staging_dir:
+        output_dir = staging_dir or output_dir
+        with open_sink(
+            output_url,
+            output_dir,
+            endpoint_url=output_endpoint_url,
+            concurrency=upload_concurrency,
+        ) as sink:
+            markdown_files = _generate_outputs(
+                docs_dir,
+                output_dir,
+                sitemap_path,
+                llms_txt_name,
+                llms_full_txt_name,
+                model_name,
+                skip_md_files=skip_md_files,
+                skip_llms_txt=skip_llms_txt,
+                skip_llms_full_txt=skip_llms_full_txt,
+                full_shard_size=full_shard_size_kb * 1024,
+                retrieval_index=retrieval_index,
+                export_sections=export_sections,
+                compression_formats=parse_formats(precompress),
+                sink=sink,
+                conversion_options={
+                    "page_timeout": page_timeout,
+                    "memory_limit_mb": page_memory_limit,
+                    "workers": workers,
+                    "fallback": conversion_fallback,
+                    "slowest_pages": slowest_pages,
+                    "split_threshold": split_threshold_kb * 1024,
+                    "minify_rules": parse_rules(minify),
+                    "pool": pool,
+                    "journal": journal,
+                },
+                summary_options={
+                    "summarizer": summarizer,
+                    "summary_concurrency": summary_concurrency,
+                    "max_llm_calls": max_llm_calls,
+                    "max_tokens": max_tokens,
+                    "time_budget": time_budget,
+                    "escalation_model": escalation_model,
+                    "escalation_tokens": escalation_tokens,
+                    "escalation_priority": escalation_priority,
+                    "fallback_models": parse_models(fallback_models),
+                    "summary_timeout": summary_timeout,
+                    "journal": journal,
+                },
+            )
+        if output_archive:
+            members = write_archive(output_archive, output_dir)
+            logger.info("Packed %d files into %s", len(members), output_archive)
+            # The staging directory is removed, name pages by their member.
+            pages = {Path(markdown_file) for markdown_file in markdown_files}
+            markdown_files = [
+                name for name in members if Path(output_dir) / name in pages
+            ]
+
+    logger.info("Docs are LLM friendly now! 🎉")
+    return markdown_files
+
+
+def _generate_outputs(  # noqa: PLR0913
+    docs_dir: str,
+    output_dir: str,
+    sitemap_path: str,
+    llms_txt_name: str,
+    llms_full_txt_name: str,
+    model_name: str,
+    *,
+    skip_md_files: Optional[bool],
+    skip_llms_txt: Optional[bool],
+    skip_llms_full_txt: Optional[bool],
+    full_shard_size: int,
+    retrieval_index: bool,
+    export_sections: bool,
+    compression_formats: list,
+    sink: OutputSink,
+    conversion_options: dict,
+    summary_options: dict,
+) -> list:
+    """Convert the pages of ``docs_dir`` and write all outputs to ``output_dir``.
+
+    The sitemap is always read from ``docs_dir``, the pages it lists from the
+    markdown files written to ``output_dir``. Every output is published to
+    ``sink`` once written, markdown pages only when they are kept.
+    """
     logger.info("Starting Generation at folder - %s", docs_dir)
 
     logger.info("Generating MD files for all HTML files at folder - %s", docs_dir)
-    markdown_files = html_folder_to_markdown(docs_dir)
+    writer = OutputWriter(sink)
+    exporter = (
+        _sections_exporter(
+            docs_dir,
+            output_dir,
+            sitemap_path,
+            f"{output_dir}/{Path(llms_full_txt_name).stem}.sections.jsonl",
+            model_name,
+            writer,
+        )
+        if export_sections
+        else None
+    )
+    with exporter or nullcontext():
+        markdown_files = html_folder_to_markdown(
+            docs_dir,
+            output_dir=output_dir if output_dir != docs_dir else None,
+            writer=OutputWriter() if skip_md_files else writer,
+            on_page=exporter.add if exporter else None,
+            **conversion_options,
+        )
 
     # Set defaults if None
     skip_md_files = False if skip_md_files is None else skip_md_files
     skip_llms_txt = False if skip_llms_txt is None else skip_llms_txt
     skip_llms_full_txt = False if skip_llms_full_txt is None else skip_llms_full_txt
 
+    outputs = [exporter.output_file] if exporter else []
     if not skip_llms_txt:
-        with Path(f"{docs_dir}/{llms_txt_name}").open("w") as f:
-            try:
-                f.write(
-                    generate_docs_structure(
-                        docs_dir,
-                        sitemap_path,
-                        model_name,
-                    ),
-                )
-                logger.info(
-                    "llms.txt file generated at %s",
-                    f"{docs_dir}/{llms_txt_name}",
-                )
-            except FileNotFoundError:
-                logger.exception(
-                    "Failed to generate llms.txt file",
-                )
-
-    if not skip_llms_full_txt:
+        try:
+            writer.write(
+                f"{output_dir}/{llms_txt_name}",
+                generate_docs_structure(
+                    output_dir,
+                    sitemap_path,
+                    model_name,
+                    sitemap_root=docs_dir,
+                    **summary_options,
+                ),
+            )
+            outputs.append(Path(f"{output_dir}/{llms_txt_name}"))
+            logger.info(
+                "llms.txt file generated at %s",
+                f"{output_dir}/{llms_txt_name}",
+            )
+        except FileNotFoundError:
+            logger.exception(
+                "Failed to generate llms.txt file",
+            )
+
+    urls = (
+        _page_urls(docs_dir, output_dir, sitemap_path)
+        if (full_shard_size and not skip_llms_full_txt) or retrieval_index
+        else {}
+    )
+    if not skip_llms_full_txt and full_shard_size:
+        shards, index_file = write_shards(
+            markdown_files,
+            f"{output_dir}/{llms_full_txt_name}",
+            full_shard_size,
+            urls=urls,
+            model_name=model_name,
+            writer=writer,
+        )
+        outputs.extend([*shards, index_file])
+    elif not skip_llms_full_txt:
         concatenate_markdown_files(
             markdown_files,
-            f"{docs_dir}/{llms_full_txt_name}",
+            f"{output_dir}/{llms_full_txt_name}",
+            writer,
         )
         logger.info(
             "llms-full.txt file generated at %s",
-            f"{docs_dir}/{llms_full_txt_name}",
+            f"{output_dir}/{llms_full_txt_name}",
+        )
+        outputs.append(Path(f"{output_dir}/{llms_full_txt_name}"))
+
+    if retrieval_index:
+        build_retrieval_index(
+            markdown_files,
+            f"{output_dir}/{Path(llms_full_txt_name).stem}.retrieval",
+            urls=urls,
+            writer=writer,
         )
 
     if skip_md_files:
@@ -95,16 +422,58 @@ def generate_documentation(  # noqa: PLR0913
         for file in markdown_files:
             Path(file).unlink()
         logger.info(".md files deleted.")
+    else:
+        outputs.extend(markdown_files)
+    writer.log_summary()
 
-    logger.info("Docs are LLM friendly now! 🎉")
+    if compression_formats:
+        precompress_files(outputs, compression_formats)
+        _publish_siblings(outputs, compression_formats, sink)
     return markdown_files
 
 
-def main():
-    """Parse arguments and run generate_documentation."""
-    parser = argparse.ArgumentParser(
-        description="Generate markdown and llms.txt files from HTML documentation.",
+def _publish_siblings(outputs: list, compression_formats: list, sink: OutputSink):
+    """Publish the precompressed siblings of ``outputs``, written without a writer."""
+    for path in outputs:
+        for compression_format in compression_formats:
+            sibling = path.with_name(f"{path.name}.{compression_format}")
+            if sibling.exists():
+                sink.put(sibling)
+
+
+def _page_urls(docs_dir: str, output_dir: str, sitemap_path: str) -> dict:
+    """Return the sitemap URL of each markdown file, empty without a sitemap."""
+    try:
+        return sitemap_markdown_urls(output_dir, sitemap_path, docs_dir)
+    except FileNotFoundError:
+        logger.warning("No sitemap found, the indexes of outputs have no URLs")
+        return {}
+
+
+def _sections_exporter(  # noqa: PLR0913
+    docs_dir: str,
+    output_dir: str,
+    sitemap_path: str,
+    output_file: str,
+    model_name: str,
+    writer: OutputWriter,
+) -> SectionExporter:
+    """Start a section export, with the URLs of the pages about to be converted."""
+    try:
+        urls = sitemap_page_urls(docs_dir, sitemap_path, output_dir)
+    except FileNotFoundError:
+        logger.warning("No sitemap found, exported sections have no URLs")
+        urls = {}
+    return SectionExporter(
+        output_file,
+        urls=urls,
+        model_name=model_name,
+        writer=writer,
     )
+
+
+def _add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options shared by all commands to ``parser``."""
     parser.add_argument(
         "--docs-dir",
         default=os.environ.get("INPUT_DOCS_DIR", "site"),
@@ -148,20 +517,355 @@ def main():
         default=os.environ.get("INPUT_MODEL_NAME", "gpt-4o"),
         help="Name of the model to use for summarization [default: gpt-4o]",
     )
+    parser.add_argument(
+        "--page-timeout",
+        type=float,
+        default=float(os.environ.get("INPUT_PAGE_TIMEOUT", "0")),
+        help="Seconds allowed to convert a single page, 0 disables [default: 0]",
+    )
+    parser.add_argument(
+        "--page-memory-limit",
+        type=int,
+        default=int(os.environ.get("INPUT_PAGE_MEMORY_LIMIT", "0")),
+        help="Memory cap in MB per conversion worker, 0 disables [default: 0]",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("INPUT_WORKERS", "1")),
+        help="Number of pages converted concurrently [default: 1]",
+    )
+    parser.add_argument(
+        "--conversion-fallback",
+        action="store_true",
+        default=str2bool(os.environ.get("INPUT_CONVERSION_FALLBACK", "false")),
+        help="Use a basic converter for pages that fail or time out",
+    )
+    parser.add_argument(
+        "--slowest-pages",
+        type=int,
+        default=int(os.environ.get("INPUT_SLOWEST_PAGES", "10")),
+        help="Number of slowest pages to list after conversion [default: 10]",
+    )
+    parser.add_argument(
+        "--split-threshold-kb",
+        type=int,
+        default=int(os.environ.get("INPUT_SPLIT_THRESHOLD_KB", "0")),
+        help="Split pages larger than this many KB into sections, 0 disables "
+        "[default: 0]",
+    )
+    parser.add_argument(
+        "--summarizer",
+        choices=SUMMARIZERS,
+        default=os.environ.get("INPUT_SUMMARIZER", "llm"),
+        help="How to summarize pages: 'llm' uses the model (or page headings "
+        "without MODEL_API_KEY), 'extractive' picks a sentence of each page "
+        "locally [default: llm]",
+    )
+    parser.add_argument(
+        "--summary-concurrency",
+        type=int,
+        default=int(os.environ.get("INPUT_SUMMARY_CONCURRENCY", "1")),
+        help="Number of concurrent model requests [default: 1]",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        default=str2bool(os.environ.get("INPUT_PLAN", "false")),
+        help="Log projected model requests, tokens, cost and time, then exit "
+        "without converting pages or calling the model, not with --crawl-url",
+    )
+    parser.add_argument(
+        "--max-llm-calls",
+        type=int,
+        default=int(os.environ.get("INPUT_MAX_LLM_CALLS", "0")),
+        help="Maximum number of model requests, 0 is unlimited [default: 0]",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=int(os.environ.get("INPUT_MAX_TOKENS", "0")),
+        help="Maximum number of model tokens, 0 is unlimited [default: 0]",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=float(os.environ.get("INPUT_TIME_BUDGET", "0")),
+        help="Seconds allowed for summarization, 0 is unlimited [default: 0]",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=os.environ.get("INPUT_OUTPUT_DIR", ""),
+        help="Directory to write outputs to [default: docs_dir, or the archive "
+        "path without its suffix when docs_dir is a zip/tar archive]",
+    )
+    parser.add_argument(
+        "--output-archive",
+        default=os.environ.get("INPUT_OUTPUT_ARCHIVE", ""),
+        help="Pack the outputs into this .zip/.tar/.tar.gz archive instead of "
+        "writing loose files",
+    )
+    parser.add_argument(
+        "--full-shard-size-kb",
+        type=int,
+        default=int(os.environ.get("INPUT_FULL_SHARD_SIZE_KB", "0")),
+        help="Split the full llms.txt into shards of about this many KB with a "
+        "JSONL index of every section, 0 writes a single file [default: 0]",
+    )
+    parser.add_argument(
+        "--precompress",
+        default=os.environ.get("INPUT_PRECOMPRESS", ""),
+        help="Comma separated formats, 'gz' and/or 'br', of compressed copies to "
+        "write next to every output, e.g. llms.txt.gz [default: none]",
+    )
+    parser.add_argument(
+        "--minify",
+        default=os.environ.get("INPUT_MINIFY", ""),
+        help="Comma separated markdown minification rules, some of "
+        f"{', '.join(MINIFY_RULES)}, or 'all' [default: none]",
+    )
+    parser.add_argument(
+        "--crawl-url",
+        default=os.environ.get("INPUT_CRAWL_URL", ""),
+        help="URL of a remote site, or of its sitemap, to mirror into docs_dir "
+        "instead of using a local build [default: none]",
+    )
+    parser.add_argument(
+        "--crawl-concurrency",
+        type=int,
+        default=int(os.environ.get("INPUT_CRAWL_CONCURRENCY", "8")),
+        help="Number of pages fetched concurrently [default: 8]",
+    )
+    parser.add_argument(
+        "--crawl-cache-dir",
+        default=os.environ.get("INPUT_CRAWL_CACHE_DIR", ""),
+        help="Directory caching crawled responses so repeat crawls only transfer "
+        "changed pages, keep it outside published files [default: none]",
+    )
+    parser.add_argument(
+        "--escalation-model",
+        default=os.environ.get("INPUT_ESCALATION_MODEL", ""),
+        help="Stronger model to summarize long or high-priority pages with "
+        "[default: none]",
+    )
+    parser.add_argument(
+        "--escalation-tokens",
+        type=int,
+        default=int(os.environ.get("INPUT_ESCALATION_TOKENS", "0")),
+        help="Escalate pages with at least this many prompt tokens, 0 disables "
+        "[default: 0]",
+    )
+    parser.add_argument(
+        "--escalation-priority",
+        type=float,
+        default=float(os.environ.get("INPUT_ESCALATION_PRIORITY", "0")),
+        help="Escalate pages with at least this sitemap priority, 0 disables "
+        "[default: 0]",
+    )
+    parser.add_argument(
+        "--fallback-models",
+        default=os.environ.get("INPUT_FALLBACK_MODELS", ""),
+        help="Comma separated models tried in order when a summary request "
+        "fails or times out [default: none]",
+    )
+    parser.add_argument(
+        "--summary-timeout",
+        type=float,
+        default=float(os.environ.get("INPUT_SUMMARY_TIMEOUT", "0")),
+        help="Seconds allowed per model request before falling back to the next "
+        "model, 0 is unlimited [default: 0]",
+    )
+    parser.add_argument(
+        "--retrieval-index",
+        action="store_true",
+        default=str2bool(os.environ.get("INPUT_RETRIEVAL_INDEX", "false")),
+        help="Write a memory-mappable TF-IDF retrieval index of every section "
+        "next to the full llms.txt",
+    )
+    parser.add_argument(
+        "--export-sections",
+        action="store_true",
+        default=str2bool(os.environ.get("INPUT_EXPORT_SECTIONS", "false")),
+        help="Write one JSONL record per section of every page, with its URL, "
+        "headings, text, byte offsets and tokens, next to the full llms.txt",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=os.environ.get("INPUT_CHECKPOINT_DIR", ""),
+        help="Directory of the journal of completed conversions and summaries, "
+        "an interrupted run resumes from it, e.g. .llms-txt-checkpoint "
+        "[default: none]",
+    )
+    parser.add_argument(
+        "--output-url",
+        default=os.environ.get("INPUT_OUTPUT_URL", ""),
+        help="Upload every output to this object storage location, "
+        "s3://bucket/prefix, as it is written [default: none]",
+    )
+    parser.add_argument(
+        "--output-endpoint-url",
+        default=os.environ.get("INPUT_OUTPUT_ENDPOINT_URL", ""),
+        help="Endpoint of an S3-compatible service such as MinIO [default: AWS]",
+    )
+    parser.add_argument(
+        "--upload-concurrency",
+        type=int,
+        default=int(os.environ.get("INPUT_UPLOAD_CONCURRENCY", "16")),
+        help="Number of files and parts uploaded concurrently [default: 16]",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=LOG_LEVELS,
+        default=os.environ.get("INPUT_LOG_LEVEL", "INFO").upper(),
+        help="Level of the messages shown on the console, per-page details are "
+        "logged at DEBUG [default: INFO]",
+    )
+    parser.add_argument(
+        "--log-file",
+        default=os.environ.get("INPUT_LOG_FILE", ""),
+        help="File receiving every message down to DEBUG, including per-page "
+        "details [default: none]",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        default=str2bool(os.environ.get("INPUT_PROGRESS", "false")),
+        help="Show progress bars with rate and ETA while converting and "
+        "summarizing pages",
+    )
+    parser.add_argument(
+        "--batch-config",
+        default=os.environ.get("INPUT_BATCH_CONFIG", ""),
+        help="JSON file listing several sites to generate in one run over a "
+        "shared worker pool, other options are defaults for every site "
+        "[default: none]",
+    )
+
+
+def main():
+    """Parse arguments and run generate_documentation."""
+    parser = argparse.ArgumentParser(
+        description="Generate markdown and llms.txt files from HTML documentation.",
+    )
+    _add_arguments(parser)
+    subparsers = parser.add_subparsers(dest="command")
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Regenerate outputs incrementally whenever docs_dir changes",
+        description="Keep the converter loaded, watch docs_dir for changed HTML "
+        "and sitemap files and regenerate only the affected outputs.",
+    )
+    _add_arguments(watch_parser)
+    # Options may be given before or after ``watch``: only those given after
+    # it are set by the subcommand, without resetting the others to defaults.
+    for action in watch_parser._actions:  # noqa: SLF001
+        action.default = argparse.SUPPRESS
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between two scans of docs_dir [default: 1]",
+    )
+
+    warmup_parser = subparsers.add_parser(
+        "warmup",
+        help="Prepare a cold environment, e.g. at image build time",
+        description="Compile the bytecode of heavy dependencies and optionally "
+        "download docling's model assets, then report the cold and warm time "
+        "to convert a first page.",
+    )
+    warmup_parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("INPUT_WARMUP_CACHE_DIR", ""),
+        help="Directory to download model assets to [default: none]",
+    )
+    warmup_parser.add_argument(
+        "--models",
+        action="store_true",
+        help="Download and verify docling's model assets into --cache-dir, "
+        "only PDF and image conversion use them",
+    )
 
     args = parser.parse_args()
+    # argparse checks the choices of given options, not of their defaults.
+    if args.log_level not in LOG_LEVELS:
+        parser.error(
+            f"invalid INPUT_LOG_LEVEL {args.log_level!r}, expected one of "
+            f"{', '.join(LOG_LEVELS)}",
+        )
+    configure_logging(args.log_level, args.log_file, progress=args.progress)
     logger.info("input args: %s", args)
 
-    generate_documentation(
-        docs_dir=args.docs_dir,
-        sitemap_path=args.sitemap_path,
-        skip_md_files=args.skip_md_files,
-        skip_llms_txt=args.skip_llms_txt,
-        skip_llms_full_txt=args.skip_llms_full_txt,
-        llms_txt_name=args.llms_txt_name,
-        llms_full_txt_name=args.llms_full_txt_name,
-        model_name=args.model_name,
-    )
+    if args.command == "warmup":
+        warmup(args.cache_dir, models=args.models)
+        return
+
+    options = {
+        "docs_dir": args.docs_dir,
+        "sitemap_path": args.sitemap_path,
+        "skip_md_files": args.skip_md_files,
+        "skip_llms_txt": args.skip_llms_txt,
+        "skip_llms_full_txt": args.skip_llms_full_txt,
+        "llms_txt_name": args.llms_txt_name,
+        "llms_full_txt_name": args.llms_full_txt_name,
+        "model_name": args.model_name,
+        "page_timeout": args.page_timeout,
+        "page_memory_limit": args.page_memory_limit,
+        "workers": args.workers,
+        "conversion_fallback": args.conversion_fallback,
+        "slowest_pages": args.slowest_pages,
+        "split_threshold_kb": args.split_threshold_kb,
+        "summarizer": args.summarizer,
+        "summary_concurrency": args.summary_concurrency,
+        "plan": args.plan,
+        "max_llm_calls": args.max_llm_calls,
+        "max_tokens": args.max_tokens,
+        "time_budget": args.time_budget,
+        "output_dir": args.output_dir,
+        "output_archive": args.output_archive,
+        "full_shard_size_kb": args.full_shard_size_kb,
+        "precompress": args.precompress,
+        "minify": args.minify,
+        "crawl_url": args.crawl_url,
+        "crawl_concurrency": args.crawl_concurrency,
+        "crawl_cache_dir": args.crawl_cache_dir,
+        "escalation_model": args.escalation_model,
+        "escalation_tokens": args.escalation_tokens,
+        "escalation_priority": args.escalation_priority,
+        "fallback_models": args.fallback_models,
+        "summary_timeout": args.summary_timeout,
+        "retrieval_index": args.retrieval_index,
+        "export_sections": args.export_sections,
+        "checkpoint_dir": args.checkpoint_dir,
+        "output_url": args.output_url,
+        "output_endpoint_url": args.output_endpoint_url,
+        "upload_concurrency": args.upload_concurrency,
+    }
+    if args.command == "watch":
+        watcher = DocsWatcher(**options)
+        ignored = [
+            name
+            for name in watcher.ignored
+            if options[name] != parser.get_default(name)
+        ]
+        if ignored:
+            logger.warning("Ignoring options of full runs: %s", ", ".join(ignored))
+        watcher.run(args.interval)
+        return
+    if args.batch_config:
+        defaults, sites, site_concurrency = load_batch_config(
+            args.batch_config,
+            generate_documentation,
+        )
+        generate_batch(
+            generate_documentation,
+            sites,
+            {**options, **defaults},
+            site_concurrency,
+        )
+        return
+    generate_documentation(**options)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+"""Structured export of the documentation corpus, one record per section."""
+# ruff: noqa: UP007
+
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+
+from .outputs import OutputWriter
+from .sharding import split_sections
+from .utils import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class SectionExporter:
+    """Stream a JSONL record for every section of every converted page.
+
+    Each line describes one section::
+
+        {"url": ..., "file": ..., "headings": [...], "text": ...,
+         "offset": ..., "length": ..., "tokens": ...}
+
+    where ``headings`` is the path of headings from the page title down to
+    the section, and ``offset`` and ``length`` locate the section in bytes
+    within its markdown file. Records are written as pages are converted and
+    the file is put in place when the exporter is closed.
+    """
+
+    def __init__(
+        self,
+        output_file: str,
+        *,
+        urls: Optional[dict] = None,
+        model_name: str = "gpt-4o",
+        writer: Optional[OutputWriter] = None,
+    ):
+        """Start exporting to ``output_file``, relative paths are from its folder.
+
+        Args:
+        ----
+            output_file (str): Path of the JSONL file
+            urls (Optional[dict]): Page URL by markdown file path
+            model_name (str): Model whose tokenizer counts section tokens
+            writer (Optional[OutputWriter]): Writer counting written and
+                unchanged outputs
+
+        """
+        self.output_file = Path(output_file)
+        self.urls = urls or {}
+        self.model_name = model_name
+        self.sections = 0
+        self._file = (writer or OutputWriter()).open(
+            self.output_file,
+            "w",
+            encoding="utf-8",
+        )
+
+    def add(self, markdown_file: Path, markdown: str) -> None:
+        """Write the records of every section of a converted page."""
+        markdown_file = Path(markdown_file)
+        try:
+            path = markdown_file.relative_to(self.output_file.parent).as_posix()
+        except ValueError:
+            path = str(markdown_file)
+        headings, offset = [], 0
+        for heading, level, text in split_sections(markdown):
+            if level:
+                while headings and headings[-1][0] >= level:
+                    headings.pop()
+                headings.append((level, heading))
+            length = len(text.encode("utf-8"))
+            record = {
+                "url": self.urls.get(markdown_file, ""),
+                "file": path,
+                "headings": [name for _, name in headings],
+                "text": text,
+                "offset": offset,
+                "length": length,
+                "tokens": count_tokens(text, self.model_name),
+            }
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            offset += length
+            self.sections += 1
+
+    def close(self) -> None:
+        """Put the export in place, unless it did not change."""
+        self._file.close()
+        logger.info("Exported %d sections to %s", self.sections, self.output_file)
+
+    def discard(self) -> None:
+        """Drop a partial export, leaving the previous one in place."""
+        self._file.discard()
+
+    def __enter__(self) -> "SectionExporter":
+        """Return the exporter."""
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *exc_info: object) -> None:
+        """Close the exporter, or discard it when an exception was raised."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -0,0 +1,92 @@
+"""Normalize and minify converted markdown before it is written."""
+
+import re
+
+MINIFY_RULES = ("anchors", "images", "links", "separators", "whitespace")
+
+_FENCE = "```"
+_ANCHOR_LINK_RE = re.compile(r"\[(?:¶|#|)\]\(#[^)]*\)")
+_IMAGE_PLACEHOLDER = "<!-- image -->"
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_LINK_RE = re.compile(r"(?<!!)\[([^\]]+)\]\(([^)\s]+)(?:\s+\"[^\"]*\")?\)")
+_SEPARATOR_RE = re.compile(r"^\s*([-*_=~])(?:\s*\1){2,}\s*$")
+
+
+def parse_rules(rules: str) -> list:
+    """Parse a comma separated list of minification rules, ``all`` for every rule.
+
+    Raises
+    ------
+        ValueError: If a rule is unknown
+
+    """
+    parsed = [name.strip() for name in rules.split(",") if name.strip()]
+    if "all" in parsed:
+        return list(MINIFY_RULES)
+    unknown = sorted(set(parsed) - set(MINIFY_RULES))
+    if unknown:
+        msg = f"Unknown minify rules {unknown}, expected some of {MINIFY_RULES}"
+        raise ValueError(msg)
+    return [name for name in MINIFY_RULES if name in parsed]
+
+
+def _minify_line(line: str, rules: list, seen_links: set) -> str:
+    if "anchors" in rules:
+        line = _ANCHOR_LINK_RE.sub("", line).replace("¶", "")
+    if "images" in rules:
+        line = _IMAGE_RE.sub(r"\1", line.replace(_IMAGE_PLACEHOLDER, ""))
+    if "links" in rules:
+
+        def first_link(match: re.Match) -> str:
+            if match.group(2) in seen_links:
+                return match.group(1)
+            seen_links.add(match.group(2))
+            return match.group(0)
+
+        line = _LINK_RE.sub(first_link, line)
+    if "separators" in rules and _SEPARATOR_RE.match(line):
+        return ""
+    return line.rstrip() if "whitespace" in rules else line
+
+
+def minify_markdown(markdown: str, rules: list = MINIFY_RULES) -> str:
+    """Minify markdown with the given rules, code blocks are left untouched.
+
+    Rules:
+
+    - ``anchors``: drop Sphinx ``¶`` permalinks and empty anchor links
+    - ``images``: drop image placeholders, keep the alt text of images
+    - ``links``: keep only the first link to each target, later ones become
+      plain text
+    - ``separators``: drop decorative lines such as ``---`` or ``=====``
+    - ``whitespace``: strip trailing spaces and collapse runs of blank lines
+
+    Args:
+    ----
+        markdown (str): Markdown content of a page
+        rules (list): Rules to apply, some of ``MINIFY_RULES``
+
+    Returns:
+    -------
+        str: The minified markdown
+
+    """
+    lines, seen_links, in_code = [], set(), False
+    for raw_line in markdown.splitlines():
+        if raw_line.lstrip().startswith(_FENCE):
+            in_code = not in_code
+            lines.append(raw_line)
+            continue
+        if in_code:
+            lines.append(raw_line)
+            continue
+        line = _minify_line(raw_line, rules, seen_links)
+        if "whitespace" in rules and not line and (not lines or not lines[-1]):
+            continue
+        lines.append(line)
+    if "whitespace" in rules:
+        while lines and not lines[-1]:
+            lines.pop()
+    elif markdown.endswith("\n"):
+        lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,160 @@
+"""Atomic output files that are only replaced when their content changed."""
+# ruff: noqa: UP007
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import IO, Optional, Union
+
+from .sinks import OutputSink
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1 << 20
+
+
+def _file_digest(path: Path) -> bytes:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _same_content(path: Path, other: Path) -> bool:
+    """Return whether ``path`` exists with the same content as ``other``."""
+    try:
+        if path.stat().st_size != other.stat().st_size:
+            return False
+    except FileNotFoundError:
+        return False
+    return _file_digest(path) == _file_digest(other)
+
+
+class PendingFile:
+    """A temporary file that replaces its target on ``close`` if it differs.
+
+    Data is written next to the target and renamed over it, so readers never
+    see a partially written file. A target whose content is unchanged keeps
+    its modification time.
+    """
+
+    def __init__(self, writer: "OutputWriter", path: Path, mode: str, **kwargs):
+        """Open a temporary file next to ``path``."""
+        self.path = path
+        self._writer = writer
+        self._temp_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp",
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unlike tempfile, os.open applies the umask like a regular open would.
+        fd = os.open(self._temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        self._file: IO = os.fdopen(fd, mode, **kwargs)
+
+    def write(self, data: Union[str, bytes]) -> int:
+        """Write ``data`` to the temporary file."""
+        return self._file.write(data)
+
+    def close(self, *, compare: bool = True) -> bool:
+        """Replace the target if the content changed.
+
+        Args:
+        ----
+            compare (bool): Compare with the target, when the caller already
+                knows the content changed it is replaced directly
+
+        Returns:
+        -------
+            bool: Whether the target was written
+
+        """
+        self._file.close()
+        if compare and _same_content(self.path, self._temp_path):
+            self._temp_path.unlink()
+            self._writer.record(self.path, written=False)
+            return False
+        self._temp_path.replace(self.path)
+        self._writer.record(self.path, written=True)
+        return True
+
+    def discard(self) -> None:
+        """Drop the temporary file and leave the target untouched."""
+        self._file.close()
+        self._temp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "PendingFile":
+        """Return the pending file."""
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        """Replace the target, or discard the data if the block raised."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class OutputWriter:
+    """Write output files atomically and count written and unchanged files.
+
+    Every output in place, written or unchanged, is handed to ``sink`` to be
+    published, e.g. uploaded to object storage while the run goes on.
+    """
+
+    def __init__(self, sink: Optional[OutputSink] = None):
+        """Start with no files written."""
+        self.written = 0
+        self.unchanged = 0
+        self.sink = sink or OutputSink()
+        self._lock = threading.Lock()
+
+    def record(self, path: Path, *, written: bool) -> None:
+        """Count ``path`` as written or unchanged and publish it."""
+        with self._lock:
+            if written:
+                self.written += 1
+            else:
+                self.unchanged += 1
+        logger.debug("%s %s", "Wrote" if written else "Unchanged", path)
+        self.sink.put(path)
+
+    def open(self, path: Union[str, Path], mode: str = "w", **kwargs) -> PendingFile:
+        """Open ``path`` for writing, it is replaced when the file is closed."""
+        return PendingFile(self, Path(path), mode, **kwargs)
+
+    def write(self, path: Union[str, Path], content: Union[str, bytes]) -> bool:
+        """Write ``content`` to ``path`` unless it already holds it.
+
+        Returns
+        -------
+            bool: Whether the file was written
+
+        """
+        path = Path(path)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        try:
+            if (
+                path.stat().st_size == len(data)
+                and _file_digest(path) == hashlib.sha256(data).digest()
+            ):
+                self.record(path, written=False)
+                return False
+        except FileNotFoundError:
+            pass
+        pending = self.open(path, "wb")
+        try:
+            pending.write(data)
+        except BaseException:
+            pending.discard()
+            raise
+        return pending.close(compare=False)
+
+    def log_summary(self) -> None:
+        """Log how many files were written and how many were unchanged."""
+        logger.info(
+            "Outputs: %d files written, %d unchanged",
+            self.written,
+            self.unchanged,
+        )
@@ -0,0 +1,151 @@
+"""Dry-run planning of the summarization stage."""
+# ruff: noqa: UP007
+
+import logging
+import math
+import os
+from typing import Optional
+
+import litellm
+
+from .checkpoint import CheckpointJournal
+from .utils import count_prompt_tokens, read_sitemap_pages, schedule_pages
+
+logger = logging.getLogger(__name__)
+
+# Assumptions used for projections, a one-line summary is short and a
+# request to a hosted model typically takes a couple of seconds.
+ASSUMED_COMPLETION_TOKENS = 60
+ASSUMED_SECONDS_PER_REQUEST = 2.5
+
+
+def plan_summaries(  # noqa: PLR0913
+    docs_dir: str,
+    sitemap_path: str,
+    model_name: str,
+    summarizer: str = "llm",
+    summary_concurrency: int = 1,
+    sitemap_root: Optional[str] = None,
+    journal: Optional[CheckpointJournal] = None,
+    max_llm_calls: int = 0,
+    max_tokens: int = 0,
+    time_budget: float = 0,
+) -> dict:
+    """Project the requests, tokens, cost and time of summarizing a site.
+
+    Nothing is sent over the network: pages are read from the sitemap (from
+    their HTML when they have not been converted yet), tokens are counted
+    with the bundled tokenizer and prices come from litellm's local table.
+    Pages whose summary is in the checkpoint ``journal`` of an interrupted
+    run would not be requested again and are not counted. With limits set,
+    pages are taken in the order a run summarizes them and those left once a
+    limit is reached are projected to use their heading.
+
+    Args:
+    ----
+        docs_dir (str): Path to the directory containing the documentation
+        sitemap_path (str): Path to the sitemap.xml file
+        model_name (str): Name of the model to use for summarization
+        summarizer (str): Summarizer that would be used
+        summary_concurrency (int): Number of concurrent model requests
+        sitemap_root (Optional[str]): Directory or archive containing the
+            sitemap when it is not ``docs_dir``
+        journal (Optional[CheckpointJournal]): Journal of the summaries made
+            by an interrupted run, left untouched
+        max_llm_calls (int): Maximum number of model requests, 0 is unlimited
+        max_tokens (int): Maximum number of tokens, 0 is unlimited
+        time_budget (float): Seconds the summarization may take, 0 is
+            unlimited
+
+    Returns:
+    -------
+        dict: The projected run
+
+    """
+    pages = read_sitemap_pages(
+        docs_dir,
+        sitemap_path,
+        html_fallback=True,
+        sitemap_root=sitemap_root,
+    )
+    uses_model = summarizer == "llm" and bool(os.getenv("MODEL_API_KEY"))
+    pending = [
+        pages[index]
+        for index in schedule_pages(pages)
+        if not (uses_model and journal and journal.has_summary(pages[index].content))
+    ]
+    concurrency = max(summary_concurrency, 1)
+    page_tokens = []
+    spent = 0
+    for page in pending if uses_model else []:
+        tokens = count_prompt_tokens(page.content, model_name)
+        started = len(page_tokens) // concurrency * ASSUMED_SECONDS_PER_REQUEST
+        # The checks of SummaryBudget.reserve, with the projected usage.
+        if (
+            (max_llm_calls and len(page_tokens) >= max_llm_calls)
+            or (max_tokens and spent + tokens > max_tokens)
+            or (time_budget and started >= time_budget)
+        ):
+            break
+        page_tokens.append((tokens, page.loc))
+        spent += tokens + ASSUMED_COMPLETION_TOKENS
+    requests = len(page_tokens)
+    prompt_tokens = sum(tokens for tokens, _ in page_tokens)
+    completion_tokens = requests * ASSUMED_COMPLETION_TOKENS
+    try:
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model_name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+        cost = prompt_cost + completion_cost
+    except Exception:  # noqa: BLE001
+        logger.warning("No local pricing for %s, cost is unknown", model_name)
+        cost = None
+    return {
+        "model": model_name,
+        "summarizer": summarizer if uses_model else f"{summarizer} (no model)",
+        "pages": len(pages),
+        "recovered": len(pages) - len(pending),
+        "requests": requests,
+        "over_budget": len(pending) - requests if uses_model else 0,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost": cost,
+        "concurrency": concurrency,
+        "seconds": math.ceil(requests / concurrency) * ASSUMED_SECONDS_PER_REQUEST,
+        "largest_pages": sorted(page_tokens, reverse=True)[:5],
+    }
+
+
+def format_plan(plan: dict) -> str:
+    """Format a plan from ``plan_summaries`` as a human readable report."""
+    cost = "unknown" if plan["cost"] is None else f"${plan['cost']:.4f}"
+    lines = [
+        f"Summarization plan for {plan['model']} ({plan['summarizer']})",
+        f"  pages:             {plan['pages']}",
+        f"  model requests:    {plan['requests']}",
+        *(
+            [f"  recovered:         {plan['recovered']} summaries from checkpoint"]
+            if plan.get("recovered")
+            else []
+        ),
+        *(
+            [f"  over budget:       {plan['over_budget']} pages use their heading"]
+            if plan.get("over_budget")
+            else []
+        ),
+        f"  prompt tokens:     {plan['prompt_tokens']}",
+        f"  completion tokens: ~{plan['completion_tokens']}",
+        f"  cost:              {cost}",
+        (
+            f"  wall-clock:        ~{plan['seconds']:.0f}s "
+            f"at concurrency {plan['concurrency']}"
+        ),
+    ]
+    if plan["largest_pages"]:
+        lines.append("  largest prompts:")
+        lines.extend(
+            f"    {tokens:>8} tokens {loc}" for tokens, loc in plan["largest_pages"]
+        )
+    return "\n".join(lines)
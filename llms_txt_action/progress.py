@@ -0,0 +1,127 @@
+"""Console logging and progress bars for long runs."""
+# ruff: noqa: UP007
+
+import logging
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+from rich.console import Console
+from rich.logging import RichHandler
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    ProgressColumn,
+    Task,
+    TextColumn,
+    TimeElapsedColumn,
+    TimeRemainingColumn,
+)
+from rich.text import Text
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+_PACKAGE = __name__.rpartition(".")[0]
+
+_console = Console(stderr=True)
+_settings = {"progress": False}
+# rich allows a single live display at a time: concurrent trackers, e.g. the
+# sites of a batch, each add a task to the one shared display.
+_shared = {"display": None, "users": 0}
+_shared_lock = threading.Lock()
+
+
+class _RateColumn(ProgressColumn):
+    """Items completed per second."""
+
+    def render(self, task: Task) -> Text:
+        """Render the speed of ``task``."""
+        speed = task.finished_speed or task.speed
+        return Text(f"{speed:.1f}/s" if speed else "?/s", style="progress.data.speed")
+
+
+def configure_logging(
+    level: str = "INFO",
+    log_file: str = "",
+    *,
+    progress: bool = False,
+) -> None:
+    """Configure console logging, an optional detailed log file and progress.
+
+    Per-page details are logged at DEBUG level, so they only reach the
+    console at ``level="DEBUG"`` but are always written to ``log_file``.
+
+    Args:
+    ----
+        level (str): Level of the messages shown on the console, one of
+            ``LOG_LEVELS``
+        log_file (str): File receiving every message of this package down to
+            DEBUG level, none by default
+        progress (bool): Show progress bars with rate and ETA for page
+            conversion and summarization
+
+    """
+    console_handler = (
+        RichHandler(console=_console, show_path=False)
+        if progress
+        else logging.StreamHandler()
+    )
+    console_handler.setLevel(level.upper())
+    handlers = [console_handler]
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+        handlers.append(file_handler)
+    logging.basicConfig(level=level.upper(), handlers=handlers, force=True)
+    # Only this package's details go to the file, not those of dependencies.
+    logging.getLogger(_PACKAGE).setLevel(logging.DEBUG if log_file else logging.NOTSET)
+    _settings["progress"] = progress
+
+
+@contextmanager
+def _shared_progress() -> Iterator[Progress]:
+    """Return the shared progress display, started for its first user."""
+    with _shared_lock:
+        if _shared["display"] is None:
+            _shared["display"] = Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                _RateColumn(),
+                TimeElapsedColumn(),
+                TimeRemainingColumn(),
+                console=_console,
+            )
+            _shared["display"].start()
+        _shared["users"] += 1
+        progress = _shared["display"]
+    try:
+        yield progress
+    finally:
+        with _shared_lock:
+            _shared["users"] -= 1
+            if not _shared["users"]:
+                progress.stop()
+                _shared["display"] = None
+
+
+def track(
+    items: Iterable,
+    description: str,
+    total: Optional[int] = None,
+) -> Iterator:
+    """Yield ``items``, advancing a progress bar when progress is enabled."""
+    if not _settings["progress"]:
+        yield from items
+        return
+    with _shared_progress() as progress:
+        task = progress.add_task(description, total=total)
+        try:
+            for item in items:
+                yield item
+                progress.advance(task)
+        finally:
+            progress.remove_task(task)
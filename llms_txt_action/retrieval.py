@@ -0,0 +1,180 @@
+"""Section-level retrieval index with hashed TF-IDF features."""
+# ruff: noqa: UP007
+
+import json
+import logging
+import math
+import re
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .outputs import OutputWriter
+from .sharding import split_sections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEATURES = 2**18
+_WORD_PATTERN = r"[a-z0-9][a-z0-9_]+"
+_WORD_RE = re.compile(_WORD_PATTERN)
+_ARRAYS = ("indptr", "indices", "data", "idf")
+
+
+def _feature(token: str, features: int) -> int:
+    """Hash a token to its feature column, clients must hash queries alike."""
+    return zlib.crc32(token.encode("utf-8")) % features
+
+
+def _tokens(text: str) -> list:
+    return _WORD_RE.findall(text.lower())
+
+
+def build_retrieval_index(
+    markdown_files: list,
+    index_dir: str,
+    *,
+    urls: Optional[dict] = None,
+    features: int = DEFAULT_FEATURES,
+    writer: Optional[OutputWriter] = None,
+) -> dict:
+    """Write a retrieval index of every section of the given pages.
+
+    Pages are split at their headings and each section becomes a chunk. The
+    chunk by feature matrix of L2-normalized TF-IDF weights, with tokens
+    hashed into ``features`` columns, is stored in compressed sparse column
+    form as ``.npy`` arrays that clients load with ``mmap_mode="r"``: a
+    query only reads the postings of its own terms. The index directory
+    holds:
+
+    - ``indptr.npy`` (int64): start of the postings of each feature
+    - ``indices.npy`` (int32): chunk numbers of the postings
+    - ``data.npy`` (float32): weights of the postings
+    - ``idf.npy`` (float32): inverse document frequency of each feature
+    - ``chunks.jsonl``: url, path, heading, level and text of each chunk
+    - ``meta.json``: number of chunks and features, token pattern and hash
+
+    Args:
+    ----
+        markdown_files (list): List of paths to markdown files
+        index_dir (str): Directory to write the index to
+        urls (Optional[dict]): Page URL by markdown file path
+        features (int): Number of hashed feature columns
+        writer (Optional[OutputWriter]): Writer counting written and unchanged
+            outputs, files are only replaced when they changed
+
+    Returns:
+    -------
+        dict: Number of chunks, features and non-zero weights
+
+    """
+    start = time.perf_counter()
+    index_dir = Path(index_dir)
+    urls = urls or {}
+    writer = writer or OutputWriter()
+    feature_of, rows, columns = {}, [], []
+    chunk_count = 0
+    with writer.open(index_dir / "chunks.jsonl", "w", encoding="utf-8") as chunks:
+        for markdown_file in map(Path, markdown_files):
+            try:
+                path = markdown_file.relative_to(index_dir.parent).as_posix()
+            except ValueError:
+                path = str(markdown_file)
+            content = markdown_file.read_text(encoding="utf-8")
+            for heading, level, text in split_sections(content):
+                for token in _tokens(text):
+                    if token not in feature_of:
+                        feature_of[token] = _feature(token, features)
+                    rows.append(chunk_count)
+                    columns.append(feature_of[token])
+                chunk = {
+                    "url": urls.get(markdown_file, ""),
+                    "path": path,
+                    "heading": heading,
+                    "level": level,
+                    "text": text,
+                }
+                chunks.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+                chunk_count += 1
+
+    # Term count per (feature, chunk) cell, sorted by feature then chunk,
+    # which is the order of a compressed sparse column matrix.
+    cells, counts = np.unique(
+        np.asarray(columns, dtype=np.int64) * max(chunk_count, 1)
+        + np.asarray(rows, dtype=np.int64),
+        return_counts=True,
+    )
+    columns, rows = np.divmod(cells, max(chunk_count, 1))
+    document_frequency = np.bincount(columns, minlength=features)
+    idf = np.log((1 + chunk_count) / (1 + document_frequency)) + 1
+    weights = (1 + np.log(counts)) * idf[columns]
+    norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=chunk_count))
+    weights /= norms[rows]
+    arrays = {
+        "indptr": np.concatenate(([0], np.cumsum(document_frequency))),
+        "indices": rows.astype(np.int32),
+        "data": weights.astype(np.float32),
+        "idf": idf.astype(np.float32),
+    }
+    for name in _ARRAYS:
+        with writer.open(index_dir / f"{name}.npy", "wb") as file:
+            np.save(file, arrays[name])
+    stats = {"chunks": chunk_count, "features": features, "nonzeros": len(cells)}
+    meta = {**stats, "token_pattern": _WORD_PATTERN, "hash": "crc32"}
+    writer.write(index_dir / "meta.json", json.dumps(meta, indent=2) + "\n")
+    logger.info(
+        "Indexed %d chunks, %d non-zero weights in %.2fs at %s",
+        chunk_count,
+        len(cells),
+        time.perf_counter() - start,
+        index_dir,
+    )
+    return stats
+
+
+def search(index_dir: str, query: str, top_k: int = 5) -> list:
+    """Return the chunks of a retrieval index most similar to ``query``.
+
+    The index is memory mapped, only the postings of the query terms and the
+    matching lines of ``chunks.jsonl`` are read.
+
+    Args:
+    ----
+        index_dir (str): Directory written by ``build_retrieval_index``
+        query (str): Text to search for
+        top_k (int): Maximum number of chunks to return
+
+    Returns:
+    -------
+        list: ``(score, chunk)`` pairs, best first, where ``chunk`` is the
+        record of the chunk in ``chunks.jsonl``
+
+    """
+    index_dir = Path(index_dir)
+    meta = json.loads((index_dir / "meta.json").read_text(encoding="utf-8"))
+    arrays = {
+        name: np.load(index_dir / f"{name}.npy", mmap_mode="r") for name in _ARRAYS
+    }
+    columns, counts = np.unique(
+        [_feature(token, meta["features"]) for token in _tokens(query)],
+        return_counts=True,
+    )
+    if not len(columns):
+        return []
+    weights = (1 + np.log(counts)) * arrays["idf"][columns]
+    scores = np.zeros(meta["chunks"], dtype=np.float32)
+    for column, weight in zip(columns, weights):  # noqa: B905
+        start, end = arrays["indptr"][column], arrays["indptr"][column + 1]
+        scores[arrays["indices"][start:end]] += weight * arrays["data"][start:end]
+    scores /= math.sqrt(float(np.sum(weights**2)))
+    count = min(top_k, int(np.count_nonzero(scores)))
+    best = np.argsort(-scores, kind="stable")[:count].tolist()
+    wanted = set(best)
+    chunks = {}
+    with (index_dir / "chunks.jsonl").open(encoding="utf-8") as file:
+        for number, line in enumerate(file):
+            if number in wanted:
+                chunks[number] = json.loads(line)
+    return [(float(scores[number]), chunks[number]) for number in best]
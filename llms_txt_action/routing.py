@@ -0,0 +1,114 @@
+"""Route summary requests between models and keep per-model statistics."""
+# ruff: noqa: UP007
+
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_models(models: str) -> list:
+    """Parse a comma separated list of model names."""
+    return [name.strip() for name in models.split(",") if name.strip()]
+
+
+class ModelRouter:
+    """Pick the models to try for each page, cheapest first.
+
+    Pages are summarized with ``model_name`` unless they are long or
+    important enough to escalate to ``escalation_model``. When a request
+    fails or times out, the next model of the chain is tried: the default
+    model, the escalation model, then every ``fallback_models`` in order.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        model_name: str,
+        escalation_model: str = "",
+        escalation_tokens: int = 0,
+        escalation_priority: float = 0.0,
+        fallback_models: Optional[list] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Create a router, escalation is disabled without a threshold.
+
+        Args:
+        ----
+            model_name (str): Default, fast and cheap, model
+            escalation_model (str): Stronger model for long or important pages
+            escalation_tokens (int): Prompt tokens from which a page is
+                escalated (0 disables)
+            escalation_priority (float): Sitemap priority from which a page is
+                escalated (0 disables)
+            fallback_models (Optional[list]): Models tried in order when the
+                others failed
+            timeout (Optional[float]): Seconds allowed per request before
+                falling back to the next model
+
+        """
+        self.model_name = model_name
+        self.escalation_model = escalation_model
+        self.escalation_tokens = escalation_tokens
+        self.escalation_priority = escalation_priority
+        self.fallback_models = fallback_models or []
+        self.timeout = timeout or None
+        self.stats = {}
+        self.exhausted = []
+        self._lock = threading.Lock()
+
+    @property
+    def counts_tokens(self) -> bool:
+        """Whether routing depends on the prompt tokens of a page."""
+        return bool(self.escalation_model and self.escalation_tokens)
+
+    def route(self, prompt_tokens: int = 0, priority: Optional[float] = None) -> list:
+        """Return the models to try for a page, in order and without repeats."""
+        escalate = self.escalation_model and (
+            (self.escalation_tokens and prompt_tokens >= self.escalation_tokens)
+            or (
+                self.escalation_priority
+                and priority is not None
+                and priority >= self.escalation_priority
+            )
+        )
+        chain = [self.model_name, self.escalation_model, *self.fallback_models]
+        if escalate:
+            chain.insert(0, self.escalation_model)
+        return list(dict.fromkeys(model for model in chain if model))
+
+    def record(
+        self,
+        model_name: str,
+        seconds: float,
+        tokens: int = 0,
+        *,
+        failed: bool = False,
+    ) -> None:
+        """Record the latency and tokens of a request, or its failure."""
+        with self._lock:
+            stats = self.stats.setdefault(
+                model_name,
+                {"calls": 0, "errors": 0, "tokens": 0, "seconds": 0.0},
+            )
+            stats["calls"] += 1
+            stats["errors"] += int(failed)
+            stats["tokens"] += tokens
+            stats["seconds"] += seconds
+
+    def exhaust(self, index: int) -> None:
+        """Record that every model failed to summarize page ``index``."""
+        with self._lock:
+            self.exhausted.append(index)
+
+    def log_stats(self) -> None:
+        """Log the requests, errors, tokens and mean latency of every model."""
+        for model_name, stats in self.stats.items():
+            logger.info(
+                "Model %s: %d calls, %d errors, %d tokens, %.2fs mean latency",
+                model_name,
+                stats["calls"],
+                stats["errors"],
+                stats["tokens"],
+                stats["seconds"] / stats["calls"],
+            )
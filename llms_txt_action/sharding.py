@@ -0,0 +1,175 @@
+"""Size-bounded llms-full shards with a byte-offset index for random access."""
+# ruff: noqa: UP007
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+from .outputs import OutputWriter
+from .utils import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_FENCE = "```"
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_SEPARATOR = b"\n\n"
+
+
+def split_sections(markdown: str) -> list:
+    """Split markdown at its headings, ignoring ``#`` lines inside code blocks.
+
+    Args:
+    ----
+        markdown (str): Markdown content of a page
+
+    Returns:
+    -------
+        list: ``(heading, level, text)`` per section in document order, text
+        before the first heading has an empty heading and level 0
+
+    """
+    sections, lines, heading, level, in_code = [], [], "", 0, False
+    for line in markdown.splitlines(keepends=True):
+        if line.lstrip().startswith(_FENCE):
+            in_code = not in_code
+        match = None if in_code else _HEADING_RE.match(line)
+        if match:
+            if lines:
+                sections.append((heading, level, "".join(lines)))
+            heading = match.group(2).replace("¶", "").strip()
+            level = len(match.group(1))
+            lines = []
+        lines.append(line)
+    if lines:
+        sections.append((heading, level, "".join(lines)))
+    return sections
+
+
+def _shard_name(output_file: Path, number: int) -> Path:
+    return output_file.with_name(f"{output_file.stem}-{number:04d}{output_file.suffix}")
+
+
+class _ShardSequence:
+    """Append data to numbered shards, starting a new one when one is full."""
+
+    def __init__(self, output_file: Path, max_shard_bytes: int, writer: OutputWriter):
+        self.output_file = output_file
+        self.max_shard_bytes = max_shard_bytes
+        self.writer = writer
+        self.paths = []
+        self._shard = None
+        self._offset = 0
+
+    def write(self, data: bytes) -> tuple:
+        """Append ``data`` and return the name of its shard and its offset."""
+        if self._shard is None or (
+            self._offset and self._offset + len(data) > self.max_shard_bytes
+        ):
+            if self._shard is not None:
+                self._shard.close()
+            self.paths.append(_shard_name(self.output_file, len(self.paths)))
+            self._shard, self._offset = self.writer.open(self.paths[-1], "wb"), 0
+        self._shard.write(data)
+        offset = self._offset
+        self._offset += len(data)
+        return self.paths[-1].name, offset
+
+    def close(self) -> None:
+        """Put the last shard in place."""
+        if self._shard is not None:
+            self._shard.close()
+            self._shard = None
+
+    def remove_stale(self) -> None:
+        """Remove the shards left over from a previous, larger output."""
+        number = len(self.paths)
+        while _shard_name(self.output_file, number).exists():
+            _shard_name(self.output_file, number).unlink()
+            number += 1
+
+    def discard(self) -> None:
+        """Drop the shard being written, earlier ones are already in place."""
+        if self._shard is not None:
+            self._shard.discard()
+            self._shard = None
+
+
+def write_shards(  # noqa: PLR0913
+    markdown_files: list,
+    output_file: str,
+    max_shard_bytes: int,
+    *,
+    urls: Optional[dict] = None,
+    model_name: str = "gpt-4o",
+    writer: Optional[OutputWriter] = None,
+) -> tuple:
+    """Write pages into size-bounded shards and index every section.
+
+    Shards hold the same content as ``concatenate_markdown_files`` would, cut
+    at section boundaries, so a shard exceeds ``max_shard_bytes`` only when a
+    single section does. Each line of the JSONL index locates one section::
+
+        {"url": ..., "path": ..., "heading": ..., "level": ...,
+         "shard": ..., "offset": ..., "length": ..., "tokens": ...}
+
+    where ``offset`` and ``length`` are in bytes, for mmap or HTTP range
+    requests.
+
+    Args:
+    ----
+        markdown_files (list): List of paths to markdown files
+        output_file (str): Path of the unsharded file, e.g. ``llms-full.txt``;
+            shards are named ``llms-full-0000.txt`` and the index
+            ``llms-full.index.jsonl``
+        max_shard_bytes (int): Size in bytes after which a new shard starts
+        urls (Optional[dict]): Page URL by markdown file path
+        model_name (str): Model whose tokenizer counts section tokens
+        writer (Optional[OutputWriter]): Writer counting written and unchanged
+            outputs, shards and the index are only replaced when they changed
+
+    Returns:
+    -------
+        tuple: The list of shard paths and the path of the index
+
+    """
+    output_file = Path(output_file)
+    index_file = output_file.with_name(f"{output_file.stem}.index.jsonl")
+    urls = urls or {}
+    writer = writer or OutputWriter()
+    shards = _ShardSequence(output_file, max_shard_bytes, writer)
+    try:
+        with writer.open(index_file, "w", encoding="utf-8") as index:
+            for markdown_file in map(Path, markdown_files):
+                try:
+                    path = markdown_file.relative_to(output_file.parent).as_posix()
+                except ValueError:
+                    path = str(markdown_file)
+                content = markdown_file.read_text(encoding="utf-8")
+                sections = split_sections(content) or [("", 0, "")]
+                for section_number, (heading, level, text) in enumerate(sections):
+                    data = text.encode("utf-8")
+                    if section_number == len(sections) - 1:
+                        # Pages end with the same separator as llms-full.txt.
+                        data += _SEPARATOR
+                    shard_name, offset = shards.write(data)
+                    entry = {
+                        "url": urls.get(markdown_file, ""),
+                        "path": path,
+                        "heading": heading,
+                        "level": level,
+                        "shard": shard_name,
+                        "offset": offset,
+                        "length": len(text.encode("utf-8")),
+                        "tokens": count_tokens(text, model_name),
+                    }
+                    index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            # The last shard is in place before the index that points at it.
+            shards.close()
+    except BaseException:
+        shards.discard()
+        raise
+    shards.remove_stale()
+    logger.info("Wrote %d shards indexed by %s", len(shards.paths), index_file)
+    return shards.paths, index_file
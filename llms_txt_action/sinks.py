@@ -0,0 +1,245 @@
+"""Destinations that outputs are published to once they are written."""
+# ruff: noqa: UP007
+
+import hashlib
+import logging
+import mimetypes
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+except ImportError:  # pragma: no cover - depends on the installed extras
+    boto3 = None
+
+logger = logging.getLogger(__name__)
+
+SINK_SCHEMES = ("s3",)
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+PART_SIZE = 8 * 1024 * 1024
+_CHUNK_SIZE = 1 << 20
+_CONTENT_TYPES = {
+    ".md": "text/markdown; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+    ".jsonl": "application/jsonl; charset=utf-8",
+    # Precompressed siblings are served as is, not decoded by the client.
+    ".gz": "application/gzip",
+    ".br": "application/x-brotli",
+}
+
+
+class OutputSink:
+    """Publish outputs once they are in place locally.
+
+    The base sink keeps them on the local filesystem only. ``put`` is called
+    from the thread that wrote the file and must not block it for long.
+    """
+
+    def put(self, path: Path) -> None:
+        """Publish the output at ``path``."""
+
+    def close(self) -> None:
+        """Wait until every output is published."""
+
+    def __enter__(self) -> "OutputSink":
+        """Return the sink."""
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *exc_info: object) -> None:
+        """Close the sink, without hiding an exception raised by the block."""
+        try:
+            self.close()
+        except Exception:
+            if exc_type is None:
+                raise
+            logger.exception("Failed to publish outputs")
+
+
+def _parse_s3_url(url: str) -> tuple:
+    """Split ``s3://bucket/prefix`` into the bucket and a key prefix."""
+    parsed = urlparse(url)
+    prefix = parsed.path.strip("/")
+    return parsed.netloc, f"{prefix}/" if prefix else ""
+
+
+def _etag(path: Path, multipart_threshold: int, part_size: int) -> str:
+    """Return the ETag S3 gives ``path`` when uploaded with these settings.
+
+    The MD5 of the content for a single upload, the MD5 of the part MD5s
+    followed by the number of parts for a multipart upload.
+    """
+    whole = hashlib.md5(usedforsecurity=False)
+    parts = []
+    with path.open("rb") as file:
+        for part in iter(lambda: file.read(part_size), b""):
+            whole.update(part)
+            parts.append(hashlib.md5(part, usedforsecurity=False).digest())
+    if path.stat().st_size < multipart_threshold:
+        return whole.hexdigest()
+    combined = hashlib.md5(b"".join(parts), usedforsecurity=False).hexdigest()
+    return f"{combined}-{len(parts)}"
+
+
+def _content_type(path: Path) -> str:
+    return (
+        _CONTENT_TYPES.get(path.suffix)
+        or mimetypes.guess_type(path.name)[0]
+        or "application/octet-stream"
+    )
+
+
+class S3Sink(OutputSink):
+    """Upload outputs to an S3-compatible bucket as they are written.
+
+    Uploads run concurrently on a pool of threads sharing one client, whose
+    connection pool holds a keep-alive connection per thread. Files from
+    ``multipart_threshold`` bytes are uploaded in parts, sent concurrently.
+    The objects under the prefix are listed once, and outputs whose object
+    already has the same ETag are not uploaded again.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        url: str,
+        root: str,
+        *,
+        endpoint_url: str = "",
+        concurrency: int = 16,
+        multipart_threshold: int = MULTIPART_THRESHOLD,
+        part_size: int = PART_SIZE,
+        client: Optional[object] = None,
+    ):
+        """Upload the outputs under ``root`` to ``url``.
+
+        Args:
+        ----
+            url (str): Destination, ``s3://bucket/prefix``
+            root (str): Local directory of the outputs, their keys are their
+                paths relative to it under the prefix
+            endpoint_url (str): Endpoint of an S3-compatible service such as
+                MinIO, AWS by default
+            concurrency (int): Number of files, and of parts of a file,
+                uploaded concurrently
+            multipart_threshold (int): Size in bytes from which files are
+                uploaded in parts
+            part_size (int): Size in bytes of the parts
+            client (Optional[object]): S3 client to use instead of creating
+                one, credentials are read from the environment otherwise
+
+        Raises:
+        ------
+            RuntimeError: If boto3 is not installed
+
+        """
+        if boto3 is None:
+            msg = "Install the s3 extra to upload outputs to object storage."
+            raise RuntimeError(msg)
+        self.url = url
+        self.bucket, self.prefix = _parse_s3_url(url)
+        self.root = Path(root)
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.client = client or boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            config=Config(
+                max_pool_connections=concurrency,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+            ),
+        )
+        self._transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=part_size,
+            max_concurrency=concurrency,
+        )
+        self.stats = {"uploaded": 0, "unchanged": 0, "bytes": 0}
+        self._remote = self._list_objects()
+        self._errors = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(concurrency, 1))
+        self._start = time.perf_counter()
+
+    def _list_objects(self) -> dict:
+        """Return the ETag of every object under the prefix."""
+        etags = {}
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                etags[item["Key"]] = item["ETag"].strip('"')
+        return etags
+
+    def key(self, path: Path) -> str:
+        """Return the object key of the output at ``path``."""
+        return self.prefix + Path(path).relative_to(self.root).as_posix()
+
+    def put(self, path: Path) -> None:
+        """Upload ``path`` in the background."""
+        self._executor.submit(self._upload, Path(path))
+
+    def _upload(self, path: Path) -> None:
+        key = self.key(path)
+        try:
+            if self._remote.get(key) == _etag(
+                path,
+                self.multipart_threshold,
+                self.part_size,
+            ):
+                with self._lock:
+                    self.stats["unchanged"] += 1
+                return
+            self.client.upload_file(
+                str(path),
+                self.bucket,
+                key,
+                ExtraArgs={"ContentType": _content_type(path)},
+                Config=self._transfer_config,
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Failed to upload %s to %s: %s", path, key, exc)  # noqa: TRY400
+            with self._lock:
+                self._errors.append(exc)
+            return
+        with self._lock:
+            self.stats["uploaded"] += 1
+            self.stats["bytes"] += path.stat().st_size
+        logger.debug("Uploaded %s to %s", path, key)
+
+    def close(self) -> None:
+        """Wait for every upload and log the totals.
+
+        Raises ``RuntimeError`` if an output failed to upload.
+        """
+        self._executor.shutdown(wait=True)
+        logger.info(
+            "Uploaded %d files (%d bytes), %d unchanged, to %s in %.2fs",
+            self.stats["uploaded"],
+            self.stats["bytes"],
+            self.stats["unchanged"],
+            self.url,
+            time.perf_counter() - self._start,
+        )
+        if self._errors:
+            msg = f"Failed to upload {len(self._errors)} outputs to {self.url}"
+            raise RuntimeError(msg) from self._errors[0]
+
+
+def open_sink(url: str, root: str, **options) -> OutputSink:
+    """Return the sink publishing the outputs under ``root`` to ``url``.
+
+    An empty ``url`` keeps outputs local, ``s3://bucket/prefix`` uploads them
+    with :class:`S3Sink`, which receives ``options``. Raises ``ValueError`` if
+    the scheme of ``url`` is not one of ``SINK_SCHEMES``.
+    """
+    if not url:
+        return OutputSink()
+    scheme = urlparse(url).scheme
+    if scheme == "s3":
+        return S3Sink(url, root, **options)
+    msg = f"Unknown output URL {url}, expected a scheme among {SINK_SCHEMES}"
+    raise ValueError(msg)
@@ -0,0 +1,123 @@
+"""Split oversized HTML pages into self-contained sections."""
+
+from html.parser import HTMLParser
+
+_SPLIT_TAGS = frozenset({"h1", "h2"})
+_VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    },
+)
+# Never cut inside these, the pieces would not convert to the same markdown.
+_ATOMIC_TAGS = frozenset({"table", "ul", "ol", "dl", "pre", "blockquote"})
+
+
+class _SectionParser(HTMLParser):
+    """Record where top-level headings start and which tags are open there."""
+
+    def __init__(self, html: str):
+        """Create a parser that maps line/column positions to offsets."""
+        super().__init__(convert_charrefs=False)
+        self.cuts = []
+        self._stack = []
+        # Elements opened since the last content, so a heading's wrappers
+        # (e.g. ``<div class="section">``) move into the heading's piece.
+        self._wrappers = []
+        self._line_offsets = [0]
+        for line in html.split("\n"):
+            self._line_offsets.append(self._line_offsets[-1] + len(line) + 1)
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self._line_offsets[line - 1] + column
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:  # noqa: ARG002
+        """Track open tags and record cut points at top-level headings."""
+        if tag in _SPLIT_TAGS and not any(
+            open_tag in _ATOMIC_TAGS for open_tag, _ in self._stack
+        ):
+            offset, depth = (
+                self._wrappers[0]
+                if self._wrappers
+                else (self._offset(), len(self._stack))
+            )
+            self.cuts.append((offset, self._stack[:depth]))
+        if tag in _VOID_TAGS:
+            self._wrappers = []
+        else:
+            self._wrappers.append((self._offset(), len(self._stack)))
+            self._stack.append((tag, self.get_starttag_text()))
+
+    def handle_endtag(self, tag: str) -> None:
+        """Close ``tag`` and anything left open inside it."""
+        self._wrappers = []
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                del self._stack[index:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        """Forget pending wrappers once real content appears."""
+        if data.strip():
+            self._wrappers = []
+
+
+def _wrap(html: str, start: tuple, end: tuple) -> str:
+    """Return ``html[start:end]`` with the open tags re-opened and closed."""
+    start_offset, open_at_start = start
+    end_offset, open_at_end = end
+    opening = "".join(text for _, text in open_at_start)
+    closing = "".join(f"</{tag}>" for tag, _ in reversed(open_at_end))
+    return opening + html[start_offset:end_offset] + closing
+
+
+def split_html(html: str, max_section_size: int) -> list:
+    """Split an HTML page at ``h1``/``h2`` boundaries.
+
+    Adjacent sections are merged until they reach ``max_section_size``
+    bytes once encoded as UTF-8, so a page is split into as few pieces as
+    needed. Each piece
+    re-opens the elements that enclose it, so it converts like the same part
+    of the whole page. Content before the first heading stays with the first
+    section.
+
+    Args:
+    ----
+        html (str): The HTML page
+        max_section_size (int): Target size of each piece in bytes
+
+    Returns:
+    -------
+        list: The HTML pieces in document order
+
+    """
+    parser = _SectionParser(html)
+    parser.feed(html)
+    parser.close()
+
+    sections = []
+    start = previous = (0, [])
+    size = 0
+    # The first cut would separate the preamble from the first heading.
+    for cut in parser.cuts[1:]:
+        # Offsets count characters, the threshold counts encoded bytes.
+        size += len(html[previous[0] : cut[0]].encode("utf-8"))
+        previous = cut
+        if size >= max_section_size:
+            sections.append(_wrap(html, start, cut))
+            start = cut
+            size = 0
+    sections.append(_wrap(html, start, (len(html), [])))
+    return sections
@@ -0,0 +1,172 @@
+"""Local summarizers that describe pages without calling a model."""
+
+import re
+
+import numpy as np
+
+_MAX_SUMMARY_LENGTH = 200
+_MIN_SENTENCE_WORDS = 4
+_FENCE = "```"
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9`\"'(\[])")
+_WORD_RE = re.compile(r"[a-z][a-z0-9_]+")
+_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_LIST_MARKER_RE = re.compile(r"^(?:[-*+]|\d+[.)])\s+")
+_SKIPPED_LINE_PREFIXES = ("#", "|", "<!--", "<", ">")
+_STOPWORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "can",
+        "for",
+        "from",
+        "has",
+        "have",
+        "how",
+        "if",
+        "in",
+        "into",
+        "is",
+        "it",
+        "its",
+        "of",
+        "on",
+        "or",
+        "that",
+        "the",
+        "their",
+        "then",
+        "there",
+        "these",
+        "this",
+        "to",
+        "was",
+        "we",
+        "were",
+        "when",
+        "which",
+        "will",
+        "with",
+        "you",
+        "your",
+    },
+)
+
+
+def _sentences(markdown: str) -> list:
+    """Split markdown prose into sentences, skipping headings, code and tables."""
+    paragraphs, lines, in_code = [], [], False
+    for raw_line in [*markdown.splitlines(), ""]:
+        line = raw_line.strip()
+        if line.startswith(_FENCE):
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        if not line or line.startswith(_SKIPPED_LINE_PREFIXES):
+            if lines:
+                paragraphs.append(" ".join(lines))
+                lines = []
+            continue
+        line = _LINK_RE.sub(r"\1", _LIST_MARKER_RE.sub("", line))
+        lines.append(line.replace("¶", "").replace("**", "").replace("`", ""))
+    return [
+        sentence
+        for paragraph in paragraphs
+        for sentence in _SENTENCE_RE.split(paragraph)
+        if len(sentence.split()) >= _MIN_SENTENCE_WORDS
+    ]
+
+
+def _shorten(sentence: str) -> str:
+    """Cut a sentence down to a one-line description."""
+    if len(sentence) <= _MAX_SUMMARY_LENGTH:
+        return sentence
+    return sentence[:_MAX_SUMMARY_LENGTH].rsplit(" ", 1)[0] + "..."
+
+
+def extractive_summaries(contents: list) -> list:
+    """Pick the most representative sentence of every page.
+
+    Sentences of all pages are scored in one batch: each sentence is a TF-IDF
+    vector (IDF computed over pages), and its score is the cosine similarity
+    with its page's centroid, with a slight preference for early sentences.
+
+    Args:
+    ----
+        contents (list): Markdown content of each page
+
+    Returns:
+    -------
+        list: One summary per page, empty when a page has no prose
+
+    """
+    sentences, sentence_pages, positions, rows, terms = [], [], [], [], []
+    vocabulary = {}
+    for page, content in enumerate(contents):
+        for position, sentence in enumerate(_sentences(content)):
+            row = len(sentences)
+            sentences.append(sentence)
+            sentence_pages.append(page)
+            positions.append(position)
+            for word in _WORD_RE.findall(sentence.lower()):
+                if word not in _STOPWORDS:
+                    rows.append(row)
+                    terms.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    summaries = [""] * len(contents)
+    if not rows:
+        return summaries
+
+    vocabulary_size = len(vocabulary)
+    sentence_pages = np.asarray(sentence_pages)
+    rows = np.asarray(rows)
+    terms = np.asarray(terms)
+
+    # Term frequency per (sentence, term) cell, and the (page, term) cell of
+    # each, which gives document frequencies and page centroids.
+    cells, counts = np.unique(rows * vocabulary_size + terms, return_counts=True)
+    rows, terms = np.divmod(cells, vocabulary_size)
+    page_cells, page_cell_index = np.unique(
+        sentence_pages[rows] * vocabulary_size + terms,
+        return_inverse=True,
+    )
+    document_frequency = np.bincount(
+        page_cells % vocabulary_size,
+        minlength=vocabulary_size,
+    )
+    idf = np.log((1 + len(contents)) / (1 + document_frequency)) + 1
+    weights = (1 + np.log(counts)) * idf[terms]
+    centroid = np.bincount(page_cell_index, weights=weights)
+    centroid_norm = np.sqrt(
+        np.bincount(
+            page_cells // vocabulary_size,
+            weights=centroid**2,
+            minlength=len(contents),
+        ),
+    )
+
+    sentence_count = len(sentences)
+    dot = np.bincount(
+        rows,
+        weights=weights * centroid[page_cell_index],
+        minlength=sentence_count,
+    )
+    sentence_norm = np.sqrt(
+        np.bincount(rows, weights=weights**2, minlength=sentence_count),
+    )
+    denominator = sentence_norm * centroid_norm[sentence_pages]
+    scores = np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0)
+    scores *= 1 + 0.25 / (1 + np.asarray(positions))
+
+    # Best sentence per page: sort by page, then by descending score.
+    order = np.lexsort((-scores, sentence_pages))
+    pages, first = np.unique(sentence_pages[order], return_index=True)
+    for page, index in np.column_stack((pages, order[first])).tolist():
+        summaries[page] = _shorten(sentences[index])
+    return summaries
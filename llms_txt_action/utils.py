@@ -1,53 +1,451 @@
 """Utility functions for the llms-txt-action action."""
+# ruff: noqa: UP007
 
 # %%
+import heapq
 import logging
 import os
 import re
-from pathlib import Path
+import tempfile
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from functools import cache, partial
+from html.parser import HTMLParser
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import NamedTuple, Optional, Union
 
+import litellm
 from defusedxml import ElementTree as ET  # noqa: N817
-from docling.datamodel.base_models import ConversionStatus
+from docling.datamodel.base_models import ConversionStatus, DocumentStream, InputFormat
 from docling.document_converter import DocumentConverter
 from litellm import completion
 
+from .archives import is_archive, iter_archive_members, read_archive_member
+from .budget import SummaryBudget
+from .checkpoint import CheckpointJournal, digest
+from .minify import minify_markdown
+from .outputs import OutputWriter
+from .progress import track
+from .routing import ModelRouter
+from .splitting import split_html
+from .summarizers import extractive_summaries
+from .workers import WorkerPool
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tokens are counted locally for planning, sharding and exports: never
+# download a Hugging Face tokenizer (honored from litellm 1.60), tiktoken is
+# bundled.
+litellm.disable_hf_tokenizer_download = True
+
+SUMMARIZERS = ("llm", "extractive")
+_CHARS_PER_TOKEN = 4
+# Sitemap priority of pages that do not set one, per sitemaps.org.
+_DEFAULT_PRIORITY = 0.5
+# Failures of a summary request worth trying the next model for; litellm
+# maps provider, timeout and transport errors to its own exception types.
+_REQUEST_ERRORS = (
+    *litellm.exceptions.LITELLM_EXCEPTION_TYPES,
+    TimeoutError,
+    ConnectionError,
+)
+
+
+class SitemapPage(NamedTuple):
+    """A page listed in the sitemap together with its markdown content."""
+
+    loc: str
+    content: str
+    priority: float = _DEFAULT_PRIORITY
+    lastmod: str = ""
 
-def html_to_markdown(input_file: Path) -> str:
+
+def html_to_markdown(
+    input_file: Union[Path, DocumentStream],
+    converter: Optional[DocumentConverter] = None,
+) -> str:
     """Converts HTML content to Markdown.
 
     Removes content before the first heading efficiently.
 
     Args:
     ----
-        input_file (Path): The path to the HTML file to convert.
+        input_file (Union[Path, DocumentStream]): The path to the HTML file to
+            convert, or its content read from an archive.
+        converter (Optional[DocumentConverter]): An initialized converter to
+            reuse, a new one is created by default.
 
     Returns:
     -------
         str: The Markdown content of the input file.
 
     """  # noqa: D401
-    doc_converter = DocumentConverter()
+    doc_converter = converter or DocumentConverter()
     conversion_result = doc_converter.convert(input_file)
     if conversion_result.status == ConversionStatus.SUCCESS:
         markdown_content = conversion_result.document.export_to_markdown()
-        # Fast string search for first heading using find()
-        index = markdown_content.find("\n#")
-        return markdown_content[index + 1 :] if index >= 0 else markdown_content
+        return _strip_preamble(markdown_content)
     msg = f"Failed to convert {input_file}: {conversion_result.errors}"
     raise RuntimeError(msg)
 
 
-def html_folder_to_markdown(input_path: str) -> list:
+@cache
+def _worker_converter() -> DocumentConverter:
+    """Return the converter of this worker process, created on first use."""
+    return DocumentConverter()
+
+
+def init_worker() -> None:
+    """Load the converter of this worker process before its first page."""
+    _worker_converter().initialize_pipeline(InputFormat.HTML)
+
+
+def worker_html_to_markdown(input_file: Union[Path, DocumentStream]) -> str:
+    """Convert a page in a worker process, reusing its converter across pages."""
+    return html_to_markdown(input_file, _worker_converter())
+
+
+def _strip_preamble(markdown_content: str) -> str:
+    """Drop everything before the first heading of the markdown content."""
+    if markdown_content.startswith("#"):
+        return markdown_content
+    # Fast string search for first heading using find()
+    index = markdown_content.find("\n#")
+    return markdown_content[index + 1 :] if index >= 0 else markdown_content
+
+
+class _TextMarkdownParser(HTMLParser):
+    """Collect headings, list items and text blocks from HTML."""
+
+    _SKIP_TAGS = frozenset({"head", "script", "style", "nav", "noscript"})
+    _HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+    _BLOCK_TAGS = frozenset(
+        {"p", "div", "section", "article", "li", "tr", "pre", "blockquote", "br"},
+    )
+
+    def __init__(self):
+        """Create an empty parser."""
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self._buffer = []
+        self._prefix = ""
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:  # noqa: ARG002
+        """Start a new block on headings and block-level tags."""
+        if tag in self._SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self._HEADING_TAGS:
+            self._flush()
+            self._prefix = "#" * int(tag[1]) + " "
+        elif tag in self._BLOCK_TAGS:
+            self._flush()
+            if tag == "li":
+                self._prefix = "- "
+
+    def handle_endtag(self, tag: str) -> None:
+        """Finish the current block."""
+        if tag in self._SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in self._HEADING_TAGS or tag in self._BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data: str) -> None:
+        """Collect text outside of skipped tags."""
+        if not self._skip_depth:
+            self._buffer.append(data)
+
+    def _flush(self) -> None:
+        text = " ".join("".join(self._buffer).split())
+        if text:
+            self.blocks.append(self._prefix + text)
+        self._buffer = []
+        self._prefix = ""
+
+    def close(self) -> None:
+        """Flush the last block."""
+        super().close()
+        self._flush()
+
+
+def simple_html_to_markdown(input_file: Union[Path, DocumentStream]) -> str:
+    """Converts HTML to Markdown keeping only headings, lists and text.
+
+    A cheap fallback for pages the full converter cannot handle in time.
+
+    Args:
+    ----
+        input_file (Union[Path, DocumentStream]): The path to the HTML file to
+            convert, or its content read from an archive.
+
+    Returns:
+    -------
+        str: The Markdown content of the input file.
+
+    """  # noqa: D401
+    parser = _TextMarkdownParser()
+    parser.feed(_read_html(input_file))
+    parser.close()
+    return _strip_preamble("\n\n".join(parser.blocks))
+
+
+def _read_html(source: Union[Path, DocumentStream]) -> str:
+    """Read the HTML of a page file or of a page streamed from an archive."""
+    if isinstance(source, DocumentStream):
+        return source.stream.getvalue().decode("utf-8", errors="replace")
+    return Path(source).read_text(encoding="utf-8", errors="replace")
+
+
+def _source_size(source: Union[Path, DocumentStream]) -> int:
+    """Size in bytes of a page file or of a page streamed from an archive."""
+    if isinstance(source, DocumentStream):
+        return source.stream.getbuffer().nbytes
+    return Path(source).stat().st_size
+
+
+def _source_digest(source: Union[Path, DocumentStream]) -> str:
+    """SHA-256 of a page file or of a page streamed from an archive."""
+    if isinstance(source, DocumentStream):
+        return digest(source.stream.getvalue())
+    return digest(Path(source).read_bytes())
+
+
+def _source_name(source: Union[Path, DocumentStream]) -> str:
+    """Name of a page for logs, its path or its archive member name."""
+    return source.name if isinstance(source, DocumentStream) else str(source)
+
+
+def _convert_in_sections(
+    html_file: Union[Path, DocumentStream],
+    convert: Callable,
+    *,
+    split_threshold: int,
+    workers: int,
+) -> str:
+    """Convert a page, splitting it into sections when it is oversized.
+
+    Sections are converted concurrently and their markdown is stitched back
+    together in document order.
+    """
+    if not split_threshold or _source_size(html_file) <= split_threshold:
+        return convert(html_file)
+    sections = split_html(_read_html(html_file), split_threshold)
+    if len(sections) == 1:
+        return convert(html_file)
+    name = _source_name(html_file)
+    logger.debug("Splitting %s into %d sections", name, len(sections))
+    stem = PurePosixPath(name).stem
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        section_files = []
+        for index, section in enumerate(sections):
+            section_file = Path(tmp_dir) / f"{stem}-{index:04d}.html"
+            section_file.write_text(section, encoding="utf-8")
+            section_files.append(section_file)
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            parts = list(executor.map(convert, section_files))
+    return "\n\n".join(part for part in parts if part)
+
+
+def _timed_conversion(
+    html_file: Union[Path, DocumentStream],
+    convert: Callable,
+    *,
+    fallback: bool,
+) -> tuple:
+    """Convert a page and return it with its markdown, error and duration."""
+    start = time.perf_counter()
+    markdown_content, error = None, None
+    try:
+        markdown_content = convert(html_file)
+    except Exception as exc:  # noqa: BLE001
+        error = exc
+        if fallback:
+            logger.warning(
+                "Using basic converter for %s: %s",
+                _source_name(html_file),
+                exc,
+            )
+            try:
+                markdown_content = simple_html_to_markdown(html_file)
+            except Exception as fallback_exc:  # noqa: BLE001
+                error = fallback_exc
+    return html_file, markdown_content, error, time.perf_counter() - start
+
+
+def _convert_page(
+    page: tuple,
+    convert: Callable,
+    *,
+    fallback: bool,
+    journal: Optional[CheckpointJournal],
+) -> tuple:
+    """Convert a page unless ``journal`` holds its intact markdown.
+
+    Returns the markdown path, the digest of the HTML when journaling, then
+    the result of ``_timed_conversion``, whose duration is None for a page
+    recovered from the journal.
+    """
+    html_file, markdown_file = page
+    source_digest = _source_digest(html_file) if journal else None
+    recovered = journal.converted(markdown_file, source_digest) if journal else None
+    if recovered is not None:
+        return markdown_file, source_digest, html_file, recovered, None, None
+    return (
+        markdown_file,
+        source_digest,
+        *_timed_conversion(html_file, convert, fallback=fallback),
+    )
+
+
+def _html_sources(input_path: str, output_dir: Optional[str]) -> Iterator:
+    """Yield every HTML page of a directory or archive with its markdown path.
+
+    Archive members are streamed one by one and never extracted to disk.
+    """
+    if is_archive(input_path):
+        output_root = Path(output_dir or input_path)
+        resolved_root = output_root.resolve()
+        for name, data in iter_archive_members(input_path, ".html"):
+            markdown_file = (output_root / name).with_suffix(".md")
+            # Never write outside the output directory, e.g. through a symlink.
+            if not markdown_file.resolve().is_relative_to(resolved_root):
+                logger.warning("Skipping %s, it resolves outside %s", name, output_root)
+                continue
+            yield DocumentStream(name=name, stream=BytesIO(data)), markdown_file
+        return
+    input_dir = Path(input_path)
+    for html_file in input_dir.rglob("*.html"):
+        markdown_file = html_file.with_suffix(".md")
+        if output_dir:
+            markdown_file = Path(output_dir) / markdown_file.relative_to(input_dir)
+        yield html_file, markdown_file
+
+
+def _page_count(input_path: str) -> Optional[int]:
+    """Count the HTML pages of a directory, None for an archive."""
+    if is_archive(input_path):
+        return None
+    return sum(1 for _ in Path(input_path).rglob("*.html"))
+
+
+def _bounded_map(
+    executor: Executor,
+    function: Callable,
+    items: Iterator,
+    window: int,
+) -> Iterator:
+    """Like ``executor.map`` but with at most ``window`` items in flight.
+
+    ``Executor.map`` submits every item up front, which would read a whole
+    archive into memory before the first page is converted.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _minify_page(page_name: str, markdown: str, rules: list, sizes: list) -> str:
+    """Minify a page, log the bytes and tokens saved and add them to ``sizes``."""
+    minified = minify_markdown(markdown, rules)
+    before, after = len(markdown.encode("utf-8")), len(minified.encode("utf-8"))
+    logger.debug(
+        "Minified %s: %d -> %d bytes, ~%d tokens saved",
+        page_name,
+        before,
+        after,
+        (before - after) // _CHARS_PER_TOKEN,
+    )
+    sizes[0] += before
+    sizes[1] += after
+    return minified
+
+
+def _log_slowest_pages(timings: list, count: int) -> None:
+    """Log the ``count`` slowest of the ``(seconds, page)`` timings."""
+    if count and timings:
+        logger.info("Slowest pages:")
+        for elapsed, html_file in heapq.nlargest(count, timings):
+            logger.info("  %.2fs %s", elapsed, html_file)
+
+
+def _log_minify_summary(sizes: list) -> None:
+    """Log the bytes and tokens saved by minifying all pages."""
+    before, after = sizes
+    if before:
+        logger.info(
+            "Minified markdown: %d -> %d bytes (%.1f%% saved), ~%d tokens saved",
+            before,
+            after,
+            100 * (before - after) / before,
+            (before - after) // _CHARS_PER_TOKEN,
+        )
+
+
+def html_folder_to_markdown(  # noqa: PLR0913, PLR0915
+    input_path: str,
+    *,
+    output_dir: Optional[str] = None,
+    page_timeout: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    workers: int = 1,
+    fallback: bool = False,
+    slowest_pages: int = 0,
+    split_threshold: int = 0,
+    writer: Optional[OutputWriter] = None,
+    minify_rules: Optional[list] = None,
+    pool: Optional[WorkerPool] = None,
+    on_page: Optional[Callable] = None,
+    journal: Optional[CheckpointJournal] = None,
+) -> list:
     """Recursively converts all HTML files in the given directory.
 
     to Markdown files and collects the paths of the generated Markdown files.
+    The input may also be a zip or tar archive, whose pages are streamed into
+    the converter without extracting them.
+    When a page timeout, memory limit or several workers are requested, pages
+    are converted in isolated worker processes that are killed and replaced
+    when they exceed their limits. Pages larger than ``split_threshold`` bytes
+    are split at top-level headings and their sections converted concurrently.
+    A ``pool`` shared with other callers may be given instead; it is used for
+    every page and left open. Markdown is minified with ``minify_rules``
+    before it is written, and files whose content did not change are left
+    untouched. Pages recorded in ``journal`` by an interrupted run are not
+    converted again, and converted pages are recorded in it.
 
     Args:
     ----
-        input_path (str): The path to the directory containing HTML files
+        input_path (str): The path to the directory or archive containing
+            HTML files
+        output_dir (Optional[str]): Directory to write the Markdown files to,
+            next to the HTML files by default (required for archives)
+        page_timeout (Optional[float]): Seconds allowed per page, or per
+            section of a split page
+        memory_limit_mb (Optional[int]): Memory cap per worker in megabytes
+        workers (int): Number of pages converted concurrently
+        fallback (bool): Use the basic converter for pages that fail
+        slowest_pages (int): Number of slowest pages to list at the end
+        split_threshold (int): Size in bytes above which pages are split
+        writer (Optional[OutputWriter]): Writer counting written and unchanged
+            outputs
+        minify_rules (Optional[list]): Minification rules, some of
+            ``MINIFY_RULES``, none by default
+        pool (Optional[WorkerPool]): Worker pool to convert pages on, its
+            limits take precedence over ``page_timeout`` and
+            ``memory_limit_mb``
+        on_page (Optional[Callable]): Called with the path and content of
+            every markdown file once it is written, in conversion order
+        journal (Optional[CheckpointJournal]): Journal of the pages already
+            converted, to resume an interrupted run
 
     Returns:
     -------
@@ -55,55 +453,203 @@ def html_folder_to_markdown(input_path: str) -> list:
 
     Raises:
     ------
-        ValueError: If the input path is not a directory
+        ValueError: If the input path is neither a directory nor an archive,
+            or is an archive without an output directory
 
     """
-    # Configure logging
-
-    input_dir = Path(input_path)
-    if not input_dir.is_dir():
-        msg = f"The input path {input_path} is not a directory."
+    if not Path(input_path).is_dir() and not is_archive(input_path):
+        msg = f"The input path {input_path} is not a directory or an archive."
+        raise ValueError(msg)
+    if is_archive(input_path) and not output_dir:
+        msg = f"An output directory is required to convert {input_path}."
         raise ValueError(msg)
 
     # Track conversion statistics
-    success_count = 0
-    failure_count = 0
+    success_count = fallback_count = failure_count = unchanged_count = 0
+    # Total markdown bytes before and after minification.
+    sizes = [0, 0]
     markdown_files = []
+    timings = []
+    writer = writer or OutputWriter()
+    on_page = on_page or (lambda *_: None)
+    record_page = journal.record_page if journal else (lambda *_: None)
 
-    # Recursively process all HTML files
-    for html_file in input_dir.rglob("*.html"):
-        try:
-            logger.info("Converting %s", html_file)
-
-            # Convert to markdown
-            markdown_content = html_to_markdown(html_file)
-
-            # Create output markdown file in the same directory as the HTML file
-            markdown_file = html_file.with_suffix(".md")
+    isolated = bool(pool or page_timeout or memory_limit_mb or workers > 1)
+    if pool is None and isolated:
+        pool_context = pool = WorkerPool(
+            worker_html_to_markdown,
+            workers,
+            page_timeout,
+            memory_limit_mb,
+            init_worker,
+        )
+    else:
+        pool_context = nullcontext(pool)
+    with pool_context, ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        convert = partial(
+            _convert_in_sections,
+            convert=pool.convert if isolated else html_to_markdown,
+            split_threshold=split_threshold,
+            workers=workers,
+        )
 
-            # Create parent directories if they don't exist
-            markdown_file.parent.mkdir(parents=True, exist_ok=True)
+        results = _bounded_map(
+            executor,
+            partial(_convert_page, convert=convert, fallback=fallback, journal=journal),
+            _html_sources(input_path, output_dir),
+            2 * max(workers, 1),
+        )
+        for (
+            markdown_file,
+            source_digest,
+            html_file,
+            markdown_content,
+            error,
+            elapsed,
+        ) in track(results, "Converting pages", _page_count(input_path)):
+            if elapsed is None:
+                # Written by an interrupted run, already minified, but maybe
+                # not yet published.
+                unchanged_count += 1
+                writer.record(markdown_file, written=False)
+                on_page(markdown_file, markdown_content)
+                markdown_files.append(markdown_file)
+                continue
+            page_name = _source_name(html_file)
+            timings.append((elapsed, page_name))
+            if markdown_content is None:
+                failure_count += 1
+                logger.error("Failed to convert %s: %s", page_name, error)
+                continue
 
-            with Path(markdown_file).open("w", encoding="utf-8") as file:
-                file.write(markdown_content)
+            output = (
+                _minify_page(page_name, markdown_content, minify_rules, sizes)
+                if minify_rules
+                else markdown_content
+            )
+            if not writer.write(markdown_file, output):
+                unchanged_count += 1
+            record_page(markdown_file, source_digest, output, elapsed)
+            on_page(markdown_file, output)
 
-            success_count += 1
+            if error is None:
+                success_count += 1
+            else:
+                fallback_count += 1
             markdown_files.append(markdown_file)
-            logger.info("Successfully converted %s to %s", html_file, markdown_file)
-
-        except Exception:
-            failure_count += 1
-            logger.exception("Failed to convert %s", html_file)
+            logger.debug(
+                "Converted %s to %s in %.2fs",
+                page_name,
+                markdown_file,
+                elapsed,
+            )
 
     # Log summary
     logger.info(
-        "Conversion complete: %d successful, %d failed",
+        "Conversion complete: %d successful, %d fallback, %d failed",
         success_count,
+        fallback_count,
         failure_count,
     )
+    logger.info(
+        "Markdown files: %d written, %d unchanged",
+        len(markdown_files) - unchanged_count,
+        unchanged_count,
+    )
+    _log_minify_summary(sizes)
+    if isolated and pool.restarts:
+        logger.info("Restarted %d conversion workers", pool.restarts)
+    _log_slowest_pages(timings, slowest_pages)
     return markdown_files
 
 
+def summary_messages(content: str) -> list:
+    """Build the chat messages that ask the model to summarize a page."""
+    return [
+        {
+            "content": "Summarize this into 1-line sentence packing information"
+            "for technical audience. Content: " + content,
+            "role": "user",
+        },
+    ]
+
+
+def count_prompt_tokens(content: str, model_name: str) -> int:
+    """Count the prompt tokens of a summary request locally.
+
+    Args:
+    ----
+        content (str): The content of the page to summarize
+        model_name (str): Name of the model to use for summarization
+
+    Returns:
+    -------
+        int: The number of prompt tokens, estimated when no local tokenizer
+        is available for the model
+
+    """
+    messages = summary_messages(content)
+    try:
+        return litellm.token_counter(model=model_name, messages=messages)
+    except Exception:  # noqa: BLE001
+        return len(messages[0]["content"]) // _CHARS_PER_TOKEN
+
+
+def count_tokens(text: str, model_name: str) -> int:
+    """Count the tokens of ``text`` locally, estimated without a tokenizer."""
+    try:
+        return litellm.token_counter(model=model_name, text=text)
+    except Exception:  # noqa: BLE001
+        return len(text) // _CHARS_PER_TOKEN
+
+
+@cache
+def _provider(model_name: str) -> Optional[str]:
+    """Return the litellm provider of ``model_name``, if it has a known one."""
+    try:
+        return litellm.get_llm_provider(model_name)[1]
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _api_key(model_name: str, default_model: str) -> Optional[str]:
+    """Return the key to call ``model_name`` with, or None to let litellm pick.
+
+    ``MODEL_API_KEY`` belongs to the provider of the default model; models
+    of other providers use their own key from the environment, e.g.
+    ``ANTHROPIC_API_KEY``.
+    """
+    if model_name == default_model or (
+        _provider(model_name) is not None
+        and _provider(model_name) == _provider(default_model)
+    ):
+        return os.getenv("MODEL_API_KEY")
+    return None
+
+
+def _request_summary(
+    content: str,
+    model_name: str,
+    timeout: Optional[float] = None,
+    *,
+    api_key: Optional[str] = None,
+) -> tuple:
+    """Ask the model for a summary and return it with the tokens used."""
+    response = completion(
+        model=model_name,
+        api_key=api_key,
+        messages=summary_messages(content),
+        **({"timeout": timeout} if timeout else {}),
+    )
+    usage = getattr(response, "usage", None)
+    logger.debug(
+        "Summary from %s, %s tokens",
+        model_name,
+        getattr(usage, "total_tokens", None),
+    )
+    return response.choices[0].message.content, getattr(usage, "total_tokens", None)
+
+
 def generate_summary(content: str, model_name: str) -> str:
     """Summarize the page content using the model.
 
@@ -120,28 +666,21 @@ def generate_summary(content: str, model_name: str) -> str:
 
     """
     if os.getenv("MODEL_API_KEY"):
-        response = completion(
-            model=model_name,
+        summary, _ = _request_summary(
+            content,
+            model_name,
             api_key=os.getenv("MODEL_API_KEY"),
-            messages=[
-                {
-                    "content": "Summarize this into 1-line sentence packing information"
-                    "for technical audience. Content: " + content,
-                    "role": "user",
-                },
-            ],
         )
-        logger.info("Response: %s", response)
-        return response.choices[0].message.content
+        return summary
     # Extract largest heading from markdown content if present
-    logger.info("No model API key found, using heading as summary")
+    logger.debug("No model API key found, using heading as summary")
     return _extract_heading(content)
 
 
 def _extract_heading(content: str) -> str:
     """Extract the largest heading upto h3 from the given content."""
     heading_match = re.search(r"^#{1,3}\s+(.+)$", content, re.MULTILINE)
-    logger.info("Heading match: %s", heading_match)
+    logger.debug("Heading match: %s", heading_match)
     if heading_match:
         heading_match = heading_match.group(1)
         return heading_match.replace("¶", "")
@@ -152,17 +691,45 @@ def _extract_site_url(root: ET) -> str:
     """Extract the site URL from the sitemap.xml file by finding common prefix."""
     ns = {"ns": root.tag.split("}")[0].strip("{")}
     urls = [url.find("ns:loc", ns).text for url in root.findall(".//ns:url", ns)]
+    return common_url_prefix(urls)
+
+
+def common_url_prefix(urls: list) -> str:
+    """Return the common prefix of the page URLs of a sitemap."""
     if not urls:
         msg = "No URLs found in sitemap"
         raise ValueError(msg)
 
     # Find common prefix among all URLs
-    shortest = min(urls, key=len)
+    shortest = prefix = min(urls, key=len)
     for i, char in enumerate(shortest):
         if any(url[i] != char for url in urls):
-            return shortest[:i]
+            prefix = shortest[:i]
+            break
+
+    # A listed page every other URL lies under, e.g. "https://example.com/docs"
+    # with "https://example.com/docs/x/", is the site root.
+    if prefix in urls and all(url[len(prefix) :][:1] in {"", "/"} for url in urls):
+        return prefix
+    # Stop at a path boundary otherwise, "https://example.com/g" is not a
+    # directory.
+    return prefix[: prefix.rfind("/") + 1]
 
-    return shortest
+
+def url_to_file_path(url: str, site_url: str, extension: str = ".md") -> str:
+    """Map a page URL to its file path in a built site, "" outside the site."""
+    # Strip site URL prefix
+    if not url.startswith(site_url):
+        return ""
+    if url.endswith("/"):
+        url = url + "index.html"
+    path = url[len(site_url.rstrip("/")) :].strip("/")
+    # Handle different URL patterns
+    if path in {"", "index.html"}:
+        return f"index{extension}"
+    if path.endswith(".html"):
+        return f"{path[:-5]}{extension}"
+    return f"{path}/index{extension}"
 
 
 def _convert_url_to_file_path(
@@ -170,6 +737,7 @@ def _convert_url_to_file_path(
     site_url: str,
     docs_dir: str,
     locale_length: int = 2,
+    extension: str = ".md",
 ) -> str:
     """Convert the URL to a file path.
 
@@ -182,25 +750,16 @@ def _convert_url_to_file_path(
         site_url (str): Base site URL to strip
         docs_dir (str): Path to the directory containing the documentation
         locale_length (int): Length of the locale directory
+        extension (str): Extension of the file to look for
 
     Returns:
     -------
         Relative file path if found, empty string otherwise
 
     """
-    # Strip site URL prefix
-    if not url.startswith(site_url):
+    file_path = url_to_file_path(url, site_url, extension)
+    if not file_path:
         return ""
-    if url.endswith("/"):
-        url = url + "index.html"
-    path = url[len(site_url.rstrip("/")) :].strip("/")
-    # Handle different URL patterns
-    if path in {"", "index.html"}:
-        file_path = "index.md"
-    elif path.endswith(".html"):
-        file_path = f"{path[:-5]}.md"
-    else:
-        file_path = f"{path}/index.md"
     # Try original path
     if Path(f"{docs_dir}/{file_path}").exists():
         return file_path
@@ -221,16 +780,361 @@ def _convert_url_to_file_path(
     return ""
 
 
-def generate_docs_structure(
+def parse_priority(text: Optional[str], loc: str) -> float:
+    """Parse a sitemap priority, the default one when it is missing or invalid."""
+    if text is None:
+        return _DEFAULT_PRIORITY
+    try:
+        return float(text)
+    except ValueError:
+        logger.warning(
+            "Invalid priority %r for %s, using %s",
+            text,
+            loc,
+            _DEFAULT_PRIORITY,
+        )
+        return _DEFAULT_PRIORITY
+
+
+def _lastmod_timestamp(lastmod: str) -> float:
+    """Return a sitemap ``lastmod`` as a POSIX timestamp for ordering pages.
+
+    Dates, dates with a time and partial dates (``2024-05``, ``2024``) are
+    accepted, without a time zone they are taken as UTC. Missing or invalid
+    values sort before every date.
+    """
+    try:
+        parsed = datetime.fromisoformat(lastmod.replace("Z", "+00:00"))
+    except ValueError:
+        for pattern in ("%Y-%m", "%Y"):
+            try:
+                parsed = datetime.strptime(lastmod, pattern)  # noqa: DTZ007
+                break
+            except ValueError:
+                continue
+        else:
+            return float("-inf")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)  # noqa: UP017
+    return parsed.timestamp()
+
+
+def _parse_sitemap(sitemap_root: str, sitemap_path: str) -> tuple:
+    """Parse a sitemap from a directory or archive.
+
+    Args:
+    ----
+        sitemap_root (str): Directory or archive containing the sitemap
+        sitemap_path (str): Path to the sitemap.xml file
+
+    Returns:
+    -------
+        tuple: The site URL and a ``(loc, priority, lastmod)`` tuple per page
+
+    """
+    if is_archive(sitemap_root):
+        sitemap = BytesIO(read_archive_member(sitemap_root, sitemap_path))
+    elif Path(f"{sitemap_root}/{sitemap_path}").exists():
+        sitemap = f"{sitemap_root}/{sitemap_path}"
+    else:
+        msg = f"The sitemap file {sitemap_root}/{sitemap_path} does not exist."
+        raise FileNotFoundError(msg)
+
+    tree = ET.parse(sitemap)
+    root = tree.getroot()
+
+    # Extract namespace
+    ns = {"ns": root.tag.split("}")[0].strip("{")}
+
+    site_url = _extract_site_url(root)
+    entries = []
+    for url in root.findall(".//ns:url", ns):
+        loc = url.find("ns:loc", ns).text
+        entries.append(
+            (
+                loc,
+                parse_priority(url.findtext("ns:priority", None, ns), loc),
+                url.findtext("ns:lastmod", "", ns).strip(),
+            ),
+        )
+    return site_url, entries
+
+
+def read_sitemap_pages(
+    docs_dir: str,
+    sitemap_path: str,
+    *,
+    html_fallback: bool = False,
+    sitemap_root: Optional[str] = None,
+) -> list:
+    """Read the sitemap and the markdown file of every page it lists.
+
+    Args:
+    ----
+        docs_dir (str): Path to the directory containing the documentation
+        sitemap_path (str): Path to the sitemap.xml file
+        html_fallback (bool): Approximate pages that have not been converted
+            yet from their HTML file with the basic converter
+        sitemap_root (Optional[str]): Directory or archive containing the
+            sitemap when it is not ``docs_dir``
+
+    Returns:
+    -------
+        list: A ``SitemapPage`` for each page with a markdown file
+
+    """
+    site_url, entries = _parse_sitemap(sitemap_root or docs_dir, sitemap_path)
+    pages = []
+    # Process each URL in the sitemap
+    for loc, priority, lastmod in entries:
+        file_path = _convert_url_to_file_path(loc, site_url, docs_dir)
+        logger.debug("found file path: %s for %s", file_path, loc)
+        html_path = (
+            _convert_url_to_file_path(loc, site_url, docs_dir, extension=".html")
+            if not file_path and html_fallback
+            else ""
+        )
+        try:
+            if html_path:
+                content = simple_html_to_markdown(Path(f"{docs_dir}/{html_path}"))
+            elif file_path:
+                with Path(f"{docs_dir}/{file_path}").open() as f:
+                    content = f.read()
+            else:
+                logger.debug("File not found for %s", loc)
+                continue
+        except FileNotFoundError:
+            logger.debug("File not found: %s", file_path)
+            continue
+        pages.append(SitemapPage(loc, content, priority, lastmod))
+    if len(pages) < len(entries):
+        logger.info(
+            "%d of %d sitemap pages have no file and are skipped",
+            len(entries) - len(pages),
+            len(entries),
+        )
+    return pages
+
+
+def sitemap_markdown_urls(
+    docs_dir: str,
+    sitemap_path: str,
+    sitemap_root: Optional[str] = None,
+) -> dict:
+    """Map the markdown file of every page listed in the sitemap to its URL.
+
+    Args:
+    ----
+        docs_dir (str): Path to the directory containing the markdown files
+        sitemap_path (str): Path to the sitemap.xml file
+        sitemap_root (Optional[str]): Directory or archive containing the
+            sitemap when it is not ``docs_dir``
+
+    Returns:
+    -------
+        dict: Page URL by markdown file path
+
+    """
+    site_url, entries = _parse_sitemap(sitemap_root or docs_dir, sitemap_path)
+    urls = {}
+    for loc, _, _ in entries:
+        file_path = _convert_url_to_file_path(loc, site_url, docs_dir)
+        if file_path:
+            urls.setdefault(Path(f"{docs_dir}/{file_path}"), loc)
+    return urls
+
+
+def sitemap_page_urls(sitemap_root: str, sitemap_path: str, output_dir: str) -> dict:
+    """Map the markdown file each sitemap page will be converted to to its URL.
+
+    Unlike ``sitemap_markdown_urls``, files do not need to exist yet, so the
+    mapping can be used while pages are being converted.
+
+    Args:
+    ----
+        sitemap_root (str): Directory or archive containing the sitemap
+        sitemap_path (str): Path to the sitemap.xml file
+        output_dir (str): Directory the markdown files are written to
+
+    Returns:
+    -------
+        dict: Page URL by markdown file path
+
+    """
+    site_url, entries = _parse_sitemap(sitemap_root, sitemap_path)
+    urls = {}
+    for loc, _, _ in entries:
+        file_path = url_to_file_path(loc, site_url)
+        if file_path:
+            urls.setdefault(Path(output_dir) / file_path, loc)
+    return urls
+
+
+def schedule_pages(pages: list) -> list:
+    """Order page indices by sitemap priority, then freshness, then URL depth."""
+    order = list(range(len(pages)))
+    # Stable sorts, from the least to the most significant key.
+    order.sort(key=lambda index: pages[index].loc.rstrip("/").count("/"))
+    order.sort(key=lambda index: _lastmod_timestamp(pages[index].lastmod), reverse=True)
+    order.sort(key=lambda index: pages[index].priority, reverse=True)
+    return order
+
+
+def _budgeted_summary(
+    content: str,
+    router: ModelRouter,
+    budget: SummaryBudget,
+    index: int,
+    priority: Optional[float] = None,
+) -> str:
+    """Summarize with the routed models while the budget allows.
+
+    Each model of the route is tried in turn until one answers; the heading
+    is used once the budget runs out or every model failed.
+    """
+    if not os.getenv("MODEL_API_KEY"):
+        return generate_summary(content, router.model_name)
+    prompt_tokens = (
+        count_prompt_tokens(content, router.model_name)
+        if budget.max_tokens or router.counts_tokens
+        else 0
+    )
+    for model_name in router.route(prompt_tokens, priority):
+        if not budget.reserve(prompt_tokens):
+            budget.degrade(index)
+            return _extract_heading(content)
+        remaining = budget.remaining_time()
+        timeout = min(filter(None, (router.timeout, remaining)), default=remaining)
+        start = time.perf_counter()
+        try:
+            summary, used_tokens = _request_summary(
+                content,
+                model_name,
+                timeout,
+                api_key=_api_key(model_name, router.model_name),
+            )
+        except _REQUEST_ERRORS as exc:
+            budget.settle(prompt_tokens, prompt_tokens)
+            router.record(model_name, time.perf_counter() - start, failed=True)
+            logger.warning("Summary request to %s failed: %s", model_name, exc)
+            continue
+        used_tokens = used_tokens if isinstance(used_tokens, int) else prompt_tokens
+        budget.settle(prompt_tokens, used_tokens)
+        router.record(model_name, time.perf_counter() - start, used_tokens)
+        return summary
+    router.exhaust(index)
+    return _extract_heading(content)
+
+
+def summarize_pages(  # noqa: PLR0913
+    contents: list,
+    model_name: str,
+    summarizer: str = "llm",
+    concurrency: int = 1,
+    budget: Optional[SummaryBudget] = None,
+    order: Optional[list] = None,
+    router: Optional[ModelRouter] = None,
+    priorities: Optional[list] = None,
+    journal: Optional[CheckpointJournal] = None,
+) -> list:
+    """Summarize every page with the selected summarizer.
+
+    Args:
+    ----
+        contents (list): Markdown content of each page
+        model_name (str): Name of the model to use for summarization
+        summarizer (str): ``llm`` to use the model (or headings without an API
+            key), ``extractive`` to pick a sentence of each page locally
+        concurrency (int): Number of concurrent model requests
+        budget (Optional[SummaryBudget]): Limits on model calls, tokens and
+            time; pages beyond them fall back to their heading
+        order (Optional[list]): Page indices in the order to request them
+        router (Optional[ModelRouter]): Routes each page to a model and falls
+            back to other models on errors, only ``model_name`` by default
+        priorities (Optional[list]): Sitemap priority of each page, used to
+            escalate important pages
+        journal (Optional[CheckpointJournal]): Journal of the model summaries
+            already made, pages found in it are not requested again
+
+    Returns:
+    -------
+        list: One summary per page
+
+    Raises:
+    ------
+        ValueError: If the summarizer is unknown
+
+    """
+    if summarizer == "extractive":
+        summaries = extractive_summaries(contents)
+        return [
+            summary or _extract_heading(content)
+            for summary, content in zip(summaries, contents)  # noqa: B905
+        ]
+    if summarizer == "llm":
+        budget = budget or SummaryBudget()
+        router = router or ModelRouter(model_name)
+        summaries = [""] * len(contents)
+
+        def summarize(index: int) -> None:
+            recovered = journal.summary(contents[index]) if journal else None
+            if recovered is not None:
+                summaries[index] = recovered
+                return
+            summaries[index] = _budgeted_summary(
+                contents[index],
+                router,
+                budget,
+                index,
+                priorities[index] if priorities else None,
+            )
+            # Headings used in place of a model summary are retried on resume.
+            if (
+                journal
+                and os.getenv("MODEL_API_KEY")
+                and index not in router.exhausted
+                and index not in budget.degraded
+            ):
+                journal.record_summary(contents[index], summaries[index])
+
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            list(
+                track(
+                    executor.map(
+                        summarize,
+                        range(len(contents)) if order is None else order,
+                    ),
+                    "Summarizing pages",
+                    len(contents),
+                ),
+            )
+        return summaries
+    msg = f"Unknown summarizer {summarizer}, expected one of {SUMMARIZERS}"
+    raise ValueError(msg)
+
+
+def generate_docs_structure(  # noqa: PLR0913
     docs_dir: str,
     sitemap_path: str,
     model_name: str,
+    summarizer: str = "llm",
+    summary_concurrency: int = 1,
+    max_llm_calls: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    sitemap_root: Optional[str] = None,
+    escalation_model: str = "",
+    escalation_tokens: int = 0,
+    escalation_priority: float = 0.0,
+    fallback_models: Optional[list] = None,
+    summary_timeout: Optional[float] = None,
+    journal: Optional[CheckpointJournal] = None,
 ) -> str:
     """Generate a documentation structure from a sitemap.xml file.
 
     first, extract site url.
     then for each url, convert to file path.
-    then for each file path, read the file and summarize it.
+    then read every file and summarize them, most important pages first.
     then create a markdown link entry.
 
     Args:
@@ -238,58 +1142,99 @@ def generate_docs_structure(
         docs_dir (str): Path to the directory containing the documentation
         sitemap_path (str): Path to the sitemap.xml file
         model_name (str): Name of the model to use for summarization
+        summarizer (str): Summarizer to use, one of ``SUMMARIZERS``
+        summary_concurrency (int): Number of concurrent model requests
+        max_llm_calls (Optional[int]): Maximum number of model requests
+        max_tokens (Optional[int]): Maximum number of tokens sent and received
+        time_budget (Optional[float]): Seconds allowed for summarization
+        sitemap_root (Optional[str]): Directory or archive containing the
+            sitemap when it is not ``docs_dir``
+        escalation_model (str): Stronger model for long or important pages
+        escalation_tokens (int): Prompt tokens from which pages are escalated
+        escalation_priority (float): Sitemap priority from which pages are
+            escalated
+        fallback_models (Optional[list]): Models tried in order when a
+            request fails
+        summary_timeout (Optional[float]): Seconds allowed per model request
+        journal (Optional[CheckpointJournal]): Journal of the summaries
+            already made, to resume an interrupted run
 
     Returns:
     -------
         str: Markdown formatted documentation structure
 
     """
-    # Parse the sitemap XML
-    if not Path(f"{docs_dir}/{sitemap_path}").exists():
-        msg = f"The sitemap file {docs_dir}/{sitemap_path} does not exist."
-        raise FileNotFoundError(msg)
+    pages = read_sitemap_pages(docs_dir, sitemap_path, sitemap_root=sitemap_root)
+    budget = SummaryBudget(max_llm_calls, max_tokens, time_budget)
+    router = ModelRouter(
+        model_name,
+        escalation_model,
+        escalation_tokens,
+        escalation_priority,
+        fallback_models,
+        summary_timeout,
+    )
+    summaries = summarize_pages(
+        [page.content for page in pages],
+        model_name,
+        summarizer,
+        summary_concurrency,
+        budget,
+        schedule_pages(pages),
+        router,
+        [page.priority for page in pages],
+        journal,
+    )
+    if budget.calls:
+        logger.info("Used %d model calls and %d tokens", budget.calls, budget.tokens)
+        router.log_stats()
+    if router.exhausted:
+        logger.warning(
+            "%d pages used their heading as summary, every model failed:",
+            len(router.exhausted),
+        )
+        for index in sorted(router.exhausted):
+            logger.warning("  %s", pages[index].loc)
+    if budget.degraded:
+        logger.warning(
+            "%d pages used their heading as summary, the budget ran out:",
+            len(budget.degraded),
+        )
+        for index in sorted(budget.degraded):
+            logger.warning("  %s", pages[index].loc)
 
-    tree = ET.parse(f"{docs_dir}/{sitemap_path}")
-    root = tree.getroot()
+    return _format_docs_structure(pages, summaries)
 
-    # Extract namespace
-    ns = {"ns": root.tag.split("}")[0].strip("{")}
 
+def _format_docs_structure(pages: list, summaries: list) -> str:
+    """Format the llms.txt content from sitemap pages and their summaries."""
     # Start building the markdown content
     content = ["# Docs\n"]
-
-    site_url = _extract_site_url(root)
-    # Process each URL in the sitemap
-    for url in root.findall(".//ns:url", ns):
-        loc = url.find("ns:loc", ns).text
-        try:
-            logger.info("Processing %s", loc)
-            file_path = _convert_url_to_file_path(loc, site_url, docs_dir)
-            logger.info("found file path: %s for %s", file_path, loc)
-            with Path(f"{docs_dir}/{file_path}").open() as f:
-                markdown_content = f.read()
-
-            summary = generate_summary(markdown_content, model_name)
-            page_title = loc.rstrip("/").split("/")[-1].replace("-", " ").title()
-            content.append(f"- [{page_title}]({loc}): {summary}")
-        except FileNotFoundError:
-            # Try without locale path by removing first directory if it's 2 characters
-            logger.info("File not found: %s", file_path)
-            continue
+    for (loc, *_), summary in zip(pages, summaries):  # noqa: B905
+        page_title = loc.rstrip("/").split("/")[-1].replace("-", " ").title()
+        content.append(f"- [{page_title}]({loc}): {summary}")
     # Join all lines with newlines
     return "\n".join(content)
 
 
-def concatenate_markdown_files(markdown_files: list, output_file: str):
+def concatenate_markdown_files(
+    markdown_files: list,
+    output_file: str,
+    writer: Optional[OutputWriter] = None,
+):
     """Concatenates multiple markdown files into a single file.
 
+    The output file is replaced atomically, and only if its content changed.
+
     Args:
     ----
         markdown_files (list): List of paths to markdown files
         output_file (str): Path to the output file
+        writer (Optional[OutputWriter]): Writer counting written and unchanged
+            outputs
 
     """
-    with Path(output_file).open("w") as outfile:
+    with (writer or OutputWriter()).open(output_file) as outfile:
         for file_path in markdown_files:
             with Path(file_path).open() as infile:
                 outfile.write(infile.read())
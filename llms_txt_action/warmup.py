@@ -0,0 +1,144 @@
+"""Prepare a cold environment so the first page converts quickly."""
+# ruff: noqa: UP007
+
+import compileall
+import importlib.util
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Packages imported before the first page converts, the bulk of a cold start.
+WARMUP_PACKAGES = ("docling", "docling_core", "litellm", "llms_txt_action")
+
+_PROBE_PAGE = (
+    "<html><body><h1>Warmup</h1><p>A page converted to time a cold start.</p>"
+    "<table><tr><th>Name</th></tr><tr><td>Value</td></tr></table></body></html>"
+)
+# Import, create a converter and convert one page, as a fresh action run does.
+_PROBE_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from pathlib import Path
+from llms_txt_action.utils import html_to_markdown
+html_to_markdown(Path(sys.argv[1]))
+print(time.perf_counter() - start)
+"""
+
+
+def time_to_first_page(html_file: str) -> float:
+    """Return the seconds a fresh interpreter takes to convert its first page.
+
+    The probe does not write bytecode, so it measures the environment as it
+    is without warming it. Raises ``subprocess.CalledProcessError`` if the
+    conversion fails.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", _PROBE_SCRIPT, html_file],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _package_dir(name: str) -> Optional[Path]:
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return Path(next(iter(spec.submodule_search_locations)))
+
+
+def compile_packages(packages: tuple = WARMUP_PACKAGES) -> list:
+    """Compile the bytecode of ``packages`` so imports do not compile sources.
+
+    Installers such as ``uv`` do not compile bytecode by default, so every
+    cold container would otherwise recompile the modules it imports. Return
+    the names of the packages compiled successfully.
+    """
+    compiled = []
+    for name in packages:
+        package_dir = _package_dir(name)
+        if package_dir is None:
+            logger.warning("Package %s is not installed, skipping it", name)
+            continue
+        if compileall.compile_dir(package_dir, quiet=1, workers=0):
+            compiled.append(name)
+        else:
+            logger.warning("Some modules of %s failed to compile", name)
+    return compiled
+
+
+def download_model_assets(cache_dir: str) -> list:
+    """Download docling's default models into ``cache_dir`` and verify them.
+
+    Return the model folders found in ``cache_dir``, or raise ``RuntimeError``
+    if a model folder is empty after the download.
+    """
+    # Imported on use so the other warmup steps work with any docling version.
+    from docling.utils.model_downloader import download_models  # noqa: PLC0415
+
+    download_models(output_dir=Path(cache_dir), progress=False)
+    folders = sorted(path for path in Path(cache_dir).iterdir() if path.is_dir())
+    empty = [folder.name for folder in folders if not any(folder.rglob("*"))]
+    if not folders or empty:
+        msg = f"Model assets in {cache_dir} are incomplete: {empty or 'no models'}"
+        raise RuntimeError(msg)
+    return folders
+
+
+def warmup(cache_dir: str = "", *, models: bool = False) -> dict:
+    """Warm the environment and report the cold and warm time to first page.
+
+    The time to first page is measured in a fresh interpreter before and
+    after warming, which compiles the bytecode of the heavy dependencies and,
+    with ``models``, downloads docling's model assets. HTML conversion does
+    not need these models, they are only used by PDF and image pipelines.
+
+    Args:
+    ----
+        cache_dir (str): Directory to download model assets to, used by
+            docling when ``DOCLING_ARTIFACTS_PATH`` points to it
+        models (bool): Download and verify docling's model assets
+
+    Returns:
+    -------
+        dict: Cold and warm seconds to first page, compiled packages and
+        downloaded model folders
+
+    Raises:
+    ------
+        ValueError: If models are requested without a cache directory
+
+    """
+    if models and not cache_dir:
+        msg = "A cache directory is required to download model assets."
+        raise ValueError(msg)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        probe = Path(tmp_dir) / "warmup.html"
+        probe.write_text(_PROBE_PAGE, encoding="utf-8")
+        cold = time_to_first_page(str(probe))
+        logger.info("Cold start: first page converted in %.2fs", cold)
+        compiled = compile_packages()
+        logger.info("Compiled bytecode of %s", ", ".join(compiled))
+        folders = download_model_assets(cache_dir) if models else []
+        for folder in folders:
+            logger.info("Model assets ready in %s", folder)
+        warm = time_to_first_page(str(probe))
+    logger.info(
+        "Warm start: first page converted in %.2fs (%.2fs faster than cold)",
+        warm,
+        cold - warm,
+    )
+    return {
+        "cold_seconds": cold,
+        "warm_seconds": warm,
+        "compiled": compiled,
+        "models": [str(folder) for folder in folders],
+    }
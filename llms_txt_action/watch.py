@@ -0,0 +1,230 @@
+"""Watch a documentation build and regenerate outputs incrementally."""
+# ruff: noqa: UP007
+
+import hashlib
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+
+from docling.document_converter import DocumentConverter
+
+from .minify import minify_markdown, parse_rules
+from .outputs import OutputWriter
+from .utils import (
+    _format_docs_structure,
+    concatenate_markdown_files,
+    html_to_markdown,
+    read_sitemap_pages,
+    simple_html_to_markdown,
+    summarize_pages,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sitemap state that differs from any scanned one, so the sitemap is read
+# again after a failed rebuild.
+_RESCAN = object()
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class DocsWatcher:
+    """Keep the converter loaded and rebuild only what changed.
+
+    HTML files are re-converted only when their content changed (a rebuild
+    that rewrites identical files is ignored), and only pages whose markdown
+    changed are summarized again. Files caught mid-write by a documentation
+    build are picked up by a later scan.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        docs_dir: str,
+        sitemap_path: str,
+        llms_txt_name: str,
+        llms_full_txt_name: str,
+        model_name: str,
+        summarizer: str = "llm",
+        summary_concurrency: int = 1,
+        *,
+        skip_llms_txt: bool = False,
+        skip_llms_full_txt: bool = False,
+        conversion_fallback: bool = False,
+        minify: str = "",
+        **options,
+    ):
+        """Create a watcher for ``docs_dir``, the converter is loaded once.
+
+        Takes the options of ``generate_documentation``. Those that only apply
+        to a full run, e.g. output archives or crawling, are accepted so the
+        same options can be given to both, and listed in ``ignored``.
+        """
+        self.docs_dir = Path(docs_dir.rstrip("/"))
+        self.sitemap_path = sitemap_path
+        self.llms_txt_name = llms_txt_name
+        self.llms_full_txt_name = llms_full_txt_name
+        self.model_name = model_name
+        self.summarizer = summarizer
+        self.summary_concurrency = summary_concurrency
+        self.skip_llms_txt = skip_llms_txt
+        self.skip_llms_full_txt = skip_llms_full_txt
+        self.conversion_fallback = conversion_fallback
+        self.minify_rules = parse_rules(minify)
+        self.ignored = sorted(options)
+        self._converter = DocumentConverter()
+        # HTML file -> (mtime_ns, sha256) of the version last converted.
+        self._sources = {}
+        self._sitemap_state = None
+        # sha256 of page markdown -> summary.
+        self._summaries = {}
+
+    def _scan(self) -> tuple:
+        """Return changed and removed HTML files and whether the sitemap changed."""
+        changed, seen = [], set()
+        for html_file in self.docs_dir.rglob("*.html"):
+            seen.add(html_file)
+            previous = self._sources.get(html_file)
+            try:
+                mtime = html_file.stat().st_mtime_ns
+                if previous and previous[0] == mtime:
+                    continue
+                digest = _digest(html_file.read_bytes())
+            except OSError as exc:
+                logger.warning("Skipping %s until the next scan: %s", html_file, exc)
+                continue
+            if previous and previous[1] == digest:
+                self._sources[html_file] = (mtime, digest)
+                continue
+            self._sources[html_file] = (mtime, digest)
+            changed.append(html_file)
+        removed = [html_file for html_file in self._sources if html_file not in seen]
+        for html_file in removed:
+            del self._sources[html_file]
+
+        try:
+            sitemap_state = (self.docs_dir / self.sitemap_path).stat().st_mtime_ns
+        except FileNotFoundError:
+            sitemap_state = None
+        sitemap_changed = sitemap_state != self._sitemap_state
+        self._sitemap_state = sitemap_state
+        return changed, removed, sitemap_changed
+
+    def _summarize(self, pages: list) -> list:
+        """Summarize pages, reusing summaries of unchanged markdown."""
+        contents = [page.content for page in pages]
+        if self.summarizer != "llm":
+            # Corpus-wide scoring is fast enough to redo for every change.
+            return summarize_pages(contents, self.model_name, self.summarizer)
+        keys = [_digest(content.encode()) for content in contents]
+        missing = {
+            key: content
+            for key, content in zip(keys, contents)  # noqa: B905
+            if key not in self._summaries
+        }
+        summaries = summarize_pages(
+            list(missing.values()),
+            self.model_name,
+            self.summarizer,
+            self.summary_concurrency,
+        )
+        self._summaries.update(zip(missing, summaries))  # noqa: B905
+        return [self._summaries[key] for key in keys]
+
+    def _convert(self, html_file: Path) -> Optional[str]:
+        """Convert a page, with the basic converter if it fails and is allowed."""
+        try:
+            markdown_content = html_to_markdown(html_file, self._converter)
+        except Exception as exc:
+            if not self.conversion_fallback:
+                logger.exception("Failed to convert %s", html_file)
+                return None
+            logger.warning("Using basic converter for %s: %s", html_file, exc)
+            try:
+                markdown_content = simple_html_to_markdown(html_file)
+            except Exception:
+                logger.exception("Failed to convert %s", html_file)
+                return None
+        if self.minify_rules:
+            markdown_content = minify_markdown(markdown_content, self.minify_rules)
+        return markdown_content
+
+    def rebuild(self) -> Optional[int]:
+        """Convert changed pages and rewrite llms.txt and llms-full.txt.
+
+        Returns the number of pages converted or removed, None when nothing
+        changed.
+        """
+        changed, removed, sitemap_changed = self._scan()
+        if not (changed or removed or sitemap_changed):
+            return None
+        try:
+            self._write_outputs(changed, removed)
+        except Exception:
+            # Forget what this rebuild saw, so the next scan retries it.
+            for html_file in changed:
+                self._sources.pop(html_file, None)
+            self._sitemap_state = _RESCAN
+            raise
+        return len(changed) + len(removed)
+
+    def _write_outputs(self, changed: list, removed: list) -> None:
+        """Convert changed pages, drop removed ones and rewrite the outputs."""
+        writer = OutputWriter()
+        for html_file in changed:
+            markdown_content = self._convert(html_file)
+            if markdown_content is not None:
+                writer.write(html_file.with_suffix(".md"), markdown_content)
+        for html_file in removed:
+            html_file.with_suffix(".md").unlink(missing_ok=True)
+
+        markdown_files = [
+            html_file.with_suffix(".md")
+            for html_file in self._sources
+            if html_file.with_suffix(".md").exists()
+        ]
+        if not self.skip_llms_full_txt:
+            concatenate_markdown_files(
+                markdown_files,
+                self.docs_dir / self.llms_full_txt_name,
+                writer,
+            )
+        if self._sitemap_state is not None and not self.skip_llms_txt:
+            pages = read_sitemap_pages(str(self.docs_dir), self.sitemap_path)
+            writer.write(
+                self.docs_dir / self.llms_txt_name,
+                _format_docs_structure(pages, self._summarize(pages)),
+            )
+
+    def run(self, interval: float = 1.0, max_cycles: Optional[int] = None) -> None:
+        """Poll ``docs_dir`` every ``interval`` seconds and rebuild on changes.
+
+        A failed rebuild, e.g. on a sitemap the build is still writing, is
+        logged and retried on the next scan.
+
+        Args:
+        ----
+            interval (float): Seconds between two scans
+            max_cycles (Optional[int]): Stop after this many scans, forever
+                by default
+
+        """
+        cycle = 0
+        while max_cycles is None or cycle < max_cycles:
+            start = time.perf_counter()
+            try:
+                pages = self.rebuild()
+            except Exception:
+                logger.exception("Rebuild failed, retrying on the next scan")
+                pages = None
+            if pages is not None:
+                logger.info(
+                    "Rebuilt %d pages in %.2fs",
+                    pages,
+                    time.perf_counter() - start,
+                )
+            cycle += 1
+            if max_cycles is None or cycle < max_cycles:
+                time.sleep(interval)
@@ -0,0 +1,284 @@
+"""Isolated conversion workers with per-page timeouts and memory caps."""
+# ruff: noqa: UP007
+
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL = 0.05
+_STOP_TIMEOUT = 5
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class ConversionTimeoutError(TimeoutError):
+    """Raised when a page takes longer than the configured timeout."""
+
+
+class ConversionMemoryError(MemoryError):
+    """Raised when a worker grows beyond the configured memory cap."""
+
+
+def _worker_main(
+    conn: Connection,
+    converter: Callable,
+    initializer: Optional[Callable],
+) -> None:
+    """Convert every input received over ``conn`` until the pipe is closed.
+
+    ``initializer`` runs first, then the worker reports that it is ready, so
+    its startup is not counted against the first page.
+    """
+    try:
+        if initializer is not None:
+            initializer()
+    except Exception as exc:  # noqa: BLE001
+        conn.send((False, f"{type(exc).__name__}: {exc}"))
+        return
+    conn.send((True, "ready"))
+    while True:
+        try:
+            input_file = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, converter(input_file)))
+        except Exception as exc:  # noqa: BLE001
+            conn.send((False, f"{type(exc).__name__}: {exc}"))
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    """Return the resident set size of ``pid``, or None when unavailable."""
+    try:
+        with Path(f"/proc/{pid}/statm").open() as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class ConversionWorker:
+    """A single child process that converts one page at a time.
+
+    The process is started lazily and replaced whenever it exceeds its
+    timeout or memory cap, so a pathological page never poisons later ones.
+    A page's timeout only starts once the process reported it is ready.
+    """
+
+    def __init__(
+        self,
+        converter: Callable,
+        context: BaseContext,
+        initializer: Optional[Callable] = None,
+    ):
+        """Create a worker that runs ``converter`` in a ``context`` process."""
+        self._converter = converter
+        self._context = context
+        self._initializer = initializer
+        self._process = None
+        self._conn = None
+        self._ready = False
+        self.restarts = 0
+
+    def start(self) -> None:
+        """Start the worker process, without waiting for it to be ready."""
+        if self._process is not None:
+            return
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self._converter, self._initializer),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._ready = False
+
+    def wait_ready(self) -> None:
+        """Start the worker process if needed and wait until it is ready.
+
+        Raises ``RuntimeError`` if the process dies or its initializer fails.
+        """
+        self.start()
+        if self._ready:
+            return
+        while not self._conn.poll(_POLL_INTERVAL):
+            if not self._process.is_alive():
+                exitcode = self._process.exitcode
+                self._kill()
+                msg = f"Worker exited with code {exitcode} while starting"
+                raise RuntimeError(msg)
+        try:
+            ok, payload = self._conn.recv()
+        except EOFError:
+            ok, payload = False, "Worker exited while starting"
+        if not ok:
+            self._kill()
+            raise RuntimeError(payload)
+        self._ready = True
+
+    def _kill(self) -> None:
+        """Kill the current process; the next page starts a fresh one."""
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+        self._ready = False
+        self.restarts += 1
+
+    def stop(self) -> None:
+        """Ask the worker process to exit and wait for it."""
+        if self._process is None:
+            return
+        self._conn.close()
+        self._process.join(_STOP_TIMEOUT)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._process = None
+        self._conn = None
+        self._ready = False
+
+    def convert(
+        self,
+        input_file: Path,
+        timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+    ) -> str:
+        """Convert ``input_file`` in the worker process.
+
+        Args:
+        ----
+            input_file (Path): The file to convert
+            timeout (Optional[float]): Seconds to wait before killing the worker
+            memory_limit (Optional[int]): Resident memory cap in bytes
+
+        Returns:
+        -------
+            str: The converter output
+
+        Raises:
+        ------
+            ConversionTimeoutError: If the page exceeds ``timeout``
+            ConversionMemoryError: If the worker exceeds ``memory_limit``
+            RuntimeError: If the conversion fails or the worker dies
+
+        """
+        self.wait_ready()
+        self._conn.send(input_file)
+        deadline = time.monotonic() + timeout if timeout else None
+        while not self._conn.poll(_POLL_INTERVAL):
+            if not self._process.is_alive():
+                exitcode = self._process.exitcode
+                self._kill()
+                msg = f"Worker exited with code {exitcode} converting {input_file}"
+                raise RuntimeError(msg)
+            if deadline is not None and time.monotonic() > deadline:
+                self._kill()
+                msg = f"Converting {input_file} took longer than {timeout}s"
+                raise ConversionTimeoutError(msg)
+            rss = _rss_bytes(self._process.pid) if memory_limit else None
+            if rss is not None and rss > memory_limit:
+                self._kill()
+                msg = f"Converting {input_file} used more than {memory_limit} bytes"
+                raise ConversionMemoryError(msg)
+        try:
+            ok, payload = self._conn.recv()
+        except EOFError:
+            self._kill()
+            msg = f"Worker exited while converting {input_file}"
+            raise RuntimeError(msg) from None
+        if not ok:
+            raise RuntimeError(payload)
+        return payload
+
+
+class WorkerPool:
+    """A fixed set of isolated workers shared by concurrent callers.
+
+    ``convert`` blocks until a worker is idle, so it can be called from as
+    many threads as there are workers. Entering the pool starts every worker
+    concurrently and waits until they are ready.
+    """
+
+    def __init__(
+        self,
+        converter: Callable,
+        workers: int = 1,
+        timeout: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+        initializer: Optional[Callable] = None,
+    ):
+        """Create ``workers`` workers running ``converter``.
+
+        ``initializer`` runs in each worker process before it reports ready,
+        e.g. to load the converter, and is not counted against ``timeout``.
+        """
+        context = multiprocessing.get_context("spawn")
+        self.timeout = timeout or None
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self._workers = [
+            ConversionWorker(converter, context, initializer)
+            for _ in range(max(workers, 1))
+        ]
+        self._idle = queue.SimpleQueue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        if self.memory_limit and _rss_bytes(os.getpid()) is None:
+            logger.warning("Memory limit is not supported on this platform")
+
+    def start(self) -> None:
+        """Start every worker and wait until they are ready.
+
+        A worker that fails to start is logged and started again, or reports
+        its error, on its first page.
+        """
+        start = time.perf_counter()
+        for worker in self._workers:
+            worker.start()
+        for worker in self._workers:
+            try:
+                worker.wait_ready()
+            except RuntimeError as exc:
+                logger.warning("Conversion worker failed to start: %s", exc)
+        logger.debug(
+            "Started %d conversion workers in %.2fs",
+            len(self._workers),
+            time.perf_counter() - start,
+        )
+
+    def convert(self, input_file: Path) -> str:
+        """Convert ``input_file`` on the next idle worker."""
+        worker = self._idle.get()
+        try:
+            return worker.convert(input_file, self.timeout, self.memory_limit)
+        finally:
+            self._idle.put(worker)
+
+    @property
+    def restarts(self) -> int:
+        """Number of workers killed and replaced so far."""
+        return sum(worker.restarts for worker in self._workers)
+
+    def close(self) -> None:
+        """Stop all worker processes."""
+        for worker in self._workers:
+            worker.stop()
+
+    def __enter__(self) -> "WorkerPool":
+        """Start the workers and return the pool for use in a ``with`` block."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop all worker processes."""
+        self.close()
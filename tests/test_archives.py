@@ -0,0 +1,123 @@
+"""Unit tests for the llms_txt_action.archives module."""
+# ruff: noqa: S101
+
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from llms_txt_action.archives import (
+    is_archive,
+    iter_archive_members,
+    read_archive_member,
+    strip_archive_suffix,
+    write_archive,
+)
+
+
+@pytest.fixture
+def site_dir(tmp_path):
+    """Create a small built site."""
+    site = tmp_path / "site"
+    (site / "guide").mkdir(parents=True)
+    (site / "index.html").write_text("<h1>Home</h1>")
+    (site / "guide" / "install.html").write_text("<h1>Install</h1>")
+    (site / "sitemap.xml").write_text("<urlset/>")
+    return site
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar", ".tar.gz", ".tgz", ".tar.xz"])
+def test_round_trip(tmp_path, site_dir, suffix):
+    """Test that packed members are streamed back with relative names."""
+    archive = tmp_path / f"site{suffix}"
+
+    names = write_archive(str(archive), str(site_dir))
+
+    assert names == ["guide/install.html", "index.html", "sitemap.xml"]
+    assert is_archive(str(archive))
+    assert dict(iter_archive_members(str(archive), ".html")) == {
+        "guide/install.html": b"<h1>Install</h1>",
+        "index.html": b"<h1>Home</h1>",
+    }
+    assert read_archive_member(str(archive), "sitemap.xml") == b"<urlset/>"
+
+
+def test_member_names_are_normalized(tmp_path, site_dir):
+    """Test that archives created with a ``./`` prefix are read the same."""
+    archive = tmp_path / "site.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar_file:
+        tar_file.add(site_dir, ".")
+
+    names = [name for name, _ in iter_archive_members(str(archive), ".html")]
+
+    assert sorted(names) == ["guide/install.html", "index.html"]
+    assert read_archive_member(str(archive), "./sitemap.xml") == b"<urlset/>"
+
+
+def test_missing_member(tmp_path, site_dir):
+    """Test that a missing member raises FileNotFoundError."""
+    archive = tmp_path / "site.zip"
+    write_archive(str(archive), str(site_dir))
+
+    with pytest.raises(FileNotFoundError, match="no member missing.xml"):
+        read_archive_member(str(archive), "missing.xml")
+
+
+def test_zip_directories_are_skipped(tmp_path):
+    """Test that directory entries are not yielded as members."""
+    archive = tmp_path / "site.zip"
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("docs.html/", "")
+        zip_file.writestr("docs.html/index.html", "<h1>Docs</h1>")
+
+    assert list(iter_archive_members(str(archive), ".html")) == [
+        ("docs.html/index.html", b"<h1>Docs</h1>"),
+    ]
+
+
+def test_is_archive(tmp_path, site_dir):
+    """Test that only existing files with an archive suffix are archives."""
+    assert not is_archive(str(site_dir))
+    assert not is_archive(str(tmp_path / "missing.zip"))
+    assert not is_archive(str(site_dir / "index.html"))
+
+
+def test_strip_archive_suffix():
+    """Test that the full archive suffix is removed."""
+    assert strip_archive_suffix("build/site.tar.gz") == "build/site"
+    assert strip_archive_suffix("site.zip") == "site"
+    assert strip_archive_suffix("site") == "site"
+
+
+def test_write_archive_unsupported_suffix(tmp_path, site_dir):
+    """Test that an unknown archive format is rejected."""
+    with pytest.raises(ValueError, match="Unsupported archive"):
+        write_archive(str(tmp_path / "site.rar"), str(site_dir))
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar"])
+def test_members_leaving_the_root_are_skipped(tmp_path, suffix, caplog):
+    """Test that traversal member names are never yielded."""
+    archive = tmp_path / f"evil{suffix}"
+    members = {
+        "index.html": b"<h1>Home</h1>",
+        "../../escape.html": b"<h1>Out</h1>",
+        "docs/../../escape.html": b"<h1>Out</h1>",
+        "C:/escape.html": b"<h1>Out</h1>",
+    }
+    if suffix == ".zip":
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            for name, data in members.items():
+                zip_file.writestr(name, data)
+    else:
+        with tarfile.open(archive, "w") as tar_file:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar_file.addfile(info, io.BytesIO(data))
+
+    assert dict(iter_archive_members(str(archive), ".html")) == {
+        "index.html": b"<h1>Home</h1>",
+    }
+    assert "Skipping ../../escape.html" in caplog.text
@@ -0,0 +1,97 @@
+"""Unit tests for the llms_txt_action.batch module."""
+# ruff: noqa: S101
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from llms_txt_action.batch import generate_batch, load_batch_config
+from llms_txt_action.workers import WorkerPool
+
+
+@pytest.fixture(autouse=True)
+def _idle_workers():
+    """Keep the shared pool from starting worker processes."""
+    with patch.object(WorkerPool, "start"):
+        yield
+
+
+def _generate(docs_dir, model_name="gpt-4o", workers=1, pool=None):
+    """Stand in for generate_documentation, fails for the ``broken`` site."""
+    if docs_dir == "broken":
+        msg = "no sitemap"
+        raise FileNotFoundError(msg)
+    return [f"{docs_dir}/index.md", model_name, workers, pool]
+
+
+def _write_config(tmp_path, config):
+    config_path = tmp_path / "sites.json"
+    config_path.write_text(json.dumps(config))
+    return str(config_path)
+
+
+def test_load_batch_config(tmp_path):
+    """Test that defaults, sites and concurrency are read from the config."""
+    config_path = _write_config(
+        tmp_path,
+        {
+            "defaults": {"workers": 4},
+            "sites": [{"docs_dir": "api"}, {"docs_dir": "guide", "model_name": "m"}],
+            "site_concurrency": 2,
+        },
+    )
+
+    defaults, sites, site_concurrency = load_batch_config(config_path, _generate)
+
+    assert defaults == {"workers": 4}
+    assert sites == [{"docs_dir": "api"}, {"docs_dir": "guide", "model_name": "m"}]
+    assert site_concurrency == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ("config", "error"),
+    [
+        ({"docs_dir": "api"}, "must be an object with a list of sites"),
+        ({"sites": [{"docs_dir": "api", "modle_name": "m"}]}, "Unknown options"),
+        ({"defaults": {"pool": 1}, "sites": []}, "Unknown options"),
+        ({"sites": [{"model_name": "m"}]}, "has no docs_dir"),
+        ({"sites": [{"docs_dir": "api", "workers": 2}]}, "shared by all sites"),
+    ],
+)
+def test_load_batch_config_errors(tmp_path, config, error):
+    """Test that malformed configs are rejected before anything runs."""
+    with pytest.raises(ValueError, match=error):
+        load_batch_config(_write_config(tmp_path, config), _generate)
+
+
+def test_generate_batch_shares_pool():
+    """Test that every site runs over the same pool with merged options."""
+    results = generate_batch(
+        _generate,
+        [{"docs_dir": "api"}, {"docs_dir": "guide", "model_name": "m"}],
+        {"model_name": "gpt-4o", "workers": 2},
+    )
+
+    assert [result.docs_dir for result in results] == ["api", "guide"]
+    api, guide = (result.markdown_files for result in results)
+    assert api[:3] == ["api/index.md", "gpt-4o", 2]
+    assert guide[:3] == ["guide/index.md", "m", 2]
+    assert isinstance(api[3], WorkerPool)
+    assert api[3] is guide[3]
+    assert all(result.error is None for result in results)
+
+
+def test_generate_batch_failed_site(caplog):
+    """Test that a failing site is reported once the other sites are done."""
+    caplog.set_level("INFO")
+    with pytest.raises(RuntimeError, match=r"1 of 2 sites: \['broken'\]"):
+        generate_batch(
+            _generate,
+            [{"docs_dir": "broken"}, {"docs_dir": "api"}],
+            {},
+            site_concurrency=1,
+        )
+
+    assert "api: 4 pages in" in caplog.text
+    assert "broken: 0 pages in" in caplog.text
@@ -0,0 +1,55 @@
+"""Unit tests for the llms_txt_action.budget module."""
+# ruff: noqa: S101, PLR2004
+
+from unittest.mock import patch
+
+from llms_txt_action.budget import SummaryBudget
+
+
+def test_unlimited_budget():
+    """Test that a budget without limits always allows calls."""
+    budget = SummaryBudget()
+
+    assert all(budget.reserve(1000) for _ in range(100))
+    assert budget.remaining_time() is None
+
+
+def test_call_limit():
+    """Test that calls beyond the limit are refused."""
+    budget = SummaryBudget(max_calls=2)
+
+    assert budget.reserve()
+    assert budget.reserve()
+    assert not budget.reserve()
+    assert budget.calls == 2
+
+
+def test_token_limit_uses_actual_usage():
+    """Test that settled usage replaces the reserved estimate."""
+    budget = SummaryBudget(max_tokens=100)
+
+    assert budget.reserve(60)
+    assert not budget.reserve(60)
+    budget.settle(60, 30)
+    assert budget.tokens == 30
+    assert budget.reserve(60)
+
+
+def test_time_budget():
+    """Test that no calls are allowed once the time budget is spent."""
+    with patch("llms_txt_action.budget.time.monotonic", return_value=100.0):
+        budget = SummaryBudget(time_budget=10)
+        assert budget.remaining_time() == 10
+        assert budget.reserve()
+    with patch("llms_txt_action.budget.time.monotonic", return_value=111.0):
+        assert budget.remaining_time() == 0
+        assert not budget.reserve()
+
+
+def test_degrade_records_pages():
+    """Test that degraded pages are recorded."""
+    budget = SummaryBudget()
+    budget.degrade(3)
+    budget.degrade(1)
+
+    assert budget.degraded == [3, 1]
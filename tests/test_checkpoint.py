@@ -0,0 +1,169 @@
+"""Unit tests for the llms_txt_action.checkpoint module."""
+# ruff: noqa: S101
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from llms_txt_action.checkpoint import (
+    CheckpointJournal,
+    digest,
+    journal_path,
+    staging_directory,
+)
+
+
+@pytest.fixture
+def markdown_file(tmp_path):
+    """Create a converted page."""
+    markdown_file = tmp_path / "index.md"
+    markdown_file.write_text("# Index\n\nContent.")
+    return markdown_file
+
+
+def test_journal_recovers_completed_work(tmp_path, markdown_file):
+    """Test that a reopened journal recovers pages and summaries."""
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal(path, "settings")
+    journal.record_page(markdown_file, "html", markdown_file.read_text(), 1.5)
+    journal.record_summary("# Index\n\nContent.", "An index.")
+    journal.close()
+
+    resumed = CheckpointJournal(path, "settings")
+
+    assert resumed.converted(markdown_file, "html") == "# Index\n\nContent."
+    assert resumed.converted(markdown_file, "changed html") is None
+    assert resumed.summary("# Index\n\nContent.") == "An index."
+    assert resumed.summary("Other content") is None
+    assert resumed.recovered == {"pages": 1, "summaries": 1, "seconds": 1.5}
+
+
+def test_journal_rejects_changed_markdown(tmp_path, markdown_file):
+    """Test that a page whose markdown changed or vanished is not recovered."""
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal(path, "settings")
+    journal.record_page(markdown_file, "html", markdown_file.read_text())
+    journal.close()
+
+    markdown_file.write_text("# Index\n\nEdited.")
+    assert CheckpointJournal(path, "settings").converted(markdown_file, "html") is None
+    markdown_file.unlink()
+    assert CheckpointJournal(path, "settings").converted(markdown_file, "html") is None
+
+
+def test_journal_keys_pages_relative_to_root(tmp_path, markdown_file):
+    """Test that pages written under another root are recovered."""
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal(path, "settings", root=str(tmp_path))
+    journal.record_page(markdown_file, "html", markdown_file.read_text())
+    journal.close()
+    moved = tmp_path / "moved" / "index.md"
+    moved.parent.mkdir()
+    moved.write_text(markdown_file.read_text())
+
+    resumed = CheckpointJournal(path, "settings", root=str(moved.parent))
+
+    assert resumed.resuming
+    assert resumed.converted(moved, "html") == "# Index\n\nContent."
+    assert json.loads(path.read_text().splitlines()[1])["page"] == "index.md"
+
+
+def test_staging_directory_is_kept_on_errors(tmp_path):
+    """Test that staged outputs survive an error and are cleared otherwise."""
+    staging = tmp_path / "journal.staging"
+
+    def interrupted_run() -> None:
+        with staging_directory(staging, keep=False) as staging_dir:
+            (Path(staging_dir) / "index.md").write_text("# Index")
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        interrupted_run()
+    with staging_directory(staging, keep=True) as staging_dir:
+        assert (Path(staging_dir) / "index.md").exists()
+    assert not staging.exists()
+
+    (staging / "stale.md").parent.mkdir()
+    (staging / "stale.md").write_text("# Stale")
+    with staging_directory(staging, keep=False) as staging_dir:
+        assert not list(Path(staging_dir).iterdir())
+
+
+def test_journal_ignores_other_settings(tmp_path):
+    """Test that a journal written with other settings is replaced."""
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal(path, "old")
+    journal.record_summary("content", "old summary")
+    journal.close()
+
+    journal = CheckpointJournal(path, "new")
+    assert journal.summary("content") is None
+    journal.record_summary("other", "new summary")
+    journal.close()
+
+    lines = path.read_text().splitlines()
+    assert json.loads(lines[0]) == {"fingerprint": "new"}
+    assert len(lines) == 2  # noqa: PLR2004
+
+
+def test_journal_drops_torn_record(tmp_path, caplog):
+    """Test that a record torn by a crash is dropped and overwritten."""
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal(path, "settings")
+    journal.record_summary("first", "kept")
+    journal.close()
+    with path.open("a") as file:
+        file.write('{"content": "torn')
+
+    journal = CheckpointJournal(path, "settings")
+    journal.record_summary("second", "appended")
+    journal.close()
+
+    assert "Dropping a torn record" in caplog.text
+    resumed = CheckpointJournal(path, "settings")
+    assert resumed.summary("first") == "kept"
+    assert resumed.summary("second") == "appended"
+
+
+def test_journal_syncs_in_batches(tmp_path):
+    """Test that records are fsync'd in batches and on close."""
+    journal = CheckpointJournal(
+        tmp_path / "journal.jsonl",
+        "settings",
+        sync_every=3,
+        sync_seconds=3600,
+    )
+    with patch("llms_txt_action.checkpoint.os.fsync") as mock_fsync:
+        for index in range(7):
+            journal.record_summary(f"content {index}", "summary")
+        assert mock_fsync.call_count == 2  # noqa: PLR2004
+        journal.close()
+    assert mock_fsync.call_count == 3  # noqa: PLR2004
+
+
+def test_journal_is_removed_after_a_complete_run(tmp_path):
+    """Test that the journal is kept on errors and removed on completion."""
+    path = journal_path(str(tmp_path / "checkpoints"), str(tmp_path / "site"))
+
+    def interrupted_run() -> None:
+        with CheckpointJournal(path) as journal:
+            journal.record_summary("content", "summary")
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        interrupted_run()
+    assert path.exists()
+
+    with CheckpointJournal(path) as journal:
+        assert journal.summary("content") == "summary"
+    assert not path.exists()
+    assert not path.parent.exists()
+
+
+def test_journal_path_is_per_output():
+    """Test that every output location has its own journal."""
+    assert journal_path("cache", "a") != journal_path("cache", "b")
+    assert journal_path("cache", "a").parent.name == "cache"
+    assert len(digest(b"data")) == 64  # noqa: PLR2004
@@ -0,0 +1,86 @@
+"""Unit tests for the llms_txt_action.compression module."""
+# ruff: noqa: S101, PLR2004
+
+import gzip
+import os
+
+import pytest
+
+from llms_txt_action.compression import parse_formats, precompress_files
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    """Create generated outputs to compress."""
+    llms_txt = tmp_path / "llms.txt"
+    llms_txt.write_text("# Docs\n\n" + "- [Page](https://example.com/): text\n" * 50)
+    page = tmp_path / "guide" / "index.md"
+    page.parent.mkdir()
+    page.write_text("# Guide\n\nHow to use the action.\n" * 20)
+    return [llms_txt, page]
+
+
+def test_gzip_siblings(outputs, caplog):
+    """Test that gzip siblings decompress to the source and ratios are logged."""
+    caplog.set_level("INFO")
+
+    stats = precompress_files(outputs, ["gz"])
+
+    for path in outputs:
+        sibling = path.with_name(path.name + ".gz")
+        assert gzip.decompress(sibling.read_bytes()) == path.read_bytes()
+    assert stats["gz"]["compressed"] == 2
+    assert stats["gz"]["compressed_size"] < stats["gz"]["size"]
+    assert any(
+        message.startswith(".gz: compressed 2 files") for message in caplog.messages
+    )
+
+
+def test_unchanged_sources_are_skipped(outputs):
+    """Test that only sources changed since the last run are compressed again."""
+    precompress_files(outputs, ["gz"])
+    outputs[0].write_text("# Docs\n\nChanged\n")
+    stat = outputs[0].stat()
+    os.utime(outputs[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    stats = precompress_files(outputs, ["gz"])
+
+    assert stats["gz"]["compressed"] == 1
+    assert stats["gz"]["skipped"] == 1
+    assert gzip.decompress((outputs[0].parent / "llms.txt.gz").read_bytes()) == (
+        b"# Docs\n\nChanged\n"
+    )
+
+
+def test_changes_keeping_the_mtime_are_compressed(outputs):
+    """Test that a source rewritten with its old mtime is compressed again."""
+    precompress_files(outputs, ["gz"])
+    stat = outputs[0].stat()
+    outputs[0].write_text("# Docs\n\nChanged\n")
+    os.utime(outputs[0], ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    stats = precompress_files(outputs, ["gz"])
+
+    assert stats["gz"]["compressed"] == 1
+    assert gzip.decompress((outputs[0].parent / "llms.txt.gz").read_bytes()) == (
+        b"# Docs\n\nChanged\n"
+    )
+
+
+def test_brotli_siblings(outputs):
+    """Test that brotli siblings decompress to the source."""
+    brotli = pytest.importorskip("brotli")
+
+    precompress_files(outputs, ["br"])
+
+    for path in outputs:
+        sibling = path.with_name(path.name + ".br")
+        assert brotli.decompress(sibling.read_bytes()) == path.read_bytes()
+
+
+def test_parse_formats():
+    """Test that formats are deduplicated and unknown ones rejected."""
+    assert parse_formats("gz, .br,gz") == ["gz", "br"]
+    assert parse_formats("") == []
+    with pytest.raises(ValueError, match="Unknown compression"):
+        parse_formats("zstd")
@@ -0,0 +1,169 @@
+"""Unit tests for the llms_txt_action.crawl module."""
+# ruff: noqa: S101, PLR2004
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llms_txt_action.crawl import Crawler, CrawlError, sitemap_url_for
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """Serve ``server.pages`` with ETags and record every request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        """Serve a page, or 304 when the client's ETag still matches."""
+        self.server.requests.append(self.path)
+        self.server.connections.add(self.client_address)
+        body = self.server.pages.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Keep the test output quiet."""
+
+
+@pytest.fixture
+def site():
+    """Serve a documentation site over HTTP on a local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+    server.requests = []
+    server.connections = set()
+    base = f"http://127.0.0.1:{server.server_port}"
+    server.pages = {
+        "/sitemap.xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"<sitemap><loc>{base}/sitemap-docs.xml</loc></sitemap>"
+            "</sitemapindex>"
+        ).encode(),
+        "/sitemap-docs.xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"<url><loc>{base}/</loc><priority>1.0</priority></url>"
+            f"<url><loc>{base}/guide/</loc><lastmod>2024-01-01</lastmod></url>"
+            f"<url><loc>{base}/api.html</loc></url>"
+            "</urlset>"
+        ).encode(),
+        "/": b"<h1>Home</h1>",
+        "/guide/": b"<h1>Guide</h1>",
+        "/api.html": b"<h1>API</h1>",
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, base
+    server.shutdown()
+    server.server_close()
+
+
+def test_mirror_site(tmp_path, site):
+    """Test that pages are mirrored where a static site build puts them."""
+    server, base = site
+    docs_dir = tmp_path / "site"
+
+    with Crawler(concurrency=4) as crawler:
+        stats = crawler.mirror(f"{base}/sitemap.xml", str(docs_dir))
+
+    assert stats["pages"] == 3
+    assert stats["changed"] == 3
+    assert (docs_dir / "index.html").read_bytes() == b"<h1>Home</h1>"
+    assert (docs_dir / "guide" / "index.html").read_bytes() == b"<h1>Guide</h1>"
+    assert (docs_dir / "api.html").read_bytes() == b"<h1>API</h1>"
+    sitemap = (docs_dir / "sitemap.xml").read_text()
+    assert f"<loc>{base}/guide/</loc><lastmod>2024-01-01</lastmod>" in sitemap
+    assert "<priority>1.0</priority>" in sitemap
+    # Keep-alive: far fewer connections than requests.
+    assert len(server.connections) < len(server.requests)
+
+
+def test_repeat_crawl_transfers_only_changed_pages(tmp_path, site):
+    """Test that cached pages are revalidated with conditional requests."""
+    server, base = site
+    docs_dir = tmp_path / "site"
+    cache_dir = tmp_path / "cache"
+    with Crawler(str(cache_dir)) as crawler:
+        crawler.mirror(f"{base}/sitemap.xml", str(docs_dir))
+    mtime = (docs_dir / "api.html").stat().st_mtime_ns
+
+    server.pages["/guide/"] = b"<h1>Guide, updated</h1>"
+    with Crawler(str(cache_dir)) as crawler:
+        stats = crawler.mirror(f"{base}/sitemap.xml", str(docs_dir))
+
+    assert stats["changed"] == 1
+    assert stats["not_modified"] == 2
+    assert stats["bytes"] == len(b"<h1>Guide, updated</h1>")
+    assert (docs_dir / "guide" / "index.html").read_bytes() == (
+        b"<h1>Guide, updated</h1>"
+    )
+    assert (docs_dir / "api.html").stat().st_mtime_ns == mtime
+
+
+def test_failed_pages_are_counted(tmp_path, site):
+    """Test that a page that cannot be fetched does not stop the crawl."""
+    server, base = site
+    del server.pages["/api.html"]
+
+    with Crawler() as crawler:
+        stats = crawler.mirror(f"{base}/sitemap.xml", str(tmp_path))
+
+    assert stats["failed"] == 1
+    assert stats["changed"] == 2
+    assert not (tmp_path / "api.html").exists()
+
+
+def test_pages_outside_docs_dir_are_refused(tmp_path, site):
+    """Test that sitemap locations climbing out of docs_dir are not written."""
+    server, base = site
+    server.pages["/sitemap-docs.xml"] = (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"<url><loc>{base}/</loc></url>"
+        f"<url><loc>{base}/docs/../../escape.html</loc></url>"
+        f"<url><loc>{base}/%2e%2e/%2E%2E/encoded.html</loc></url>"
+        "</urlset>"
+    ).encode()
+    docs_dir = tmp_path / "deep" / "site"
+
+    with Crawler() as crawler:
+        stats = crawler.mirror(f"{base}/sitemap.xml", str(docs_dir))
+
+    assert stats["failed"] == 2
+    assert (docs_dir / "index.html").exists()
+    assert [path.name for path in tmp_path.rglob("*.html")] == ["index.html"]
+    assert "/escape.html" not in server.requests
+
+
+def test_missing_sitemap(tmp_path, site):
+    """Test that a missing sitemap raises CrawlError."""
+    _, base = site
+
+    with Crawler() as crawler, pytest.raises(CrawlError, match=r"missing\.xml"):
+        crawler.mirror(f"{base}/missing.xml", str(tmp_path))
+
+
+def test_sitemap_url_for():
+    """Test that site URLs are resolved to their sitemap."""
+    assert sitemap_url_for("https://example.com/docs") == (
+        "https://example.com/docs/sitemap.xml"
+    )
+    assert sitemap_url_for("https://example.com/map.xml") == (
+        "https://example.com/map.xml"
+    )
@@ -1,11 +1,15 @@
 """Test the entrypoint module."""
 
+import json
+import logging
 import os
+import tarfile
+import zipfile
 from unittest.mock import patch
 
 import pytest
 
-from llms_txt_action.entrypoint import main, str2bool
+from llms_txt_action.entrypoint import generate_documentation, main, str2bool
 
 
 @pytest.mark.parametrize(
@@ -52,6 +56,37 @@ def test_default_arguments(mock_generate_documentation):
         llms_txt_name="llms.txt",
         llms_full_txt_name="llms-full.txt",
         model_name="gpt-4o",
+        page_timeout=0.0,
+        page_memory_limit=0,
+        workers=1,
+        conversion_fallback=False,
+        slowest_pages=10,
+        split_threshold_kb=0,
+        summarizer="llm",
+        summary_concurrency=1,
+        plan=False,
+        max_llm_calls=0,
+        max_tokens=0,
+        time_budget=0.0,
+        output_dir="",
+        output_archive="",
+        full_shard_size_kb=0,
+        precompress="",
+        minify="",
+        crawl_url="",
+        crawl_concurrency=8,
+        crawl_cache_dir="",
+        escalation_model="",
+        escalation_tokens=0,
+        escalation_priority=0.0,
+        fallback_models="",
+        summary_timeout=0.0,
+        retrieval_index=False,
+        export_sections=False,
+        checkpoint_dir="",
+        output_url="",
+        output_endpoint_url="",
+        upload_concurrency=16,
     )
 
 
@@ -80,6 +115,37 @@ def test_cli_arguments(mock_generate_documentation):
         llms_txt_name="custom.txt",
         llms_full_txt_name="llms-full.txt",  # default unchanged
         model_name="gpt-3.5",
+        page_timeout=0.0,
+        page_memory_limit=0,
+        workers=1,
+        conversion_fallback=False,
+        slowest_pages=10,
+        split_threshold_kb=0,
+        summarizer="llm",
+        summary_concurrency=1,
+        plan=False,
+        max_llm_calls=0,
+        max_tokens=0,
+        time_budget=0.0,
+        output_dir="",
+        output_archive="",
+        full_shard_size_kb=0,
+        precompress="",
+        minify="",
+        crawl_url="",
+        crawl_concurrency=8,
+        crawl_cache_dir="",
+        escalation_model="",
+        escalation_tokens=0,
+        escalation_priority=0.0,
+        fallback_models="",
+        summary_timeout=0.0,
+        retrieval_index=False,
+        export_sections=False,
+        checkpoint_dir="",
+        output_url="",
+        output_endpoint_url="",
+        upload_concurrency=16,
     )
 
 
@@ -105,6 +171,37 @@ def test_environment_variables(mock_generate_documentation):
         llms_txt_name="env.txt",
         llms_full_txt_name="llms-full.txt",  # default unchanged
         model_name="gpt-4",
+        page_timeout=0.0,
+        page_memory_limit=0,
+        workers=1,
+        conversion_fallback=False,
+        slowest_pages=10,
+        split_threshold_kb=0,
+        summarizer="llm",
+        summary_concurrency=1,
+        plan=False,
+        max_llm_calls=0,
+        max_tokens=0,
+        time_budget=0.0,
+        output_dir="",
+        output_archive="",
+        full_shard_size_kb=0,
+        precompress="",
+        minify="",
+        crawl_url="",
+        crawl_concurrency=8,
+        crawl_cache_dir="",
+        escalation_model="",
+        escalation_tokens=0,
+        escalation_priority=0.0,
+        fallback_models="",
+        summary_timeout=0.0,
+        retrieval_index=False,
+        export_sections=False,
+        checkpoint_dir="",
+        output_url="",
+        output_endpoint_url="",
+        upload_concurrency=16,
     )
 
 
@@ -135,4 +232,392 @@ def test_cli_overrides_environment(mock_generate_documentation):
         llms_txt_name="llms.txt",
         llms_full_txt_name="llms-full.txt",
         model_name="cli-model",  # CLI takes precedence
+        page_timeout=0.0,
+        page_memory_limit=0,
+        workers=1,
+        conversion_fallback=False,
+        slowest_pages=10,
+        split_threshold_kb=0,
+        summarizer="llm",
+        summary_concurrency=1,
+        plan=False,
+        max_llm_calls=0,
+        max_tokens=0,
+        time_budget=0.0,
+        output_dir="",
+        output_archive="",
+        full_shard_size_kb=0,
+        precompress="",
+        minify="",
+        crawl_url="",
+        crawl_concurrency=8,
+        crawl_cache_dir="",
+        escalation_model="",
+        escalation_tokens=0,
+        escalation_priority=0.0,
+        fallback_models="",
+        summary_timeout=0.0,
+        retrieval_index=False,
+        export_sections=False,
+        checkpoint_dir="",
+        output_url="",
+        output_endpoint_url="",
+        upload_concurrency=16,
     )
+
+
+def test_conversion_arguments(mock_generate_documentation):
+    """Test that conversion worker options are parsed and forwarded."""
+    test_args = [
+        "script",
+        "--page-timeout",
+        "30",
+        "--page-memory-limit",
+        "2048",
+        "--workers",
+        "4",
+        "--conversion-fallback",
+        "--slowest-pages",
+        "3",
+    ]
+
+    with patch("sys.argv", test_args):
+        main()
+
+    kwargs = mock_generate_documentation.call_args.kwargs
+    assert kwargs["page_timeout"] == 30.0  # noqa: S101, PLR2004
+    assert kwargs["page_memory_limit"] == 2048  # noqa: S101, PLR2004
+    assert kwargs["workers"] == 4  # noqa: S101, PLR2004
+    assert kwargs["conversion_fallback"] is True  # noqa: S101
+    assert kwargs["slowest_pages"] == 3  # noqa: S101, PLR2004
+
+
+def test_plan_mode_skips_generation(tmp_path, caplog):
+    """Test that plan mode logs a plan without converting pages."""
+    caplog.set_level(logging.INFO, logger="llms_txt_action.entrypoint")
+    with (
+        patch("llms_txt_action.entrypoint.plan_summaries") as mock_plan,
+        patch("llms_txt_action.entrypoint.format_plan", return_value="the plan"),
+        patch("llms_txt_action.entrypoint.html_folder_to_markdown") as mock_convert,
+    ):
+        result = generate_documentation(
+            docs_dir=str(tmp_path),
+            sitemap_path="sitemap.xml",
+            skip_md_files=False,
+            skip_llms_txt=False,
+            skip_llms_full_txt=False,
+            llms_txt_name="llms.txt",
+            llms_full_txt_name="llms-full.txt",
+            model_name="gpt-4o",
+            plan=True,
+        )
+
+    assert result == []  # noqa: S101
+    mock_plan.assert_called_once()
+    mock_convert.assert_not_called()
+    assert "the plan" in caplog.text  # noqa: S101
+
+
+def test_plan_mode_refuses_to_crawl(tmp_path):
+    """Test that a plan never mirrors the remote site."""
+    with (
+        patch("llms_txt_action.entrypoint.Crawler") as mock_crawler,
+        pytest.raises(ValueError, match="when planning"),
+    ):
+        generate_documentation(
+            docs_dir=str(tmp_path),
+            sitemap_path="sitemap.xml",
+            skip_md_files=False,
+            skip_llms_txt=False,
+            skip_llms_full_txt=False,
+            llms_txt_name="llms.txt",
+            llms_full_txt_name="llms-full.txt",
+            model_name="gpt-4o",
+            plan=True,
+            crawl_url="https://example.com/",
+        )
+
+    mock_crawler.assert_not_called()
+
+
+@pytest.mark.parametrize("skip_md_files", [True, False])
+def test_archive_in_archive_out(tmp_path, skip_md_files):
+    """Test that an archived site produces an archive of the outputs."""
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "index.html").write_text("<h1>Home</h1>")
+    (site / "sitemap.xml").write_text(
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        "<url><loc>https://example.com/</loc></url></urlset>",
+    )
+    site_archive = tmp_path / "site.tar.gz"
+    with tarfile.open(site_archive, "w:gz") as tar_file:
+        tar_file.add(site, ".")
+    output_archive = tmp_path / "llms.zip"
+
+    with (
+        patch.dict(os.environ, {"MODEL_API_KEY": ""}),
+        patch("llms_txt_action.utils.html_to_markdown", return_value="# Home"),
+    ):
+        result = generate_documentation(
+            docs_dir=str(site_archive),
+            sitemap_path="sitemap.xml",
+            skip_md_files=skip_md_files,
+            skip_llms_txt=False,
+            skip_llms_full_txt=False,
+            llms_txt_name="llms.txt",
+            llms_full_txt_name="llms-full.txt",
+            model_name="gpt-4o",
+            output_archive=str(output_archive),
+        )
+
+    pages = [] if skip_md_files else ["index.md"]
+    # Pages are named by their member, the staging directory is gone.
+    assert result == pages  # noqa: S101
+    with zipfile.ZipFile(output_archive) as zip_file:
+        assert sorted(zip_file.namelist()) == [  # noqa: S101
+            *pages,
+            "llms-full.txt",
+            "llms.txt",
+        ]
+        llms_txt = zip_file.read("llms.txt").decode()
+    assert "- [Example.Com](https://example.com/): Home" in llms_txt  # noqa: S101
+    assert not (tmp_path / "site.md").exists()  # noqa: S101
+
+
+def test_watch_command():
+    """Test that the watch command runs the watcher with the parsed options."""
+    test_args = ["script", "watch", "--docs-dir", "watched", "--interval", "2"]
+
+    with (
+        patch("llms_txt_action.entrypoint.DocsWatcher") as mock_watcher,
+        patch("llms_txt_action.entrypoint.generate_documentation") as mock_generate,
+        patch("sys.argv", test_args),
+    ):
+        main()
+
+    mock_generate.assert_not_called()
+    assert mock_watcher.call_args.kwargs["docs_dir"] == "watched"  # noqa: S101
+    mock_watcher.return_value.run.assert_called_once_with(2.0)
+
+
+def test_watch_command_keeps_options_before_subcommand(caplog):
+    """Test that options given before ``watch`` are not reset to defaults."""
+    test_args = [
+        "script",
+        "--docs-dir",
+        "mysite",
+        "--model-name",
+        "x",
+        "--output-dir",
+        "out",
+        "watch",
+        "--minify",
+        "all",
+    ]
+
+    with (
+        patch("llms_txt_action.entrypoint.DocsWatcher") as mock_watcher,
+        patch("llms_txt_action.entrypoint.configure_logging"),
+        patch("sys.argv", test_args),
+    ):
+        mock_watcher.return_value.ignored = ["output_dir", "workers"]
+        main()
+
+    kwargs = mock_watcher.call_args.kwargs
+    assert kwargs["docs_dir"] == "mysite"  # noqa: S101
+    assert kwargs["model_name"] == "x"  # noqa: S101
+    assert kwargs["minify"] == "all"  # noqa: S101
+    assert kwargs["checkpoint_dir"] == ""  # noqa: S101
+    assert "Ignoring options of full runs: output_dir" in caplog.text  # noqa: S101
+
+
+def test_warmup_command():
+    """Test that the warmup command warms up without generating documentation."""
+    test_args = ["script", "warmup", "--cache-dir", "models", "--models"]
+
+    with (
+        patch("llms_txt_action.entrypoint.warmup") as mock_warmup,
+        patch("llms_txt_action.entrypoint.generate_documentation") as mock_generate,
+        patch("sys.argv", test_args),
+    ):
+        main()
+
+    mock_generate.assert_not_called()
+    mock_warmup.assert_called_once_with("models", models=True)
+
+
+def test_batch_config(tmp_path):
+    """Test that a batch config runs every site over a shared batch."""
+    config_path = tmp_path / "sites.json"
+    config_path.write_text(
+        '{"defaults": {"minify": "all"}, "sites": '
+        '[{"docs_dir": "api/site"}, {"docs_dir": "guide/site"}]}',
+    )
+    test_args = ["script", "--batch-config", str(config_path), "--workers", "4"]
+
+    with (
+        patch("llms_txt_action.entrypoint.generate_batch") as mock_batch,
+        patch("sys.argv", test_args),
+    ):
+        main()
+
+    generate, sites, options, site_concurrency = mock_batch.call_args.args
+    assert generate is generate_documentation  # noqa: S101
+    assert sites == [{"docs_dir": "api/site"}, {"docs_dir": "guide/site"}]  # noqa: S101
+    assert options["minify"] == "all"  # noqa: S101
+    assert options["workers"] == 4  # noqa: S101, PLR2004
+    assert site_concurrency == 0  # noqa: S101
+
+
+def test_export_sections(tmp_path):
+    """Test that sections are exported with the URLs of their pages."""
+    (tmp_path / "guide").mkdir()
+    (tmp_path / "guide" / "index.html").write_text("<h1>Guide</h1>")
+    (tmp_path / "sitemap.xml").write_text(
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        "<url><loc>https://example.com/docs/</loc></url>"
+        "<url><loc>https://example.com/docs/guide/</loc></url></urlset>",
+    )
+
+    with (
+        patch.dict(os.environ, {"MODEL_API_KEY": ""}),
+        patch(
+            "llms_txt_action.utils.html_to_markdown",
+            return_value="# Guide\n\nIntro.\n\n## Install\n\nSteps.\n",
+        ),
+    ):
+        generate_documentation(
+            docs_dir=str(tmp_path),
+            sitemap_path="sitemap.xml",
+            skip_md_files=False,
+            skip_llms_txt=True,
+            skip_llms_full_txt=True,
+            llms_txt_name="llms.txt",
+            llms_full_txt_name="llms-full.txt",
+            model_name="gpt-4o",
+            export_sections=True,
+        )
+
+    lines = (tmp_path / "llms-full.sections.jsonl").read_text().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["headings"] for record in records] == [  # noqa: S101
+        ["Guide"],
+        ["Guide", "Install"],
+    ]
+    assert records[1]["url"] == "https://example.com/docs/guide/"  # noqa: S101
+    assert records[1]["file"] == "guide/index.md"  # noqa: S101
+
+
+def test_interrupted_run_resumes(tmp_path):
+    """Test that a run resumes from the checkpoint of an interrupted run."""
+    docs_dir = tmp_path / "site"
+    docs_dir.mkdir()
+    (docs_dir / "index.html").write_text("<h1>Index</h1>")
+    options = {
+        "docs_dir": str(docs_dir),
+        "sitemap_path": "sitemap.xml",
+        "skip_md_files": False,
+        "skip_llms_txt": False,
+        "skip_llms_full_txt": True,
+        "llms_txt_name": "llms.txt",
+        "llms_full_txt_name": "llms-full.txt",
+        "model_name": "gpt-4o",
+        "checkpoint_dir": str(tmp_path / "checkpoints"),
+    }
+
+    with (
+        patch("llms_txt_action.utils.html_to_markdown", return_value="# Index"),
+        patch(
+            "llms_txt_action.entrypoint.generate_docs_structure",
+            side_effect=RuntimeError("provider outage"),
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        generate_documentation(**options)
+    assert list((tmp_path / "checkpoints").iterdir())  # noqa: S101
+
+    with (
+        patch("llms_txt_action.utils.html_to_markdown") as mock_converter,
+        patch(
+            "llms_txt_action.entrypoint.generate_docs_structure",
+            return_value="# Docs",
+        ),
+    ):
+        markdown_files = generate_documentation(**options)
+
+    mock_converter.assert_not_called()
+    assert markdown_files == [docs_dir / "index.md"]  # noqa: S101
+    assert not (tmp_path / "checkpoints").exists()  # noqa: S101
+
+
+def test_interrupted_archive_run_resumes(tmp_path):
+    """Test that a run packing an archive recovers the staged pages."""
+    docs_dir = tmp_path / "site"
+    docs_dir.mkdir()
+    (docs_dir / "index.html").write_text("<h1>Index</h1>")
+    options = {
+        "docs_dir": str(docs_dir),
+        "sitemap_path": "sitemap.xml",
+        "skip_md_files": False,
+        "skip_llms_txt": False,
+        "skip_llms_full_txt": True,
+        "llms_txt_name": "llms.txt",
+        "llms_full_txt_name": "llms-full.txt",
+        "model_name": "gpt-4o",
+        "output_archive": str(tmp_path / "llms.zip"),
+        "checkpoint_dir": str(tmp_path / "checkpoints"),
+    }
+
+    with (
+        patch("llms_txt_action.utils.html_to_markdown", return_value="# Index"),
+        patch(
+            "llms_txt_action.entrypoint.generate_docs_structure",
+            side_effect=RuntimeError("provider outage"),
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        generate_documentation(**options)
+
+    with (
+        patch("llms_txt_action.utils.html_to_markdown") as mock_converter,
+        patch(
+            "llms_txt_action.entrypoint.generate_docs_structure",
+            return_value="# Docs",
+        ),
+    ):
+        markdown_files = generate_documentation(**options)
+
+    mock_converter.assert_not_called()
+    assert markdown_files == ["index.md"]  # noqa: S101
+    with zipfile.ZipFile(tmp_path / "llms.zip") as zip_file:
+        assert zip_file.read("index.md") == b"# Index"  # noqa: S101
+    assert not (tmp_path / "checkpoints").exists()  # noqa: S101
+
+
+def test_logging_arguments(mock_generate_documentation, tmp_path):
+    """Test that logging options configure logging before generating."""
+    log_file = tmp_path / "run.log"
+    test_args = ["script", "--log-level", "warning", "--log-file", str(log_file)]
+
+    with (
+        patch("llms_txt_action.entrypoint.configure_logging") as mock_configure,
+        patch("sys.argv", test_args),
+    ):
+        main()
+
+    mock_configure.assert_called_once_with("WARNING", str(log_file), progress=False)
+    mock_generate_documentation.assert_called_once()
+
+
+def test_invalid_log_level_from_environment(mock_generate_documentation, capsys):
+    """Test that an invalid INPUT_LOG_LEVEL is rejected like the option."""
+    with (
+        patch.dict("os.environ", {"INPUT_LOG_LEVEL": "verbose"}),
+        patch("sys.argv", ["script"]),
+        pytest.raises(SystemExit),
+    ):
+        main()
+
+    assert "invalid INPUT_LOG_LEVEL 'VERBOSE'" in capsys.readouterr().err  # noqa: S101
+    mock_generate_documentation.assert_not_called()
@@ -0,0 +1,83 @@
+"""Unit tests for the llms_txt_action.export module."""
+# ruff: noqa: S101
+
+import json
+from pathlib import Path
+
+import pytest
+
+from llms_txt_action.export import SectionExporter
+
+PAGE = """Preamble.
+
+# Guide
+
+Intro.
+
+## Install
+
+Run `pip install`.
+
+### Docker
+
+Use the image.
+
+## Configure
+
+```bash
+# not a heading
+```
+"""
+
+
+def _records(path: Path) -> list:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_export_sections(tmp_path):
+    """Test that sections carry their heading path and byte offsets."""
+    output_file = tmp_path / "llms-full.sections.jsonl"
+    page = tmp_path / "guide" / "index.md"
+
+    with SectionExporter(
+        str(output_file),
+        urls={page: "https://example.com/guide/"},
+    ) as exporter:
+        exporter.add(page, PAGE)
+        exporter.add(tmp_path / "other.md", "# Other\n")
+
+    records = _records(output_file)
+    assert [record["headings"] for record in records] == [
+        [],
+        ["Guide"],
+        ["Guide", "Install"],
+        ["Guide", "Install", "Docker"],
+        ["Guide", "Configure"],
+        ["Other"],
+    ]
+    assert {record["file"] for record in records} == {"guide/index.md", "other.md"}
+    assert records[1]["url"] == "https://example.com/guide/"
+    assert records[-1]["url"] == ""
+    data = PAGE.encode("utf-8")
+    for record in records[:5]:
+        start, end = record["offset"], record["offset"] + record["length"]
+        assert data[start:end].decode("utf-8") == record["text"]
+        assert record["tokens"] > 0
+    assert "# not a heading" in records[4]["text"]
+
+
+def test_failed_export_keeps_previous(tmp_path):
+    """Test that an interrupted export leaves the previous file in place."""
+    output_file = tmp_path / "llms-full.sections.jsonl"
+    output_file.write_text("previous\n")
+
+    def export_partial() -> None:
+        with SectionExporter(str(output_file)) as exporter:
+            exporter.add(tmp_path / "index.md", "# Index\n")
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        export_partial()
+
+    assert output_file.read_text() == "previous\n"
+    assert [path.name for path in tmp_path.iterdir()] == [output_file.name]
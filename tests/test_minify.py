@@ -0,0 +1,75 @@
+"""Unit tests for the llms_txt_action.minify module."""
+# ruff: noqa: S101
+
+import pytest
+
+from llms_txt_action.minify import MINIFY_RULES, minify_markdown, parse_rules
+
+PAGE = """# Configuration ¶
+
+See [the guide](https://example.com/guide) and [the API](#api) [¶](#api).
+
+
+
+<!-- image -->
+
+![Architecture](img/arch.png)
+
+------------------------------
+
+Read [the guide](https://example.com/guide) again.
+
+```python
+# Comment ¶
+
+
+x = "[the guide](https://example.com/guide)"
+```
+
+| Option | Default |
+|--------|---------|
+| a      | 1       |
+"""
+
+
+def test_minify_all_rules():
+    """Test that every rule applies outside code blocks only."""
+    assert minify_markdown(PAGE) == (
+        "# Configuration\n"
+        "\n"
+        "See [the guide](https://example.com/guide) and [the API](#api) .\n"
+        "\n"
+        "Architecture\n"
+        "\n"
+        "Read the guide again.\n"
+        "\n"
+        "```python\n"
+        "# Comment ¶\n"
+        "\n"
+        "\n"
+        'x = "[the guide](https://example.com/guide)"\n'
+        "```\n"
+        "\n"
+        "| Option | Default |\n"
+        "|--------|---------|\n"
+        "| a      | 1       |"
+    )
+
+
+def test_minify_selected_rules():
+    """Test that only the selected rules are applied."""
+    result = minify_markdown(PAGE, ["anchors"])
+
+    assert "¶" not in result.split("```")[0]
+    assert "<!-- image -->" in result
+    assert "------------------------------" in result
+    assert result.endswith("\n")
+
+
+def test_parse_rules():
+    """Test that rules are parsed in a stable order and validated."""
+    assert parse_rules("whitespace, anchors") == ["anchors", "whitespace"]
+    assert parse_rules("all") == list(MINIFY_RULES)
+    assert parse_rules("") == []
+    with pytest.raises(ValueError, match="Unknown minify rules"):
+        parse_rules("emoji")
@@ -0,0 +1,85 @@
+"""Unit tests for the llms_txt_action.outputs module."""
+# ruff: noqa: S101
+
+from unittest.mock import Mock
+
+import pytest
+
+from llms_txt_action.outputs import OutputWriter
+from llms_txt_action.sinks import OutputSink
+
+
+def test_write_only_changed_content(tmp_path):
+    """Test that identical content leaves the file and its mtime untouched."""
+    path = tmp_path / "nested" / "llms.txt"
+    writer = OutputWriter()
+
+    assert writer.write(path, "# Docs\n")
+    mtime = path.stat().st_mtime_ns
+    assert not writer.write(path, "# Docs\n")
+    assert path.stat().st_mtime_ns == mtime
+    assert writer.write(path, "# Docs\n\nMore\n")
+
+    assert path.read_text() == "# Docs\n\nMore\n"
+    assert (writer.written, writer.unchanged) == (2, 1)
+    assert [file.name for file in path.parent.iterdir()] == ["llms.txt"]
+
+
+def test_open_replaces_on_close(tmp_path):
+    """Test that streamed content is compared before replacing the target."""
+    path = tmp_path / "llms-full.txt"
+    path.write_text("old")
+    writer = OutputWriter()
+
+    with writer.open(path) as file:
+        file.write("new")
+    with writer.open(path) as file:
+        file.write("new")
+
+    assert path.read_text() == "new"
+    assert (writer.written, writer.unchanged) == (1, 1)
+
+
+def test_failed_write_keeps_target(tmp_path):
+    """Test that an exception while writing leaves the previous file intact."""
+    path = tmp_path / "llms-full.txt"
+    path.write_text("old")
+
+    def write_partial() -> None:
+        with OutputWriter().open(path) as file:
+            file.write("partial")
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        write_partial()
+
+    assert path.read_text() == "old"
+    assert [file.name for file in tmp_path.iterdir()] == ["llms-full.txt"]
+
+
+def test_new_files_follow_umask(tmp_path):
+    """Test that files are not left with the private mode of temporary files."""
+    path = tmp_path / "llms.txt"
+    reference = tmp_path / "reference.txt"
+    reference.write_text("")
+
+    OutputWriter().write(path, "# Docs\n")
+
+    assert path.stat().st_mode == reference.stat().st_mode
+
+
+def test_outputs_are_published_to_the_sink(tmp_path):
+    """Test that every output in place, changed or not, reaches the sink."""
+    sink = Mock(spec=OutputSink)
+    writer = OutputWriter(sink)
+
+    writer.write(tmp_path / "llms.txt", "# Docs\n")
+    writer.write(tmp_path / "llms.txt", "# Docs\n")
+    with writer.open(tmp_path / "llms-full.txt") as file:
+        file.write("Full")
+
+    assert [call.args[0].name for call in sink.put.call_args_list] == [
+        "llms.txt",
+        "llms.txt",
+        "llms-full.txt",
+    ]
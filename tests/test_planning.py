@@ -0,0 +1,143 @@
+"""Unit tests for the llms_txt_action.planning module."""
+# ruff: noqa: S101
+
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from llms_txt_action.checkpoint import CheckpointJournal
+from llms_txt_action.planning import (
+    ASSUMED_COMPLETION_TOKENS,
+    ASSUMED_SECONDS_PER_REQUEST,
+    count_prompt_tokens,
+    format_plan,
+    plan_summaries,
+)
+
+
+@pytest.fixture
+def docs_dir(tmp_path):
+    """Create a site with one converted and one unconverted page."""
+    (tmp_path / "sitemap.xml").write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url><loc>https://example.com/</loc></url>
+            <url><loc>https://example.com/guide.html</loc></url>
+            <url><loc>https://example.com/missing.html</loc></url>
+        </urlset>
+        """,
+    )
+    (tmp_path / "index.md").write_text("# Welcome\n\nShort page.")
+    (tmp_path / "guide.html").write_text(
+        "<html><body><h1>Guide</h1><p>" + "word " * 400 + "</p></body></html>",
+    )
+    return tmp_path
+
+
+def test_count_prompt_tokens_grows_with_content():
+    """Test that prompt tokens are counted for the whole summary prompt."""
+    short = count_prompt_tokens("hello", "gpt-4o")
+    long = count_prompt_tokens("hello " * 100, "gpt-4o")
+
+    assert short > 1
+    assert long > short + 90
+
+
+def test_plan_summaries_without_network(docs_dir):
+    """Test that a plan is built from local pages without calling the model."""
+    with (
+        patch.dict("os.environ", {"MODEL_API_KEY": "."}),
+        patch("llms_txt_action.utils.completion") as mock_completion,
+    ):
+        plan = plan_summaries(str(docs_dir), "sitemap.xml", "gpt-4o", "llm", 2)
+
+    mock_completion.assert_not_called()
+    assert plan["pages"] == 2  # noqa: PLR2004
+    assert plan["requests"] == 2  # noqa: PLR2004
+    assert plan["completion_tokens"] == 2 * ASSUMED_COMPLETION_TOKENS
+    assert plan["seconds"] == ASSUMED_SECONDS_PER_REQUEST
+    assert plan["cost"] > 0
+    largest_tokens, largest_loc = plan["largest_pages"][0]
+    assert largest_loc == "https://example.com/guide.html"
+    assert largest_tokens > 400  # noqa: PLR2004
+    assert "model requests:    2" in format_plan(plan)
+
+
+def test_plan_summaries_without_model(docs_dir):
+    """Test that no requests are planned without an API key."""
+    with patch.dict("os.environ", clear=True):
+        plan = plan_summaries(str(docs_dir), "sitemap.xml", "gpt-4o")
+
+    assert plan["requests"] == 0
+    assert plan["summarizer"] == "llm (no model)"
+
+
+def test_plan_summaries_unknown_model_cost(docs_dir):
+    """Test that a model without local pricing has an unknown cost."""
+    with patch.dict("os.environ", {"MODEL_API_KEY": "."}):
+        plan = plan_summaries(str(docs_dir), "sitemap.xml", "not-a-real-model")
+
+    assert plan["cost"] is None
+    assert "cost:              unknown" in format_plan(plan)
+
+
+def test_plan_summaries_skips_recovered_summaries(docs_dir, tmp_path):
+    """Test that summaries in the checkpoint journal are not planned again."""
+    journal_file = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal(journal_file, "settings")
+    journal.record_summary("# Welcome\n\nShort page.", "Welcome page")
+    journal.close()
+    size = journal_file.stat().st_size
+
+    with patch.dict("os.environ", {"MODEL_API_KEY": "."}):
+        plan = plan_summaries(
+            str(docs_dir),
+            "sitemap.xml",
+            "gpt-4o",
+            journal=CheckpointJournal(journal_file, "settings"),
+        )
+
+    assert (plan["pages"], plan["recovered"], plan["requests"]) == (2, 1, 1)
+    assert "recovered:         1 summaries from checkpoint" in format_plan(plan)
+    assert journal_file.stat().st_size == size
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [{"max_llm_calls": 1}, {"max_tokens": 100}, {"time_budget": 1}],
+)
+def test_plan_summaries_stops_at_the_budget(docs_dir, limits):
+    """Test that pages over the budget are projected to use their heading."""
+    with patch.dict("os.environ", {"MODEL_API_KEY": "."}):
+        plan = plan_summaries(str(docs_dir), "sitemap.xml", "gpt-4o", **limits)
+
+    assert (plan["requests"], plan["over_budget"]) == (1, 1)
+    assert plan["largest_pages"][0][1] == "https://example.com/"
+    assert plan["completion_tokens"] == ASSUMED_COMPLETION_TOKENS
+    assert plan["seconds"] == ASSUMED_SECONDS_PER_REQUEST
+    assert "over budget:       1 pages use their heading" in format_plan(plan)
+
+
+def test_litellm_uses_the_bundled_cost_map():
+    """Test that importing the package keeps litellm off the network."""
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key != "LITELLM_LOCAL_MODEL_COST_MAP"
+    }
+    script = (
+        "import llms_txt_action.planning, os;"
+        "print(os.environ['LITELLM_LOCAL_MODEL_COST_MAP'])"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    assert result.stdout.strip() == "True"
+    assert "model cost map" not in result.stderr
@@ -0,0 +1,83 @@
+"""Unit tests for the llms_txt_action.progress module."""
+# ruff: noqa: S101
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llms_txt_action import progress
+from llms_txt_action.progress import configure_logging, track
+
+
+@pytest.fixture(autouse=True)
+def _restore_logging():
+    """Restore the logging configuration and progress setting after a test."""
+    root = logging.getLogger()
+    package = logging.getLogger("llms_txt_action")
+    handlers, level, package_level = root.handlers[:], root.level, package.level
+    settings = dict(progress._settings)  # noqa: SLF001
+    yield
+    for handler in root.handlers:
+        if handler not in handlers:
+            handler.close()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    package.setLevel(package_level)
+    progress._settings.update(settings)  # noqa: SLF001
+
+
+def test_log_file_receives_details(tmp_path, capsys):
+    """Test that per-page details reach the log file but not the console."""
+    log_file = tmp_path / "run.log"
+    configure_logging("WARNING", str(log_file))
+
+    logging.getLogger("llms_txt_action.utils").debug("Converted page.html")
+    logging.getLogger("llms_txt_action.utils").warning("Slow page.html")
+    logging.getLogger("urllib3").debug("Connection detail")
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+    content = log_file.read_text()
+    assert "DEBUG llms_txt_action.utils: Converted page.html" in content
+    assert "WARNING llms_txt_action.utils: Slow page.html" in content
+    assert "Connection detail" not in content
+    console = capsys.readouterr().err
+    assert "Slow page.html" in console
+    assert "Converted page.html" not in console
+
+
+def test_track_without_progress():
+    """Test that items are passed through unchanged."""
+    configure_logging()
+
+    assert list(track(iter(range(3)), "Converting pages")) == [0, 1, 2]
+
+
+def test_track_with_progress():
+    """Test that a progress bar does not change the items."""
+    configure_logging(progress=True)
+
+    assert list(track(iter(range(3)), "Converting pages", 3)) == [0, 1, 2]
+    assert list(track(iter(range(2)), "Converting pages")) == [0, 1]
+
+
+def test_concurrent_tracks_share_one_display():
+    """Test that trackers in several threads share the live display."""
+    configure_logging(progress=True)
+    barrier = threading.Barrier(2)
+
+    def items():
+        barrier.wait(timeout=5)
+        yield from range(3)
+        barrier.wait(timeout=5)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = [
+            executor.submit(lambda: list(track(items(), "Converting pages", 3)))
+            for _ in range(2)
+        ]
+
+    assert [result.result() for result in results] == [[0, 1, 2], [0, 1, 2]]
+    assert progress._shared == {"display": None, "users": 0}  # noqa: SLF001
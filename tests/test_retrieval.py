@@ -0,0 +1,88 @@
+"""Unit tests for the llms_txt_action.retrieval module."""
+# ruff: noqa: S101
+
+import json
+
+import numpy as np
+import pytest
+
+from llms_txt_action.outputs import OutputWriter
+from llms_txt_action.retrieval import build_retrieval_index, search
+
+
+@pytest.fixture
+def pages(tmp_path):
+    """Two converted pages with several sections each."""
+    install = tmp_path / "install.md"
+    install.write_text(
+        "# Install\n\nInstall the package with pip.\n\n"
+        "## Docker\n\nRun the action in a Docker container.\n",
+    )
+    config = tmp_path / "config.md"
+    config.write_text(
+        "# Configuration\n\nSet the model name and the API key.\n\n"
+        "```python\n# not a heading\nmodel = 'gpt-4o'\n```\n",
+    )
+    return [install, config]
+
+
+def test_build_retrieval_index(tmp_path, pages):
+    """Test that sections are chunked and stored as a sparse column matrix."""
+    index_dir = tmp_path / "llms-full.retrieval"
+    urls = {pages[0]: "https://example.com/install/"}
+
+    stats = build_retrieval_index(pages, str(index_dir), urls=urls, features=1024)
+
+    assert stats["chunks"] == 3  # noqa: PLR2004
+    chunks = [
+        json.loads(line)
+        for line in (index_dir / "chunks.jsonl").read_text().splitlines()
+    ]
+    assert [(chunk["path"], chunk["heading"]) for chunk in chunks] == [
+        ("install.md", "Install"),
+        ("install.md", "Docker"),
+        ("config.md", "Configuration"),
+    ]
+    assert chunks[1]["url"] == "https://example.com/install/"
+    assert "# not a heading" in chunks[2]["text"]
+
+    indptr = np.load(index_dir / "indptr.npy", mmap_mode="r")
+    indices = np.load(index_dir / "indices.npy", mmap_mode="r")
+    data = np.load(index_dir / "data.npy", mmap_mode="r")
+    assert indptr.shape == (1025,)
+    assert indptr[-1] == len(indices) == len(data) == stats["nonzeros"]
+    # Every chunk vector has unit length.
+    norms = np.bincount(indices, weights=np.square(data), minlength=3)
+    assert np.allclose(norms, 1.0)
+    assert json.loads((index_dir / "meta.json").read_text())["features"] == 1024  # noqa: PLR2004
+
+
+def test_search(tmp_path, pages):
+    """Test that queries return the most similar sections first."""
+    index_dir = tmp_path / "index"
+    build_retrieval_index(pages, str(index_dir))
+
+    results = search(str(index_dir), "docker container", top_k=2)
+
+    assert len(results) == 1
+    score, chunk = results[0]
+    assert chunk["heading"] == "Docker"
+    assert 0 < score <= 1
+    results = search(str(index_dir), "install the model")
+    assert [chunk["heading"] for _, chunk in results][:2] == [
+        "Install",
+        "Configuration",
+    ]
+    assert results[0][0] >= results[1][0]
+    assert search(str(index_dir), "?") == []
+
+
+def test_unchanged_index_is_not_rewritten(tmp_path, pages):
+    """Test that rebuilding an identical index leaves every file untouched."""
+    index_dir = tmp_path / "index"
+    build_retrieval_index(pages, str(index_dir))
+    writer = OutputWriter()
+
+    build_retrieval_index(pages, str(index_dir), writer=writer)
+
+    assert (writer.written, writer.unchanged) == (0, 6)
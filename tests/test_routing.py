@@ -0,0 +1,58 @@
+"""Unit tests for the llms_txt_action.routing module."""
+# ruff: noqa: S101
+
+from llms_txt_action.routing import ModelRouter, parse_models
+
+
+def test_route_default_model_first():
+    """Test that pages use the cheap model, then fall back in order."""
+    router = ModelRouter("mini", "large", fallback_models=["other", "mini"])
+
+    assert router.route(10_000, 1.0) == ["mini", "large", "other"]
+    assert not router.counts_tokens
+
+
+def test_route_escalates_long_and_important_pages():
+    """Test that long or high-priority pages start with the stronger model."""
+    router = ModelRouter("mini", "large", escalation_tokens=1000)
+    assert router.counts_tokens
+    assert router.route(999, 1.0) == ["mini", "large"]
+    assert router.route(1000) == ["large", "mini"]
+
+    router = ModelRouter("mini", "large", escalation_priority=0.8)
+    assert router.route(10_000, 0.5) == ["mini", "large"]
+    assert router.route(0, 0.8) == ["large", "mini"]
+    assert router.route(0) == ["mini", "large"]
+
+
+def test_record_and_log_stats(caplog):
+    """Test that latency, tokens and errors are accumulated per model."""
+    caplog.set_level("INFO")
+    router = ModelRouter("mini")
+    router.record("mini", 1.0, 100)
+    router.record("mini", 3.0, 50)
+    router.record("large", 0.5, failed=True)
+
+    router.log_stats()
+
+    assert router.stats["mini"] == {
+        "calls": 2,
+        "errors": 0,
+        "tokens": 150,
+        "seconds": 4.0,
+    }
+    assert "Model mini: 2 calls, 0 errors, 150 tokens, 2.00s mean latency" in (
+        caplog.messages
+    )
+    assert "Model large: 1 calls, 1 errors, 0 tokens, 0.50s mean latency" in (
+        caplog.messages
+    )
+
+
+def test_parse_models():
+    """Test that model lists are split on commas."""
+    assert parse_models("gpt-4o-mini, claude-3-haiku ,") == [
+        "gpt-4o-mini",
+        "claude-3-haiku",
+    ]
+    assert parse_models("") == []
@@ -0,0 +1,92 @@
+"""Unit tests for the llms_txt_action.sharding module."""
+# ruff: noqa: S101, PLR2004
+
+import json
+
+from llms_txt_action.sharding import split_sections, write_shards
+from llms_txt_action.utils import concatenate_markdown_files
+
+INSTALL_PAGE = """# Install ¶
+
+Install the package.
+
+```bash
+# not a heading
+pip install llms-txt
+```
+
+## Upgrade
+
+Upgrade the package.
+"""
+
+USAGE_PAGE = "# Usage\n\nRun the action on your site. Ünïcode is counted in bytes.\n"
+
+
+def test_split_sections():
+    """Test that pages are split at headings outside of code blocks."""
+    sections = split_sections("Intro\n" + INSTALL_PAGE)
+
+    assert [(heading, level) for heading, level, _ in sections] == [
+        ("", 0),
+        ("Install", 1),
+        ("Upgrade", 2),
+    ]
+    assert "# not a heading" in sections[1][2]
+    assert "".join(text for _, _, text in sections) == "Intro\n" + INSTALL_PAGE
+
+
+def test_write_shards_index_locates_sections(tmp_path):
+    """Test that every index entry points at its section's bytes."""
+    install = tmp_path / "install.md"
+    install.write_text(INSTALL_PAGE, encoding="utf-8")
+    usage = tmp_path / "guide" / "usage.md"
+    usage.parent.mkdir()
+    usage.write_text(USAGE_PAGE, encoding="utf-8")
+
+    shards, index_file = write_shards(
+        [install, usage],
+        str(tmp_path / "llms-full.txt"),
+        max_shard_bytes=80,
+        urls={usage: "https://example.com/guide/usage/"},
+    )
+
+    entries = [json.loads(line) for line in index_file.read_text().splitlines()]
+    assert index_file.name == "llms-full.index.jsonl"
+    assert [shard.name for shard in shards] == [
+        "llms-full-0000.txt",
+        "llms-full-0001.txt",
+        "llms-full-0002.txt",
+    ]
+    assert [(entry["path"], entry["heading"]) for entry in entries] == [
+        ("install.md", "Install"),
+        ("install.md", "Upgrade"),
+        ("guide/usage.md", "Usage"),
+    ]
+    assert entries[2]["url"] == "https://example.com/guide/usage/"
+    for entry, (_, _, text) in zip(  # noqa: B905
+        entries,
+        split_sections(INSTALL_PAGE) + split_sections(USAGE_PAGE),
+    ):
+        data = (tmp_path / entry["shard"]).read_bytes()
+        section = data[entry["offset"] : entry["offset"] + entry["length"]]
+        assert section.decode("utf-8") == text
+        assert entry["tokens"] > 0
+
+
+def test_write_shards_matches_concatenation(tmp_path):
+    """Test that the shards joined together equal the unsharded output."""
+    pages = []
+    for number in range(5):
+        page = tmp_path / f"page{number}.md"
+        page.write_text(INSTALL_PAGE + USAGE_PAGE, encoding="utf-8")
+        pages.append(page)
+
+    shards, _ = write_shards(pages, str(tmp_path / "llms-full.txt"), 256)
+    concatenate_markdown_files(pages, tmp_path / "expected.txt")
+
+    assert len(shards) > 1
+    assert all(shard.stat().st_size <= 256 for shard in shards)
+    assert b"".join(shard.read_bytes() for shard in shards) == (
+        (tmp_path / "expected.txt").read_bytes()
+    )
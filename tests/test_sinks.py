@@ -0,0 +1,138 @@
+"""Unit tests for the llms_txt_action.sinks module."""
+# ruff: noqa: S101
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from llms_txt_action.entrypoint import generate_documentation
+from llms_txt_action.sinks import OutputSink, S3Sink, _etag, open_sink
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+BUCKET = "docs"
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    """Return a client of an in-memory S3 with an empty bucket."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    """Create a small page and an llms-full.txt large enough for multipart."""
+    (tmp_path / "guide").mkdir()
+    (tmp_path / "guide" / "index.md").write_text("# Guide\n")
+    (tmp_path / "llms-full.txt").write_bytes(b"x" * (2 * PART_SIZE + 1024))
+    return tmp_path
+
+
+def _upload(outputs, **options):
+    with S3Sink(
+        f"s3://{BUCKET}/site",
+        str(outputs),
+        multipart_threshold=PART_SIZE,
+        part_size=PART_SIZE,
+        **options,
+    ) as sink:
+        sink.put(outputs / "guide" / "index.md")
+        sink.put(outputs / "llms-full.txt")
+    return sink
+
+
+def test_s3_sink_uploads_in_parts(s3_client, outputs):
+    """Test that outputs are uploaded under the prefix, large ones in parts."""
+    sink = _upload(outputs)
+
+    page = s3_client.get_object(Bucket=BUCKET, Key="site/guide/index.md")
+    assert page["Body"].read() == b"# Guide\n"
+    assert page["ContentType"] == "text/markdown; charset=utf-8"
+    full = s3_client.head_object(Bucket=BUCKET, Key="site/llms-full.txt")
+    assert full["ETag"].strip('"') == _etag(
+        outputs / "llms-full.txt",
+        PART_SIZE,
+        PART_SIZE,
+    )
+    assert full["ETag"].endswith('-3"')
+    assert sink.stats["uploaded"] == 2  # noqa: PLR2004
+
+
+def test_s3_sink_skips_unchanged_objects(s3_client, outputs):
+    """Test that objects with the same ETag are not uploaded again."""
+    _upload(outputs)
+    (outputs / "guide" / "index.md").write_text("# Guide, edited\n")
+
+    sink = _upload(outputs)
+
+    assert (sink.stats["uploaded"], sink.stats["unchanged"]) == (1, 1)
+    page = s3_client.get_object(Bucket=BUCKET, Key="site/guide/index.md")
+    assert page["Body"].read() == b"# Guide, edited\n"
+
+
+class _BrokenUploads:
+    """Client listing an empty bucket whose uploads fail."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_paginator(self, name):
+        return self.client.get_paginator(name)
+
+    def upload_file(self, *_args, **_kwargs):
+        msg = "connection reset"
+        raise ConnectionError(msg)
+
+
+def test_s3_sink_reports_failed_uploads(s3_client, outputs):
+    """Test that a failed upload fails the sink once every upload is done."""
+    sink = S3Sink(f"s3://{BUCKET}", str(outputs), client=_BrokenUploads(s3_client))
+    sink.put(outputs / "guide" / "index.md")
+    sink.put(outputs / "llms-full.txt")
+
+    with pytest.raises(RuntimeError, match="Failed to upload 2 outputs"):
+        sink.close()
+
+
+def test_open_sink_schemes(tmp_path):
+    """Test that the sink is picked from the scheme of the output URL."""
+    assert type(open_sink("", str(tmp_path))) is OutputSink
+    with pytest.raises(ValueError, match="Unknown output URL"):
+        open_sink("ftp://example.com/docs", str(tmp_path))
+
+
+def test_generate_documentation_uploads_outputs(s3_client, tmp_path):
+    """Test that generated outputs are uploaded, pages only when kept."""
+    (tmp_path / "index.html").write_text("<h1>Index</h1>")
+
+    with (
+        patch.dict(os.environ, {"MODEL_API_KEY": ""}),
+        patch("llms_txt_action.utils.html_to_markdown", return_value="# Index"),
+    ):
+        generate_documentation(
+            docs_dir=str(tmp_path),
+            sitemap_path="sitemap.xml",
+            skip_md_files=True,
+            skip_llms_txt=True,
+            skip_llms_full_txt=False,
+            llms_txt_name="llms.txt",
+            llms_full_txt_name="llms-full.txt",
+            model_name="gpt-4o",
+            precompress="gz",
+            output_url=f"s3://{BUCKET}/docs/",
+        )
+
+    listing = s3_client.list_objects_v2(Bucket=BUCKET)
+    assert sorted(item["Key"] for item in listing["Contents"]) == [
+        "docs/llms-full.txt",
+        "docs/llms-full.txt.gz",
+    ]
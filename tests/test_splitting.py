@@ -0,0 +1,82 @@
+"""Unit tests for the llms_txt_action.splitting module."""
+# ruff: noqa: S101, PLR2004
+
+from llms_txt_action.splitting import split_html
+from llms_txt_action.utils import html_to_markdown
+
+PAGE = (
+    "<html><head><title>API</title></head><body>"
+    "<nav>Menu</nav>"
+    '<div class="section"><h1>API</h1><p>Intro</p>'
+    '<div class="section"><h2>First</h2><p>One<br>line</p></div>'
+    '<div class="section"><h2>Second</h2><table><tr><td><h2>Cell</h2></td></tr>'
+    "</table></div>"
+    '<div class="section"><h2>Third</h2><ul><li>Item</li></ul></div>'
+    "</div></body></html>"
+)
+
+
+def test_split_html_single_section_when_small():
+    """Test that a page below the threshold is returned whole."""
+    assert split_html(PAGE, len(PAGE)) == [PAGE]
+
+
+def test_split_html_reopens_enclosing_tags():
+    """Test that every section is wrapped in the tags open at its start."""
+    sections = split_html(PAGE, 1)
+
+    assert len(sections) == 4
+    assert sections[0].startswith("<html><head><title>API</title>")
+    assert sections[0].endswith("<p>Intro</p></div></body></html>")
+    assert sections[1] == (
+        '<html><body><div class="section"><div class="section"><h2>First</h2>'
+        "<p>One<br>line</p></div></div></body></html>"
+    )
+    assert "<h2>Cell</h2>" in sections[2]
+    assert sections[3].startswith('<html><body><div class="section">')
+    assert sections[3].endswith("</ul></div></div></body></html>")
+
+
+def test_split_html_keeps_preamble_with_first_heading():
+    """Test that content before the first heading is not split off."""
+    html = "<body><p>Preamble</p><h2>One</h2><p>A</p><h2>Two</h2></body>"
+    sections = split_html(html, 1)
+
+    assert sections[0] == "<body><p>Preamble</p><h2>One</h2><p>A</p></body>"
+    assert sections[1] == "<body><h2>Two</h2></body>"
+
+
+def test_split_html_tracks_multiline_offsets():
+    """Test that cut points are correct across lines."""
+    html = "<body>\n<h1>One</h1>\n<p>A</p>\n<h1>Two</h1>\n<p>B</p>\n</body>"
+    sections = split_html(html, 1)
+
+    assert sections == [
+        "<body>\n<h1>One</h1>\n<p>A</p>\n</body>",
+        "<body><h1>Two</h1>\n<p>B</p>\n</body>",
+    ]
+
+
+def test_split_html_measures_encoded_bytes():
+    """Test that the threshold counts UTF-8 bytes, not characters."""
+    html = "<body><h1>One</h1><p>日本語</p><h1>Two</h1><p>B</p></body>"
+    first = html[: html.index("<h1>Two</h1>")]
+
+    assert len(first) < len(first.encode()) - 2
+    assert len(split_html(html, len(first) + 2)) == 2
+    assert len(split_html(html, len(first.encode()) + 1)) == 1
+
+
+def test_split_sections_convert_like_whole_page(tmp_path):
+    """Test that stitched section markdown matches a whole-page conversion."""
+    page = tmp_path / "page.html"
+    page.write_text(PAGE)
+    whole = html_to_markdown(page)
+
+    parts = []
+    for index, section in enumerate(split_html(PAGE, 1)):
+        section_file = tmp_path / f"section-{index}.html"
+        section_file.write_text(section)
+        parts.append(html_to_markdown(section_file))
+
+    assert "\n\n".join(parts) == whole
@@ -0,0 +1,58 @@
+"""Unit tests for the llms_txt_action.summarizers module."""
+# ruff: noqa: S101
+
+from llms_txt_action.summarizers import extractive_summaries
+
+AZURE_PAGE = """# Azure Configuration ¶
+
+Configure the action to publish documentation to Azure Blob Storage.
+You need a storage account and a [service principal](https://example.com/sp).
+
+```bash
+az storage account create --name docs --resource-group docs-group
+```
+
+| Setting | Description |
+|---------|-------------|
+| account | Storage account name |
+"""
+
+AWS_PAGE = """# AWS Configuration
+
+- Create an S3 bucket that hosts the documentation website.
+- Attach a CloudFront distribution to the S3 bucket for caching.
+"""
+
+
+def test_extractive_summaries_one_per_page():
+    """Test that every page gets one summary in order."""
+    summaries = extractive_summaries([AZURE_PAGE, AWS_PAGE])
+
+    assert len(summaries) == 2  # noqa: PLR2004
+    assert "Azure" in summaries[0]
+    assert "S3 bucket" in summaries[1]
+
+
+def test_extractive_summaries_skip_code_tables_and_markup():
+    """Test that code, tables, headings and link targets are not summaries."""
+    summary = extractive_summaries([AZURE_PAGE])[0]
+
+    assert "az storage" not in summary
+    assert "|" not in summary
+    assert "#" not in summary
+    assert "https://" not in summary
+
+
+def test_extractive_summaries_empty_for_pages_without_prose():
+    """Test that pages without sentences get an empty summary."""
+    assert extractive_summaries(["# Title", "", "Too short."]) == ["", "", ""]
+
+
+def test_extractive_summaries_shortens_long_sentences():
+    """Test that summaries stay on one short line."""
+    page = "This sentence keeps going " + "and going " * 60 + "until it ends."
+
+    summary = extractive_summaries([page])[0]
+
+    assert len(summary) <= 203  # noqa: PLR2004
+    assert summary.endswith("...")
@@ -1,12 +1,19 @@
 """Unit tests for the llms_txt_action.utils module."""
 # ruff: noqa: S101, S314, E501
 
+import io
+import tarfile
 import xml.etree.ElementTree as ET
+import zipfile
 from unittest.mock import Mock, patch
 
+import litellm
 import pytest
 from docling.datamodel.base_models import ConversionStatus
 
+from llms_txt_action.checkpoint import CheckpointJournal
+from llms_txt_action.outputs import OutputWriter
+from llms_txt_action.sinks import OutputSink
 from llms_txt_action.utils import (
     _convert_url_to_file_path,
     _extract_heading,
@@ -16,6 +23,8 @@ from llms_txt_action.utils import (
     generate_summary,
     html_folder_to_markdown,
     html_to_markdown,
+    simple_html_to_markdown,
+    summarize_pages,
 )
 
 
@@ -84,6 +93,18 @@ def test_html_to_markdown_success(sample_html_file):
         assert result == markdown_content
 
 
+def test_html_to_markdown_keeps_leading_heading(sample_html_file):
+    """Test that a document starting with a heading keeps its first section."""
+    with patch("llms_txt_action.utils.DocumentConverter") as mock_converter_cls:
+        mock_result = Mock()
+        mock_result.status = ConversionStatus.SUCCESS
+        markdown_content = "# Title\n\nIntro\n\n## Sub\n\nMore"
+        mock_result.document.export_to_markdown.return_value = markdown_content
+        mock_converter_cls.return_value.convert.return_value = mock_result
+
+        assert html_to_markdown(sample_html_file) == markdown_content
+
+
 # Tests for convert_html_to_markdown
 def test_convert_html_to_markdown_success(tmp_path, sample_html_file):
     """Test HTML to markdown conversion success."""
@@ -124,6 +145,234 @@ def test_convert_html_to_markdown_handles_conversion_failure(
         assert len(result) == 0
 
 
+def test_convert_html_to_markdown_keeps_unchanged_files(tmp_path, sample_html_file):
+    """Test that a rerun with identical output does not touch markdown files."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    sample_html_file.rename(input_dir / "test.html")
+
+    with patch("llms_txt_action.utils.html_to_markdown", return_value="# Same"):
+        (markdown_file,) = html_folder_to_markdown(str(input_dir))
+        mtime = markdown_file.stat().st_mtime_ns
+        writer = OutputWriter()
+        html_folder_to_markdown(str(input_dir), writer=writer)
+
+    assert markdown_file.stat().st_mtime_ns == mtime
+    assert (writer.written, writer.unchanged) == (0, 1)
+
+
+def test_convert_html_to_markdown_resumes_from_journal(tmp_path, sample_html_file):
+    """Test that pages converted by an interrupted run are not converted again."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    sample_html_file.rename(input_dir / "test.html")
+    (input_dir / "other.html").write_text("<h1>Other</h1>")
+    journal_file = tmp_path / "journal.jsonl"
+
+    with patch("llms_txt_action.utils.html_to_markdown", return_value="# Page"):
+        first = html_folder_to_markdown(
+            str(input_dir),
+            journal=CheckpointJournal(journal_file, "settings"),
+        )
+    (input_dir / "other.html").write_text("<h1>Other, edited</h1>")
+
+    journal = CheckpointJournal(journal_file, "settings")
+    with patch(
+        "llms_txt_action.utils.html_to_markdown",
+        return_value="# Edited",
+    ) as mock_converter:
+        resumed = html_folder_to_markdown(str(input_dir), journal=journal)
+
+    assert resumed == first
+    mock_converter.assert_called_once_with(input_dir / "other.html")
+    assert (input_dir / "test.md").read_text() == "# Page"
+    assert (input_dir / "other.md").read_text() == "# Edited"
+    assert journal.recovered["pages"] == 1
+
+
+def test_recovered_pages_are_published(tmp_path, sample_html_file):
+    """Test that pages recovered from the journal still reach the sink."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    sample_html_file.rename(input_dir / "test.html")
+    journal_file = tmp_path / "journal.jsonl"
+    with patch("llms_txt_action.utils.html_to_markdown", return_value="# Page"):
+        html_folder_to_markdown(
+            str(input_dir),
+            journal=CheckpointJournal(journal_file, "settings"),
+        )
+
+    sink = Mock(spec=OutputSink)
+    writer = OutputWriter(sink)
+    with patch("llms_txt_action.utils.html_to_markdown") as mock_converter:
+        html_folder_to_markdown(
+            str(input_dir),
+            journal=CheckpointJournal(journal_file, "settings"),
+            writer=writer,
+        )
+
+    mock_converter.assert_not_called()
+    sink.put.assert_called_once_with(input_dir / "test.md")
+    assert (writer.written, writer.unchanged) == (0, 1)
+
+
+def test_convert_html_to_markdown_minifies(tmp_path, sample_html_file, caplog):
+    """Test that pages are minified and the savings are logged."""
+    caplog.set_level("INFO")
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    sample_html_file.rename(input_dir / "test.html")
+
+    with patch(
+        "llms_txt_action.utils.html_to_markdown",
+        return_value="# Title ¶\n\n\n\n<!-- image -->\n\nText",
+    ):
+        (markdown_file,) = html_folder_to_markdown(
+            str(input_dir),
+            minify_rules=["anchors", "images", "whitespace"],
+        )
+
+    assert markdown_file.read_text() == "# Title\n\nText"
+    assert any(
+        message.startswith("Minified markdown: 34 -> 13 bytes")
+        for message in caplog.messages
+    )
+
+
+def test_convert_html_to_markdown_fallback(tmp_path, sample_html_file):
+    """Test that failed pages use the basic converter when enabled."""
+    with patch("llms_txt_action.utils.html_to_markdown") as mock_converter:
+        mock_converter.side_effect = Exception("Conversion failed")
+
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        sample_html_file.rename(input_dir / "test.html")
+
+        result = html_folder_to_markdown(str(input_dir), fallback=True)
+        assert len(result) == 1
+        assert result[0].read_text() == "# First Heading\n\nTest content"
+
+
+def test_convert_html_to_markdown_uses_worker_pool(tmp_path, sample_html_file):
+    """Test that a page timeout routes conversions through the worker pool."""
+    with patch("llms_txt_action.utils.WorkerPool") as mock_pool_cls:
+        mock_pool = mock_pool_cls.return_value
+        mock_pool.convert.return_value = "# Converted content"
+        mock_pool.restarts = 0
+
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        sample_html_file.rename(input_dir / "test.html")
+
+        result = html_folder_to_markdown(str(input_dir), page_timeout=5)
+        assert len(result) == 1
+        assert result[0].read_text() == "# Converted content"
+        mock_pool.convert.assert_called_once_with(input_dir / "test.html")
+
+
+def test_convert_html_to_markdown_splits_large_pages(tmp_path):
+    """Test that oversized pages are converted section by section in order."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    html_file = input_dir / "api.html"
+    html_file.write_text(
+        "<body><h1>A</h1><p>"
+        + "a" * 50
+        + "</p><h1>B</h1><p>"
+        + "b" * 50
+        + "</p><h1>C</h1></body>",
+    )
+
+    def convert(section_file):
+        text = section_file.read_text()
+        return "\n\n".join(f"# {name}" for name in "ABC" if f"<h1>{name}" in text)
+
+    with patch("llms_txt_action.utils.html_to_markdown", side_effect=convert) as mock:
+        result = html_folder_to_markdown(str(input_dir), split_threshold=40)
+
+    assert mock.call_count == 3  # noqa: PLR2004
+    assert result[0].read_text() == "# A\n\n# B\n\n# C"
+
+
+def test_convert_html_archive_to_markdown(tmp_path, sample_html_content):
+    """Test that pages are streamed from an archive and fall back when needed."""
+    archive = tmp_path / "site.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar_file:
+        for name in ("index.html", "guide/broken.html"):
+            data = sample_html_content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar_file.addfile(info, io.BytesIO(data))
+
+    def convert(source):
+        if source.name == "guide/broken.html":
+            msg = "Conversion failed"
+            raise RuntimeError(msg)
+        return "# Converted content"
+
+    output_dir = tmp_path / "out"
+    with patch("llms_txt_action.utils.html_to_markdown", side_effect=convert):
+        result = html_folder_to_markdown(
+            str(archive),
+            output_dir=str(output_dir),
+            fallback=True,
+        )
+
+    assert sorted(result) == [
+        output_dir / "guide" / "broken.md",
+        output_dir / "index.md",
+    ]
+    assert (output_dir / "index.md").read_text() == "# Converted content"
+    assert (output_dir / "guide" / "broken.md").read_text() == (
+        "# First Heading\n\nTest content"
+    )
+
+
+def test_convert_html_archive_stays_in_output_dir(tmp_path, sample_html_content):
+    """Test that archive pages resolving outside the output dir are skipped."""
+    archive = tmp_path / "site.tar"
+    with tarfile.open(archive, "w") as tar_file:
+        for name in ("index.html", "../escape.html", "linked/page.html"):
+            data = sample_html_content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar_file.addfile(info, io.BytesIO(data))
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    (tmp_path / "elsewhere").mkdir()
+    (output_dir / "linked").symlink_to(tmp_path / "elsewhere")
+
+    with patch("llms_txt_action.utils.html_to_markdown", return_value="# Page"):
+        result = html_folder_to_markdown(str(archive), output_dir=str(output_dir))
+
+    assert result == [output_dir / "index.md"]
+    assert not (tmp_path / "escape.md").exists()
+    assert not (tmp_path / "elsewhere" / "page.md").exists()
+
+
+def test_convert_html_archive_requires_output_dir(tmp_path, sample_html_file):
+    """Test that converting an archive without an output directory fails."""
+    archive = tmp_path / "site.zip"
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.write(sample_html_file, "test.html")
+
+    with pytest.raises(ValueError, match="An output directory is required"):
+        html_folder_to_markdown(str(archive))
+
+
+def test_simple_html_to_markdown(tmp_path):
+    """Test the basic converter keeps headings, lists and text."""
+    html_file = tmp_path / "page.html"
+    html_file.write_text(
+        "<html><head><title>T</title><script>x()</script></head><body>"
+        "<nav>Menu</nav><h1>Title</h1><p>Some   text.</p>"
+        "<ul><li>One</li><li>Two</li></ul><h2>Sub</h2><p>More</p></body></html>",
+    )
+    assert simple_html_to_markdown(html_file) == (
+        "# Title\n\nSome text.\n\n- One\n\n- Two\n\n## Sub\n\nMore"
+    )
+
+
 # Tests for summarize_page
 def test_summarize_page_with_model():
     """Test summarize page with model API key."""
@@ -206,6 +455,149 @@ def test_generate_docs_structure(tmp_path, sample_sitemap_file):
     assert "AWS Configurations" in result
 
 
+def test_generate_docs_structure_extractive(tmp_path, sample_sitemap_file):
+    """Test generate docs structure with the extractive summarizer."""
+    docs_dir = tmp_path / "docs"
+    (docs_dir / "configuration").mkdir(parents=True)
+    (docs_dir / "index.md").write_text(
+        "# Welcome\n\nThis site documents the deployment of the demo service.",
+    )
+    (docs_dir / "configuration" / "azure.md").write_text("# Azure Configuration")
+    (docs_dir / "sitemap.xml").write_text(sample_sitemap_file.read_text())
+
+    with patch("llms_txt_action.utils.completion") as mock_completion:
+        result = generate_docs_structure(
+            str(docs_dir),
+            "sitemap.xml",
+            "gpt-3.5-turbo",
+            summarizer="extractive",
+        )
+
+    mock_completion.assert_not_called()
+    assert "This site documents the deployment of the demo service." in result
+    assert "): Azure Configuration" in result
+    assert "aws" not in result
+
+
+def test_generate_docs_structure_budget_by_priority(tmp_path, caplog):
+    """Test that the call budget goes to the most important pages first."""
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    for name in ("index", "guide", "changelog"):
+        (docs_dir / f"{name}.md").write_text(f"# {name.title()} Heading")
+    (docs_dir / "sitemap.xml").write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url><loc>https://example.com/</loc><priority>0.5</priority></url>
+            <url>
+                <loc>https://example.com/changelog.html</loc>
+                <lastmod>2024-01-01</lastmod>
+            </url>
+            <url>
+                <loc>https://example.com/guide.html</loc>
+                <priority>0.9</priority>
+            </url>
+        </urlset>
+        """,
+    )
+
+    with (
+        patch("llms_txt_action.utils.completion") as mock_completion,
+        patch.dict("os.environ", {"MODEL_API_KEY": "."}),
+    ):
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content="Model summary"))]
+        mock_response.usage.total_tokens = 10
+        mock_completion.return_value = mock_response
+
+        result = generate_docs_structure(
+            str(docs_dir),
+            "sitemap.xml",
+            "gpt-3.5-turbo",
+            summary_concurrency=1,
+            max_llm_calls=2,
+        )
+
+    assert mock_completion.call_count == 2  # noqa: PLR2004
+    assert result.splitlines()[2:] == [
+        "- [Example.Com](https://example.com/): Index Heading",
+        "- [Changelog.Html](https://example.com/changelog.html): Model summary",
+        "- [Guide.Html](https://example.com/guide.html): Model summary",
+    ]
+    assert "1 pages used their heading as summary" in caplog.text
+    assert "  https://example.com/" in caplog.messages
+
+
+def test_generate_docs_structure_orders_by_parsed_lastmod(tmp_path, caplog):
+    """Test that lastmod is compared as a date and a bad priority is ignored."""
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    for name in ("old", "new"):
+        (docs_dir / f"{name}.md").write_text(f"# {name.title()} Heading")
+    # As strings the date sorts after the time, which is hours later in UTC.
+    (docs_dir / "sitemap.xml").write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url>
+                <loc>https://example.com/old.html</loc>
+                <lastmod>2024-01-02</lastmod>
+                <priority>high</priority>
+            </url>
+            <url>
+                <loc>https://example.com/new.html</loc>
+                <lastmod>2024-01-01T23:00:00-05:00</lastmod>
+            </url>
+        </urlset>
+        """,
+    )
+
+    with (
+        patch("llms_txt_action.utils.completion") as mock_completion,
+        patch.dict("os.environ", {"MODEL_API_KEY": "."}),
+    ):
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content="Model summary"))]
+        mock_response.usage.total_tokens = 10
+        mock_completion.return_value = mock_response
+
+        result = generate_docs_structure(
+            str(docs_dir),
+            "sitemap.xml",
+            "gpt-3.5-turbo",
+            summary_concurrency=1,
+            max_llm_calls=1,
+        )
+
+    assert "(https://example.com/new.html): Model summary" in result
+    assert "(https://example.com/old.html): Old Heading" in result
+    assert "Invalid priority 'high' for https://example.com/old.html" in caplog.text
+
+
+def test_generate_docs_structure_sitemap_from_archive(tmp_path, sample_sitemap_file):
+    """Test that the sitemap is read from the archive the pages came from."""
+    archive = tmp_path / "site.zip"
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.write(sample_sitemap_file, "sitemap.xml")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    (output_dir / "index.md").write_text("# Welcome to MkDocs")
+
+    result = generate_docs_structure(
+        str(output_dir),
+        "sitemap.xml",
+        "gpt-3.5-turbo",
+        sitemap_root=str(archive),
+    )
+
+    assert "- [Example.Com](https://example.com/): Welcome to MkDocs" in result
+
+
+def test_summarize_pages_unknown_summarizer():
+    """Test summarize pages with an unknown summarizer."""
+    with pytest.raises(ValueError, match="Unknown summarizer"):
+        summarize_pages(["# Title"], "gpt-3.5-turbo", "magic")
+
+
 def test_generate_docs_structure_missing_sitemap(tmp_path):
     """Test generate docs structure with missing sitemap."""
     with pytest.raises(FileNotFoundError):
@@ -286,6 +678,39 @@ def test_extract_site_url_single_url():
     assert _extract_site_url(root) == "https://example.com/"
 
 
+def test_extract_site_url_stops_at_path_boundary():
+    """Test that the site URL does not end in the middle of a path segment."""
+    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+    <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+        <url><loc>https://example.com/guide.html</loc></url>
+        <url><loc>https://example.com/getting-started.html</loc></url>
+    </urlset>
+    """
+    root = ET.fromstring(xml_content)
+    assert _extract_site_url(root) == "https://example.com/"
+
+
+def test_extract_site_url_listed_page_is_a_directory(tmp_path):
+    """Test that a listed page every URL lies under is the site root."""
+    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+    <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+        <url><loc>https://example.com/docs</loc></url>
+        <url><loc>https://example.com/docs/x/</loc></url>
+    </urlset>
+    """
+    root = ET.fromstring(xml_content)
+    (tmp_path / "x").mkdir()
+    (tmp_path / "x" / "index.md").touch()
+
+    site_url = _extract_site_url(root)
+
+    assert site_url == "https://example.com/docs"
+    assert (
+        _convert_url_to_file_path("https://example.com/docs/x/", site_url, tmp_path)
+        == "x/index.md"
+    )
+
+
 @pytest.fixture
 def setup_mock_files(tmp_path):
     """Create mock files for testing."""
@@ -507,3 +932,204 @@ def test_extract_heading_with_multiple_special_chars():
     """Test extract heading with multiple special chars."""
     content = "# Heading ¶ with ¶ multiple symbols ¶"
     assert _extract_heading(content) == "Heading  with  multiple symbols "
+
+
+def test_convert_html_to_markdown_shared_pool(tmp_path, sample_html_file):
+    """Test that a shared pool is used for every page and left open."""
+    pool = Mock()
+    pool.convert.return_value = "# Converted content"
+    pool.restarts = 0
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    sample_html_file.rename(input_dir / "test.html")
+
+    with patch("llms_txt_action.utils.WorkerPool") as mock_pool_cls:
+        result = html_folder_to_markdown(str(input_dir), pool=pool)
+
+    assert result[0].read_text() == "# Converted content"
+    pool.convert.assert_called_once_with(input_dir / "test.html")
+    pool.close.assert_not_called()
+    mock_pool_cls.assert_not_called()
+
+
+def test_generate_docs_structure_model_routing(tmp_path, caplog):
+    """Test escalation of important pages and fallback on failing models."""
+    caplog.set_level("INFO")
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    for name in ("index", "guide"):
+        (docs_dir / f"{name}.md").write_text(f"# {name.title()} Heading")
+    (docs_dir / "sitemap.xml").write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url><loc>https://example.com/</loc><priority>1.0</priority></url>
+            <url><loc>https://example.com/guide.html</loc></url>
+        </urlset>
+        """,
+    )
+
+    def completion(model, **_kwargs):
+        if model == "mini":
+            msg = "provider outage"
+            raise litellm.APIConnectionError(msg, llm_provider="openai", model=model)
+        response = Mock()
+        response.choices = [Mock(message=Mock(content=f"Summary by {model}"))]
+        response.usage.total_tokens = 10
+        return response
+
+    with (
+        patch("llms_txt_action.utils.completion", side_effect=completion),
+        patch.dict("os.environ", {"MODEL_API_KEY": "."}),
+    ):
+        result = generate_docs_structure(
+            str(docs_dir),
+            "sitemap.xml",
+            "mini",
+            escalation_model="large",
+            escalation_priority=0.8,
+            fallback_models=["backup"],
+        )
+
+    assert result.splitlines()[2:] == [
+        "- [Example.Com](https://example.com/): Summary by large",
+        "- [Guide.Html](https://example.com/guide.html): Summary by large",
+    ]
+    assert "Model mini: 1 calls, 1 errors, 0 tokens" in caplog.text
+    assert "Model large: 2 calls, 0 errors, 20 tokens" in caplog.text
+
+
+def test_generate_docs_structure_every_model_fails(tmp_path, caplog):
+    """Test that pages use their heading when every model fails."""
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    (docs_dir / "index.md").write_text("# Index Heading")
+    (docs_dir / "sitemap.xml").write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url><loc>https://example.com/</loc></url>
+        </urlset>
+        """,
+    )
+
+    with (
+        patch(
+            "llms_txt_action.utils.completion",
+            side_effect=TimeoutError("provider outage"),
+        ) as mock_completion,
+        patch.dict("os.environ", {"MODEL_API_KEY": "."}),
+    ):
+        result = generate_docs_structure(
+            str(docs_dir),
+            "sitemap.xml",
+            "mini",
+            fallback_models=["backup"],
+        )
+
+    assert mock_completion.call_count == 2  # noqa: PLR2004
+    assert result.splitlines()[2:] == [
+        "- [Example.Com](https://example.com/): Index Heading",
+    ]
+    assert "1 pages used their heading as summary, every model failed:" in (caplog.text)
+
+
+def test_generate_docs_structure_keys_per_provider(tmp_path):
+    """Test that MODEL_API_KEY only goes to models of the default provider."""
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    (docs_dir / "index.md").write_text("# Index Heading")
+    (docs_dir / "sitemap.xml").write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url><loc>https://example.com/</loc></url>
+        </urlset>
+        """,
+    )
+    response = Mock()
+    response.choices = [Mock(message=Mock(content="Summary"))]
+
+    with (
+        patch(
+            "llms_txt_action.utils.completion",
+            side_effect=[
+                litellm.Timeout("slow", model="gpt-4o-mini", llm_provider="openai"),
+                litellm.Timeout("slow", model="gpt-4o", llm_provider="openai"),
+                response,
+            ],
+        ) as mock_completion,
+        patch.dict("os.environ", {"MODEL_API_KEY": "key"}),
+    ):
+        generate_docs_structure(
+            str(docs_dir),
+            "sitemap.xml",
+            "gpt-4o-mini",
+            fallback_models=["gpt-4o", "anthropic/claude-3-5-haiku-latest"],
+        )
+
+    assert [call.kwargs["api_key"] for call in mock_completion.call_args_list] == [
+        "key",
+        "key",
+        None,
+    ]
+
+
+def test_generate_docs_structure_raises_unexpected_errors(tmp_path):
+    """Test that errors other than failed requests are not retried."""
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    (docs_dir / "index.md").write_text("# Index Heading")
+    (docs_dir / "sitemap.xml").write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url><loc>https://example.com/</loc></url>
+        </urlset>
+        """,
+    )
+
+    with (
+        patch(
+            "llms_txt_action.utils.completion",
+            side_effect=KeyError("choices"),
+        ) as mock_completion,
+        patch.dict("os.environ", {"MODEL_API_KEY": "."}),
+        pytest.raises(KeyError),
+    ):
+        generate_docs_structure(
+            str(docs_dir),
+            "sitemap.xml",
+            "mini",
+            fallback_models=["backup"],
+        )
+
+    assert mock_completion.call_count == 1
+
+
+def test_summarize_pages_resumes_from_journal(tmp_path):
+    """Test that only summaries missing from the journal are requested."""
+    journal = CheckpointJournal(tmp_path / "journal.jsonl", "settings")
+    journal.record_summary("# Done", "Recorded summary")
+
+    def completion(messages, **_kwargs):
+        if "# Outage" in messages[-1]["content"]:
+            msg = "provider outage"
+            raise ConnectionError(msg)
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="New summary"))]
+        return response
+
+    with (
+        patch(
+            "llms_txt_action.utils.completion",
+            side_effect=completion,
+        ) as mock_completion,
+        patch.dict("os.environ", {"MODEL_API_KEY": "."}),
+    ):
+        summaries = summarize_pages(
+            ["# Done", "# Todo", "# Outage"],
+            "mini",
+            journal=journal,
+        )
+
+    assert summaries == ["Recorded summary", "New summary", "Outage"]
+    assert mock_completion.call_count == 2  # noqa: PLR2004
+    assert journal.has_summary("# Todo")
+    assert not journal.has_summary("# Outage")
@@ -0,0 +1,97 @@
+"""Unit tests for the llms_txt_action.warmup module."""
+# ruff: noqa: S101
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from llms_txt_action.warmup import (
+    compile_packages,
+    download_model_assets,
+    time_to_first_page,
+    warmup,
+)
+
+
+def test_time_to_first_page_reads_probe_output(tmp_path):
+    """Test that the probe's last output line is the time to first page."""
+    html_file = tmp_path / "page.html"
+    completed = subprocess.CompletedProcess([], 0, stdout="warning\n1.25\n")
+
+    with patch("llms_txt_action.warmup.subprocess.run", return_value=completed) as run:
+        assert time_to_first_page(str(html_file)) == 1.25  # noqa: PLR2004
+
+    assert run.call_args.args[0][-1] == str(html_file)
+    assert run.call_args.kwargs["env"]["PYTHONDONTWRITEBYTECODE"] == "1"
+
+
+def test_compile_packages_skips_missing_packages(caplog):
+    """Test that missing packages are skipped and installed ones compiled."""
+    with patch(
+        "llms_txt_action.warmup.compileall.compile_dir",
+        return_value=True,
+    ) as compile_dir:
+        compiled = compile_packages(("llms_txt_action", "not_a_package_xyz"))
+
+    assert compiled == ["llms_txt_action"]
+    compile_dir.assert_called_once()
+    assert "not_a_package_xyz is not installed" in caplog.text
+
+
+def test_download_model_assets_verifies_folders(tmp_path):
+    """Test that downloaded model folders are returned once verified."""
+
+    def download(output_dir, **_kwargs):
+        (output_dir / "layout").mkdir()
+        (output_dir / "layout" / "model.safetensors").write_bytes(b"weights")
+
+    with patch("docling.utils.model_downloader.download_models", side_effect=download):
+        folders = download_model_assets(str(tmp_path))
+
+    assert folders == [tmp_path / "layout"]
+
+
+def test_download_model_assets_rejects_empty_folders(tmp_path):
+    """Test that an empty model folder fails the verification."""
+
+    def download(output_dir, **_kwargs):
+        (output_dir / "layout").mkdir()
+
+    with (
+        patch("docling.utils.model_downloader.download_models", side_effect=download),
+        pytest.raises(RuntimeError, match="incomplete"),
+    ):
+        download_model_assets(str(tmp_path))
+
+
+def test_warmup_reports_cold_and_warm_times(caplog):
+    """Test that warmup measures the first page before and after warming."""
+    caplog.set_level("INFO")
+    with (
+        patch(
+            "llms_txt_action.warmup.time_to_first_page",
+            side_effect=[9.0, 2.5],
+        ),
+        patch(
+            "llms_txt_action.warmup.compile_packages",
+            return_value=["docling"],
+        ),
+        patch("llms_txt_action.warmup.download_model_assets") as download,
+    ):
+        result = warmup()
+
+    download.assert_not_called()
+    assert result == {
+        "cold_seconds": 9.0,
+        "warm_seconds": 2.5,
+        "compiled": ["docling"],
+        "models": [],
+    }
+    assert "(6.50s faster than cold)" in caplog.text
+
+
+def test_warmup_models_requires_cache_dir():
+    """Test that downloading models without a cache directory fails early."""
+    with pytest.raises(ValueError, match="cache directory"):
+        warmup(models=True)
@@ -0,0 +1,159 @@
+"""Unit tests for the llms_txt_action.watch module."""
+# ruff: noqa: S101
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from llms_txt_action.watch import DocsWatcher
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url><loc>https://example.com/</loc></url>
+    <url><loc>https://example.com/guide.html</loc></url>
+</urlset>
+"""
+
+
+def _convert(html_file, converter):  # noqa: ARG001
+    """Use the HTML text as markdown."""
+    return html_file.read_text()
+
+
+@pytest.fixture
+def site(tmp_path):
+    """Create a built site with two pages."""
+    (tmp_path / "index.html").write_text("# Home")
+    (tmp_path / "guide.html").write_text("# Guide")
+    (tmp_path / "sitemap.xml").write_text(SITEMAP)
+    return tmp_path
+
+
+@pytest.fixture
+def watcher(site):
+    """Create a watcher with a fake converter and model."""
+    with (
+        patch("llms_txt_action.watch.DocumentConverter"),
+        patch("llms_txt_action.watch.html_to_markdown", side_effect=_convert) as mock,
+        patch("llms_txt_action.utils.completion") as mock_completion,
+        patch.dict("os.environ", {"MODEL_API_KEY": "."}),
+    ):
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="Summary"))]
+        mock_completion.return_value = response
+        watcher = DocsWatcher(
+            str(site),
+            "sitemap.xml",
+            "llms.txt",
+            "llms-full.txt",
+            "gpt-4o",
+        )
+        watcher.convert_mock = mock
+        watcher.completion_mock = mock_completion
+        yield watcher
+
+
+def test_first_rebuild_converts_everything(site, watcher):
+    """Test that the first scan builds all outputs."""
+    assert watcher.rebuild() == 2  # noqa: PLR2004
+    assert (site / "index.md").read_text() == "# Home"
+    assert "# Guide" in (site / "llms-full.txt").read_text()
+    assert (site / "llms.txt").read_text().count(": Summary") == 2  # noqa: PLR2004
+
+
+def test_rebuild_skips_unchanged_content(site, watcher):
+    """Test that rewritten but identical files are not converted again."""
+    watcher.rebuild()
+    assert watcher.rebuild() is None
+
+    guide = site / "guide.html"
+    guide.write_text("# Guide")
+    os.utime(guide, ns=(0, 0))
+    assert watcher.rebuild() is None
+    assert watcher.convert_mock.call_count == 2  # noqa: PLR2004
+
+
+def test_rebuild_converts_and_summarizes_changed_pages(site, watcher):
+    """Test that only changed pages are converted and summarized again."""
+    watcher.rebuild()
+
+    guide = site / "guide.html"
+    guide.write_text("# Guide v2")
+    os.utime(guide, ns=(0, 0))
+
+    assert watcher.rebuild() == 1
+    assert watcher.convert_mock.call_count == 3  # noqa: PLR2004
+    assert watcher.completion_mock.call_count == 3  # noqa: PLR2004
+    assert "# Guide v2" in (site / "llms-full.txt").read_text()
+
+
+def test_rebuild_removes_deleted_pages(site, watcher):
+    """Test that deleted HTML pages drop out of llms-full.txt."""
+    watcher.rebuild()
+    (site / "guide.html").unlink()
+
+    assert watcher.rebuild() == 1
+    assert not (site / "guide.md").exists()
+    assert "# Guide" not in (site / "llms-full.txt").read_text()
+
+
+def test_run_stops_after_max_cycles(watcher):
+    """Test that run polls the given number of times."""
+    with patch.object(watcher, "rebuild", return_value=None) as mock_rebuild:
+        watcher.run(interval=0, max_cycles=3)
+
+    assert mock_rebuild.call_count == 3  # noqa: PLR2004
+
+
+def test_run_survives_a_half_written_build(site, watcher, caplog):
+    """Test that a failed rebuild is logged and retried on the next scan."""
+    (site / "sitemap.xml").write_text(SITEMAP[:120])
+
+    def finish_build(_interval):
+        (site / "sitemap.xml").write_text(SITEMAP)
+
+    with patch("llms_txt_action.watch.time.sleep", side_effect=finish_build):
+        watcher.run(interval=0, max_cycles=2)
+
+    assert "Rebuild failed, retrying on the next scan" in caplog.text
+    assert (site / "llms.txt").read_text().count(": Summary") == 2  # noqa: PLR2004
+    assert watcher.convert_mock.call_count == 4  # noqa: PLR2004
+
+
+def test_scan_skips_files_removed_mid_scan(watcher):
+    """Test that a page deleted while scanning is picked up later."""
+    with patch("pathlib.Path.read_bytes", side_effect=FileNotFoundError):
+        assert watcher._scan() == ([], [], True)  # noqa: SLF001
+
+    assert watcher.rebuild() == 2  # noqa: PLR2004
+
+
+def test_rebuild_honors_generation_options(site):
+    """Test that fallback, minification and skipped outputs apply to watching."""
+    (site / "index.html").write_text("<h1>Home</h1><p>Text¶</p>")
+    with (
+        patch("llms_txt_action.watch.DocumentConverter"),
+        patch(
+            "llms_txt_action.watch.html_to_markdown",
+            side_effect=RuntimeError("boom"),
+        ),
+    ):
+        watcher = DocsWatcher(
+            str(site),
+            "sitemap.xml",
+            "llms.txt",
+            "llms-full.txt",
+            "gpt-4o",
+            skip_llms_txt=True,
+            conversion_fallback=True,
+            minify="anchors",
+            output_archive="site.zip",
+        )
+        watcher.rebuild()
+
+    assert watcher.ignored == ["output_archive"]
+    assert "Text" in (site / "index.md").read_text()
+    assert "¶" not in (site / "index.md").read_text()
+    assert (site / "llms-full.txt").exists()
+    assert not (site / "llms.txt").exists()
@@ -0,0 +1,102 @@
+"""Unit tests for the llms_txt_action.workers module."""
+# ruff: noqa: S101
+
+import time
+from pathlib import Path
+
+import pytest
+
+from llms_txt_action.workers import ConversionTimeoutError, WorkerPool
+
+
+def _read_converter(input_file: Path) -> str:
+    """Return the file content, sleeping when asked to."""
+    content = Path(input_file).read_text()
+    if content.startswith("sleep"):
+        time.sleep(float(content.split()[1]))
+    if content == "fail":
+        msg = "cannot convert"
+        raise ValueError(msg)
+    return content
+
+
+def _slow_start() -> None:
+    """Take longer to start than the page timeout."""
+    time.sleep(1.5)
+
+
+def _failing_start() -> None:
+    """Fail to start the worker."""
+    msg = "no converter"
+    raise ImportError(msg)
+
+
+@pytest.fixture
+def pages(tmp_path):
+    """Create a fast, a slow and a failing page."""
+    fast = tmp_path / "fast.html"
+    fast.write_text("# Fast page")
+    slow = tmp_path / "slow.html"
+    slow.write_text("sleep 30")
+    failing = tmp_path / "failing.html"
+    failing.write_text("fail")
+    return fast, slow, failing
+
+
+def test_worker_pool_converts_in_worker(pages):
+    """Test that the pool returns the converter output."""
+    fast, _, _ = pages
+    with WorkerPool(_read_converter) as pool:
+        assert pool.convert(fast) == "# Fast page"
+        assert pool.restarts == 0
+
+
+def test_worker_pool_timeout_recycles_worker(pages):
+    """Test that a slow page is killed and the worker is replaced."""
+    fast, slow, _ = pages
+    with WorkerPool(_read_converter, timeout=0.5) as pool:
+        with pytest.raises(ConversionTimeoutError):
+            pool.convert(slow)
+        assert pool.restarts == 1
+        assert pool.convert(fast) == "# Fast page"
+
+
+def test_worker_pool_reports_conversion_errors(pages):
+    """Test that converter errors are raised without killing the worker."""
+    fast, _, failing = pages
+    with WorkerPool(_read_converter) as pool:
+        with pytest.raises(RuntimeError, match="ValueError: cannot convert"):
+            pool.convert(failing)
+        assert pool.restarts == 0
+        assert pool.convert(fast) == "# Fast page"
+
+
+def test_worker_startup_is_not_counted_against_the_page(pages):
+    """Test that the page timeout starts once a slow worker is ready."""
+    fast, _, _ = pages
+    pool = WorkerPool(_read_converter, timeout=1.0, initializer=_slow_start)
+    try:
+        assert pool.convert(fast) == "# Fast page"
+        assert pool.restarts == 0
+    finally:
+        pool.close()
+
+
+def test_worker_pool_starts_workers_when_entered(pages, caplog):
+    """Test that entering the pool waits for every worker to be ready."""
+    caplog.set_level("DEBUG")
+    fast, _, _ = pages
+    with WorkerPool(_read_converter, 2, timeout=1.0, initializer=_slow_start) as pool:
+        assert "Started 2 conversion workers" in caplog.text
+        start = time.perf_counter()
+        assert pool.convert(fast) == "# Fast page"
+        assert time.perf_counter() - start < 1.0
+
+
+def test_worker_startup_errors_are_reported(pages, caplog):
+    """Test that a worker failing to start reports its error on each page."""
+    fast, _, _ = pages
+    with WorkerPool(_read_converter, initializer=_failing_start) as pool:
+        assert "failed to start: ImportError: no converter" in caplog.text
+        with pytest.raises(RuntimeError, match="ImportError: no converter"):
+            pool.convert(fast)